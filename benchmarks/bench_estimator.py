@@ -0,0 +1,106 @@
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor
+from src.estimator import FeatureBasedEstimator
+from src.search_tools import FeatureBasedSearch
+from benchmarks.bench_preprocessing import features_set
+from benchmarks.common import make_serie
+
+
+class Estimator:
+    """Fitting, forecasting and validating a FeatureBasedEstimator on prebuilt features."""
+
+    params = ([2000], ["linear", "tree"])
+    param_names = ["length", "model"]
+    timeout = 300
+
+    def setup(self, length, model):
+        regressor = (
+            LinearRegression()
+            if model == "linear"
+            else DecisionTreeRegressor(max_depth=8, random_state=0)
+        )
+        self.estimator = FeatureBasedEstimator(
+            regressor,
+            horizon=24,
+            seasonal_period=24,
+            freq="h",
+            features=features_set("fast", 24),
+        )
+        self.estimator.preprocess_and_fit(make_serie(length, 24))
+
+    def time_fit(self, length, model):
+        self.estimator.fit(self.estimator.X, self.estimator.y)
+
+    def time_forecast(self, length, model):
+        self.estimator.forecast()
+
+    def time_sequential_validation(self, length, model):
+        self.estimator.sequential_validation(cv=5)
+
+
+class Strategies:
+    """The multi-horizon strategies : fit time and accuracy of the backtest of a week of hourly forecasts."""
+
+    params = ([168], ["linear", "tree", "boosting"], ["direct", "native", "stacked"])
+    param_names = ["horizon", "model", "strategy"]
+    timeout = 600
+
+    def setup(self, horizon, model, strategy):
+        if model == "boosting" and strategy == "native":
+            # gradient boosting has no native multi-output support
+            raise NotImplementedError
+        regressor = {
+            "linear": LinearRegression(),
+            "tree": DecisionTreeRegressor(max_depth=8, random_state=0),
+            "boosting": HistGradientBoostingRegressor(max_iter=50, random_state=0),
+        }[model]
+        self.estimator = FeatureBasedEstimator(
+            regressor,
+            horizon=horizon,
+            seasonal_period=24,
+            freq="h",
+            features=features_set("fast", 24),
+            strategy=strategy,
+        )
+        self.estimator.preprocess_and_fit(make_serie(2000, 24))
+
+    def time_fit(self, horizon, model, strategy):
+        self.estimator.fit(self.estimator.X, self.estimator.y)
+
+    def track_backtest_mae(self, horizon, model, strategy):
+        return self.estimator.backtest(step=168, refit_every=1).abs().values.mean()
+
+
+class Search:
+    """A grid of 20 seasonal periods, lags and horizons : the search against a build per candidate."""
+
+    params = [2000]
+    param_names = ["length"]
+    timeout = 600
+
+    def setup(self, length):
+        self.serie = make_serie(length, 24)
+        self.features = features_set("fast", 24)
+        self.search = FeatureBasedSearch(
+            LinearRegression(),
+            {
+                "seasonal_period": [12, 24],
+                "lags_to_consider": [1, 2, 3, 4, 5],
+                "horizon": [12, 24],
+            },
+            refit=False,
+            features=self.features,
+        )
+
+    def time_search(self, length):
+        self.search.fit(self.serie)
+
+    def time_build_per_candidate(self, length):
+        for candidate in self.search.candidates():
+            FeatureBasedEstimator(
+                LinearRegression(),
+                horizon=candidate["horizon"],
+                seasonal_period=candidate["seasonal_period"],
+                features=self.features,
+            ).preprocess_and_fit(self.serie, candidate["lags_to_consider"])
@@ -0,0 +1,26 @@
+from subprocess import run
+from sys import executable
+from os.path import dirname
+
+
+class Import:
+    """Import time of the modules, each in a fresh interpreter, the interpreter startup included."""
+
+    params = [
+        "none",
+        "src.features_computation_tools",
+        "src.preprocessing_tools",
+        "src.estimator",
+        "src.service",
+    ]
+    param_names = ["module"]
+
+    def setup(self, module):
+        self.code = "pass" if module == "none" else f"import {module}"
+
+    def time_import(self, module):
+        run(
+            [executable, "-c", self.code],
+            cwd=dirname(dirname(__file__)),
+            check=True,
+        )
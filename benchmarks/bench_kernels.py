@@ -0,0 +1,145 @@
+from numpy.lib.stride_tricks import sliding_window_view
+from src.features_computation_tools import (
+    stl_strengths,
+    seasonal_strength,
+    trend_strength,
+    spikiness,
+    lumpiness,
+    curvature,
+    spectral_entropy,
+    hurst_exponent,
+    adf_pvalue,
+    autocorrelation,
+    partial_autocorrelation,
+)
+from src.batched_features_tools import (
+    rolling_statistics,
+    batched_spectral_entropy,
+    batched_hurst_exponent,
+    batched_adf_pvalue,
+    batched_autocorrelation,
+    batched_partial_autocorrelation,
+)
+from src.compiled_features_tools import compiled_kernel, compiled_rolling_statistics
+from benchmarks.common import make_serie
+
+
+class ScalarKernels:
+    """The kernels of features_computation_tools, on a single window."""
+
+    params = [24, 100, 365]
+    param_names = ["window"]
+
+    def setup(self, window):
+        self.serie = make_serie(window, window).to_numpy()
+        self.period = window // 2
+        # pacf needs nlags = period + 5 to be below half of the window
+        self.acf_period = window // 2 - 6
+
+    def time_stl_strengths(self, window):
+        stl_strengths(self.serie, self.period)
+
+    def time_seasonal_strength(self, window):
+        seasonal_strength(self.serie, self.period)
+
+    def time_trend_strength(self, window):
+        trend_strength(self.serie, self.period)
+
+    def time_spikiness(self, window):
+        spikiness(self.serie)
+
+    def time_lumpiness(self, window):
+        lumpiness(self.serie)
+
+    def time_curvature(self, window):
+        curvature(self.serie)
+
+    def time_spectral_entropy(self, window):
+        spectral_entropy(self.serie)
+
+    def time_adf_pvalue(self, window):
+        adf_pvalue(self.serie)
+
+    def time_autocorrelation(self, window):
+        autocorrelation(self.serie, self.acf_period)
+
+    def time_partial_autocorrelation(self, window):
+        partial_autocorrelation(self.serie, self.acf_period)
+
+
+class HurstKernel:
+    """The Hurst exponent of features_computation_tools, which needs windows of 100 values."""
+
+    params = [24, 100, 365]
+    param_names = ["window"]
+
+    def setup(self, window):
+        if window < 100:
+            raise NotImplementedError
+        self.serie = make_serie(window, window).to_numpy()
+
+    def time_hurst_exponent(self, window):
+        hurst_exponent(self.serie)
+
+
+class BatchedKernels:
+    """The kernels of batched_features_tools, on all the windows of a serie."""
+
+    params = ([2000], [24, 100, 365])
+    param_names = ["length", "window"]
+
+    def setup(self, length, window):
+        self.values = make_serie(length, window).to_numpy()
+        self.windows = sliding_window_view(self.values, window)
+        self.window = window
+
+    def time_rolling_statistics(self, length, window):
+        rolling_statistics(self.values, window)
+
+    def time_spectral_entropy(self, length, window):
+        batched_spectral_entropy(self.windows)
+
+    def time_hurst_exponent(self, length, window):
+        batched_hurst_exponent(self.windows)
+
+    def time_adf_pvalue(self, length, window):
+        batched_adf_pvalue(self.windows)
+
+    def time_autocorrelation(self, length, window):
+        batched_autocorrelation(self.windows, 5)
+
+    def time_partial_autocorrelation(self, length, window):
+        batched_partial_autocorrelation(self.windows, 5)
+
+
+class CompiledKernels:
+    """The cheap statistics of every window, by the numpy and the Numba backends."""
+
+    params = ([20000], [24, 100, 365], ["numpy", "numba"])
+    param_names = ["length", "window", "backend"]
+
+    def setup(self, length, window, backend):
+        if backend == "numba" and compiled_kernel() is None:
+            raise NotImplementedError("Numba is not installed.")
+        self.values = make_serie(length, window).to_numpy()
+        # the first call compiles the kernel
+        self.kernel = (
+            compiled_rolling_statistics if backend == "numba" else rolling_statistics
+        )
+        self.kernel(self.values, window)
+
+    def time_rolling_statistics(self, length, window, backend):
+        self.kernel(self.values, window)
+
+
+class LargeWindows:
+    """The cheap statistics of minute series with daily and weekly windows."""
+
+    params = ([50000], [1440, 10080])
+    param_names = ["length", "window"]
+
+    def setup(self, length, window):
+        self.values = make_serie(length, 60).to_numpy()
+
+    def time_rolling_statistics(self, length, window):
+        rolling_statistics(self.values, window)
@@ -0,0 +1,41 @@
+from src.features_registry import default_features
+from src.preprocessing_tools import build_rolling_features, build_rolling_XY
+from benchmarks.common import make_serie
+
+
+def features_set(name: str, seasonal_period: int) -> list:
+    # the STL strengths dominate the build time, "fast" measures all the other features
+    features = default_features(seasonal_period)
+    if name == "fast":
+        features = [feature for feature in features if "strength" not in feature]
+    return features
+
+
+class BuildRollingFeatures:
+    """build_rolling_features, below and above the Hurst exponent threshold of 100 values."""
+
+    params = ([500, 2000], [24, 120], ["default", "fast"])
+    param_names = ["length", "seasonal_period", "features"]
+    timeout = 300
+
+    def setup(self, length, seasonal_period, features):
+        self.serie = make_serie(length, seasonal_period)
+        self.features = features_set(features, seasonal_period)
+
+    def time_build_rolling_features(self, length, seasonal_period, features):
+        build_rolling_features(self.serie, seasonal_period, features=self.features)
+
+
+class BuildRollingXY:
+    params = ([500, 2000], [24, 120])
+    param_names = ["length", "seasonal_period"]
+    timeout = 300
+
+    def setup(self, length, seasonal_period):
+        self.serie = make_serie(length, seasonal_period)
+        self.features = features_set("fast", seasonal_period)
+
+    def time_build_rolling_XY(self, length, seasonal_period):
+        build_rolling_XY(
+            self.serie, seasonal_period, horizon=24, features=self.features
+        )
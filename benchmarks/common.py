@@ -0,0 +1,21 @@
+from numpy import sin, pi, arange
+from numpy.random import default_rng
+from pandas import Series, date_range
+
+
+def make_serie(length: int, seasonal_period: int, seed: int = 0) -> Series:
+    """A seasonal random walk, hourly indexed, the same for every run of the benchmarks.
+
+    Args:
+        length (int): The number of points.
+        seasonal_period (int): The period of the seasonal component.
+        seed (int, optional): The seed of the noise. Defaults to 0.
+
+    Returns:
+        Series: The time series.
+    """
+    noise = default_rng(seed).standard_normal(length)
+    return Series(
+        10 + sin(2 * pi * arange(length) / seasonal_period) + noise.cumsum() / 10,
+        index=date_range("2020-01-01", periods=length, freq="h"),
+    )
@@ -0,0 +1,125 @@
+"""Load test of the forecasting service : throughput and latency percentiles of concurrent HTTP
+forecast requests, against a local server started in-process or against a running one.
+
+    python -m benchmarks.load_test --series 200 --requests 5000 --concurrency 64
+    python -m benchmarks.load_test --url 127.0.0.1:8080 --series 200   # a running server, series "0", "1", ...
+"""
+from argparse import ArgumentParser
+from asyncio import open_connection, gather, run
+from json import dumps
+from time import perf_counter
+from numpy import percentile
+from numpy.random import default_rng
+from sklearn.linear_model import LinearRegression
+from src.estimator import FeatureBasedEstimator
+from src.service import EstimatorPool, ForecastService
+from benchmarks.bench_preprocessing import features_set
+from benchmarks.common import make_serie
+
+
+def fit_estimator(series_id: str, length: int = 500) -> FeatureBasedEstimator:
+    return FeatureBasedEstimator(
+        LinearRegression(),
+        horizon=24,
+        seasonal_period=24,
+        freq="h",
+        features=features_set("fast", 24),
+    ).preprocess_and_fit(make_serie(length, 24, seed=int(series_id)))
+
+
+async def client(
+    host: str, port: int, requests: list, latencies: list, recent: int
+) -> None:
+    reader, writer = await open_connection(host, port)
+    for series_id in requests:
+        body = {"series_id": series_id}
+        if recent:
+            body["recent_points"] = (
+                10 + default_rng().standard_normal(recent)
+            ).tolist()
+        content = dumps(body).encode()
+        begin = perf_counter()
+        writer.write(
+            f"POST /forecast HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(content)}\r\n\r\n".encode() + content
+        )
+        await writer.drain()
+        await reader.readline()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(perf_counter() - begin)
+    writer.close()
+
+
+async def load_test(args) -> None:
+    if args.url is None:
+        pool = EstimatorPool(args.capacity, loader=fit_estimator)
+        for series_id in range(min(args.series, args.capacity)):
+            pool.put(str(series_id), fit_estimator(str(series_id)))
+        service = ForecastService(
+            pool, max_batch_size=args.batch_size, max_delay=args.delay
+        )
+        server = await service.serve(port=0)
+        host, port = server.sockets[0].getsockname()[:2]
+    else:
+        host, port = args.url.split(":")
+        port = int(port)
+
+    # hot series are requested more often, as in production traffic
+    rng = default_rng(0)
+    ids = (rng.zipf(1.5, args.requests) % args.series).astype(str).tolist()
+    latencies = []
+    begin = perf_counter()
+    await gather(
+        *[
+            client(host, port, ids[i :: args.concurrency], latencies, args.recent)
+            for i in range(args.concurrency)
+        ]
+    )
+    elapsed = perf_counter() - begin
+
+    print(f"requests    : {len(latencies)} in {elapsed:.2f} s")
+    print(f"throughput  : {len(latencies) / elapsed:.1f} requests/s")
+    for q in [50, 90, 99]:
+        print(f"p{q} latency : {percentile(latencies, q) * 1e3:.2f} ms")
+    if args.url is None:
+        print(f"service     : {service.stats}")
+        server.close()
+        await server.wait_closed()
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Load test of the forecasting service.")
+    parser.add_argument(
+        "--url", help="host:port of a running server. Defaults to a local one."
+    )
+    parser.add_argument("--series", type=int, default=100, help="Number of series.")
+    parser.add_argument(
+        "--capacity", type=int, default=1000, help="Size of the estimators pool."
+    )
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Number of requests."
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Number of concurrent clients."
+    )
+    parser.add_argument(
+        "--recent", type=int, default=0, help="Recent points sent per request."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=256, help="Requests per batch."
+    )
+    parser.add_argument(
+        "--delay", type=float, default=0.002, help="Batching delay, in seconds."
+    )
+    run(load_test(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
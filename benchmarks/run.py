@@ -0,0 +1,151 @@
+"""Run the benchmarks without asv, reporting the time and the peak memory of every benchmark.
+
+The benchmarks follow the asv conventions : classes of the bench_*.py modules, with time_* methods
+called once per combination of their params after setup. track_* methods return a value to report,
+e.g an accuracy.
+
+    python -m benchmarks.run                          # all the benchmarks
+    python -m benchmarks.run -b BuildRollingFeatures  # the benchmarks whose name contains the pattern
+    python -m benchmarks.run -o results.json          # saves the results
+    python -m benchmarks.run -c results.json          # flags the regressions against saved results
+"""
+from argparse import ArgumentParser
+from importlib import import_module
+from inspect import isclass
+from itertools import product
+from json import dump, load
+from os import listdir
+from os.path import dirname
+from statistics import median
+from time import perf_counter
+from tracemalloc import start, stop, get_traced_memory, reset_peak
+
+
+def discover(pattern: str = "") -> list:
+    """Find the benchmarks.
+
+    Args:
+        pattern (str, optional): Only keep the benchmarks whose name contains it. Defaults to "".
+
+    Returns:
+        list: The (name, class, method name) of the benchmarks.
+    """
+    benchmarks = []
+    for module_name in sorted(listdir(dirname(__file__))):
+        if not (module_name.startswith("bench_") and module_name.endswith(".py")):
+            continue
+        module = import_module(f"benchmarks.{module_name[:-3]}")
+        for class_name, cls in vars(module).items():
+            if not isclass(cls) or cls.__module__ != module.__name__:
+                continue
+            for method in sorted(vars(cls)):
+                name = f"{module_name[:-3]}.{class_name}.{method}"
+                if method.startswith(("time_", "track_")) and pattern in name:
+                    benchmarks.append((name, cls, method))
+    return benchmarks
+
+
+def parameters(cls) -> list:
+    params = getattr(cls, "params", [])
+    if not params:
+        return [()]
+    if len(getattr(cls, "param_names", [])) <= 1:
+        return [(param,) for param in params]
+    return list(product(*params))
+
+
+def measure(cls, method: str, params: tuple, repeat: int) -> [float, float]:
+    """Time a benchmark and measure its peak memory.
+
+    Args:
+        cls (type): The benchmark class.
+        method (str): The name of the time_* method.
+        params (tuple): The parameters of the run.
+        repeat (int): The number of timed calls.
+
+    Returns:
+        [float, float]: The median time, in seconds, and the peak memory allocated by a call, in bytes.
+    """
+    benchmark = cls()
+    if hasattr(benchmark, "setup"):
+        benchmark.setup(*params)
+    func = getattr(benchmark, method)
+    times = []
+    for _ in range(repeat):
+        begin = perf_counter()
+        func(*params)
+        times.append(perf_counter() - begin)
+
+    # tracing slows the call down, the memory is measured on an untimed call
+    start()
+    reset_peak()
+    func(*params)
+    peak = get_traced_memory()[1]
+    stop()
+    return median(times), peak
+
+
+def track(cls, method: str, params: tuple) -> float:
+    benchmark = cls()
+    if hasattr(benchmark, "setup"):
+        benchmark.setup(*params)
+    return getattr(benchmark, method)(*params)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Run the benchmarks.")
+    parser.add_argument(
+        "-b", "--bench", default="", help="Name pattern of the benchmarks."
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Timed calls per benchmark."
+    )
+    parser.add_argument("-o", "--output", help="Json file to save the results in.")
+    parser.add_argument("-c", "--compare", help="Json file of results to compare with.")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Ratio to the compared results flagging a regression.",
+    )
+    args = parser.parse_args()
+
+    previous = dict()
+    if args.compare:
+        with open(args.compare) as file:
+            previous = load(file)
+
+    results = dict()
+    for name, cls, method in discover(args.bench):
+        for params in parameters(cls):
+            key = f"{name}({', '.join(map(str, params))})"
+            try:
+                if method.startswith("track_"):
+                    results[key] = {"value": track(cls, method, params)}
+                    print(f"{key:<90} {results[key]['value']:>15.6g}", flush=True)
+                    continue
+                time, peak = measure(cls, method, params, args.repeat)
+            except NotImplementedError:
+                # as in asv, setup raises NotImplementedError on unsupported parameters
+                print(f"{key:<90} {'n/a':>15}", flush=True)
+                continue
+            results[key] = {"time": time, "peakmem": peak}
+            line = f"{key:<90} {time * 1e3:>12.3f} ms {peak / 2**20:>10.2f} MiB"
+            if key in previous:
+                ratios = [
+                    results[key][metric] / max(previous[key][metric], 1e-12)
+                    for metric in ["time", "peakmem"]
+                ]
+                line += f"   x{ratios[0]:.2f} time x{ratios[1]:.2f} memory"
+                if max(ratios) > args.threshold:
+                    line += "   REGRESSION"
+            print(line, flush=True)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,515 @@
+from numpy import (
+    ndarray,
+    full,
+    nan,
+    isnan,
+    nanmean,
+    nan_to_num,
+    cumsum,
+    concatenate,
+    zeros,
+    arange,
+    sort,
+    floor,
+    where,
+    sqrt,
+    errstate,
+    log2,
+    log10,
+    diff,
+    empty,
+    array,
+    ceil,
+    log,
+    pi,
+    sign,
+    unique,
+    einsum,
+    ones,
+    stack,
+    polyval,
+)
+from numpy.linalg import qr
+from numpy.fft import rfft, irfft
+from warnings import catch_warnings, simplefilter
+from numpy.lib.stride_tricks import sliding_window_view
+from src.order_statistics_tools import sliding_order_statistics
+
+# number of window values held in memory at once by the batched kernels
+CHUNK_SIZE = 2**22
+# window length from which the order statistics are updated rather than sorted
+SORTED_WINDOW_MIN_LENGTH = 1024
+# MacKinnon (1994) approximate asymptotic p-values of the ADF statistic, constant regression
+# and a single variable : the table values used by statsmodels.tsa.adfvalues.mackinnonp.
+# J. G. MacKinnon, "Approximate asymptotic distribution functions for unit-root and
+# cointegration tests", Journal of Business and Economic Statistics 12, 1994, pp. 167-176.
+MACKINNON_TAU_MAX = 2.74
+MACKINNON_TAU_MIN = -18.83
+MACKINNON_TAU_STAR = -1.61
+MACKINNON_SMALL_P = [2.1659, 1.4412, 0.038269]
+MACKINNON_LARGE_P = [1.7339, 0.93202, -0.12745, -0.010368]
+
+
+def __prefix_sums(values: ndarray, window: int) -> ndarray:
+    """Private method computing the sum of every full window from a single cumulative sum.
+
+    Args:
+        values (ndarray): The values to sum, without NaNs.
+        window (int): The length of the rolling window.
+
+    Returns:
+        ndarray: The n - window + 1 window sums.
+    """
+    sums = concatenate(([0], cumsum(values)))
+    return sums[window:] - sums[:-window]
+
+
+def __rolling_moments(serie: ndarray, window: int) -> (ndarray, ndarray):
+    """Private method computing the mean and the population variance of every full window.
+    Prefix sums are restarted on blocks of a few windows, each centered on its own mean,
+    so that neither the level nor the drift of long series accumulates rounding errors.
+
+    Args:
+        serie (ndarray): The time series, NaNs being ignored.
+        window (int): The length of the rolling window.
+
+    Returns:
+        (ndarray, ndarray): The n - window + 1 window means and variances.
+    """
+    block = max(2 * window, 64)  # a window overlaps at most two blocks
+    n_blocks = -(-serie.shape[0] // block)
+    padded = full(n_blocks * block, nan)
+    padded[: serie.shape[0]] = serie
+    blocks = padded.reshape(n_blocks, block)
+    with errstate(invalid="ignore"), catch_warnings():
+        simplefilter("ignore", RuntimeWarning)  # blocks made of NaNs only
+        references = nan_to_num(nanmean(blocks, axis=1))
+    centered = nan_to_num(blocks - references[:, None])
+    # an extra empty block allows windows ending on the last block boundary
+    firsts, seconds = (
+        concatenate(
+            (
+                zeros((n_blocks + 1, 1)),
+                concatenate((cumsum(values, axis=1), zeros((1, block)))),
+            ),
+            axis=1,
+        )
+        for values in (centered, centered**2)
+    )
+    references = concatenate((references, [0.0]))
+
+    starts = arange(serie.shape[0] - window + 1)
+    ends = starts + window
+    first_block, first_offset = divmod(starts, block)
+    last_block, last_offset = divmod(ends, block)
+    spans = last_block > first_block
+    # the first part runs up to the window end or to the first block end
+    stops = where(spans, block, last_offset)
+    heads = (window - last_offset * spans, last_offset * spans)
+    parts = (
+        (first_block, first_offset, stops),
+        (last_block, zeros(starts.shape[0], dtype=int), last_offset * spans),
+    )
+    sums = [firsts[k, stop] - firsts[k, start] for k, start, stop in parts]
+    squares = [seconds[k, stop] - seconds[k, start] for k, start, stop in parts]
+    offsets = [references[first_block], references[last_block]]
+
+    mean = sum(s + h * r for s, h, r in zip(sums, heads, offsets)) / window
+    deviations = [r - mean for r in offsets]
+    variance = (
+        sum(
+            q + 2 * d * s + h * d**2
+            for q, s, h, d in zip(squares, sums, heads, deviations)
+        )
+        / window
+    )
+    variance[variance < 0] = 0.0
+    return mean, variance
+
+
+def __lerp(lower: ndarray, upper: ndarray, weight: float) -> ndarray:
+    """Private method interpolating between two order statistics the way numpy.quantile does.
+
+    Args:
+        lower (ndarray): The lower order statistics.
+        upper (ndarray): The upper order statistics.
+        weight (float): The interpolation weight, between 0 and 1.
+
+    Returns:
+        ndarray: The interpolated values.
+    """
+    delta = upper - lower
+    if weight >= 0.5:
+        return upper - delta * (1 - weight)
+    return lower + delta * weight
+
+
+def sorted_quantile(sorted_windows: ndarray, q: float) -> ndarray:
+    """Linear quantile of already sorted windows, matching numpy.quantile.
+
+    Args:
+        sorted_windows (ndarray): A (n_windows, window) array sorted along its last axis.
+        q (float): The quantile to compute, between 0 and 1.
+
+    Returns:
+        ndarray: The quantile of each window.
+    """
+    position = q * (sorted_windows.shape[-1] - 1)
+    lower = int(floor(position))
+    upper = min(lower + 1, sorted_windows.shape[-1] - 1)
+    return __lerp(
+        sorted_windows[..., lower], sorted_windows[..., upper], position - lower
+    )
+
+
+def sorted_median(sorted_windows: ndarray) -> ndarray:
+    """Median of already sorted windows, matching numpy.median.
+
+    Args:
+        sorted_windows (ndarray): A (n_windows, window) array sorted along its last axis.
+
+    Returns:
+        ndarray: The median of each window.
+    """
+    window = sorted_windows.shape[-1]
+    return (
+        sorted_windows[..., (window - 1) // 2] + sorted_windows[..., window // 2]
+    ) / 2
+
+
+def __sorted_order_statistics(windows: ndarray) -> dict:
+    """Private method computing the order statistics of the windows, sorted by chunks.
+
+    Args:
+        windows (ndarray): The (n_windows, window) sliding windows, NaNs being sorted last.
+
+    Returns:
+        dict: The median, q1, q3 and spikiness arrays, and a constant boolean array,
+            True for the windows whose values are all equal.
+    """
+    window = windows.shape[1]
+    statistics = {
+        name: zeros(windows.shape[0]) for name in ["median", "q1", "q3", "spikiness"]
+    }
+    statistics["constant"] = zeros(windows.shape[0], dtype=bool)
+    chunk = max(1, CHUNK_SIZE // window)
+    for start in range(0, windows.shape[0], chunk):
+        stop = start + chunk
+        sorted_windows = sort(windows[start:stop], axis=1)
+        median = sorted_median(sorted_windows)
+        statistics["median"][start:stop] = median
+        statistics["q1"][start:stop] = sorted_quantile(sorted_windows, 0.25)
+        statistics["q3"][start:stop] = sorted_quantile(sorted_windows, 0.75)
+        statistics["spikiness"][start:stop] = (sorted_windows > median[:, None]).sum(
+            axis=1
+        ) / window
+        statistics["constant"][start:stop] = (
+            sorted_windows[:, 0] == sorted_windows[:, -1]
+        )
+    return statistics
+
+
+def rolling_statistics(serie: ndarray, window: int) -> dict:
+    """Compute the cheap rolling statistics of build_rolling_features for every window at once.
+    Moments come from prefix sums, order statistics from one sort of the sliding windows buffer,
+    or from a sliding SortedWindow for windows of at least SORTED_WINDOW_MIN_LENGTH values.
+    Windows containing NaNs give NaNs, as pandas rolling objects do.
+
+    Args:
+        serie (ndarray): The time series.
+        window (int): The length of the rolling window.
+
+    Returns:
+        dict: The mean, median, std, q1, q3, lumpiness, spikiness and curvature arrays,
+            aligned on the serie and NaN-filled for the first window - 1 points.
+    """
+    names = ["mean", "median", "std", "q1", "q3", "lumpiness", "spikiness", "curvature"]
+    statistics = {name: full(serie.shape[0], nan) for name in names}
+    if serie.shape[0] < window:
+        return statistics
+
+    complete = __prefix_sums(isnan(serie), window) == 0
+    mean, variance = __rolling_moments(serie, window)
+
+    windows = sliding_window_view(serie, window)
+    # sorting every window costs O(w log w), updating a sorted window O(log w)
+    order_statistics = (
+        sliding_order_statistics(serie, window)
+        if window >= SORTED_WINDOW_MIN_LENGTH
+        else __sorted_order_statistics(windows)
+    )
+    median, q1, q3, spikiness = (
+        order_statistics[name] for name in ["median", "q1", "q3", "spikiness"]
+    )
+    # constant windows have an exact null variance
+    variance[order_statistics["constant"]] = 0.0
+
+    with errstate(divide="ignore", invalid="ignore"):
+        lumpiness = variance / mean**2
+        std = sqrt(variance * window / (window - 1))
+        curvature = (
+            (windows[:, -1] - windows[:, -2] - windows[:, 1] + windows[:, 0])
+            / (window - 2)
+            if window > 2
+            else full(windows.shape[0], nan)
+        )
+
+    for name, values in zip(
+        names, [mean, median, std, q1, q3, lumpiness, spikiness, curvature]
+    ):
+        values[~complete] = nan
+        statistics[name][window - 1 :] = values
+    return statistics
+
+
+def batched_spectral_entropy(windows: ndarray) -> ndarray:
+    """Spectral entropy of every window, the Welch PSD of all the rows being computed in one call.
+
+    Args:
+        windows (ndarray): A (n_windows, window) array.
+
+    Returns:
+        ndarray: The spectral entropy of each window, as spectral_entropy would compute it.
+    """
+    # scipy is only imported by the kernels needing it, to keep imports fast
+    from scipy.signal import welch
+
+    # welch caps the segments length to the window length, without its warning
+    _, power_density = welch(windows, nperseg=min(256, windows.shape[-1]), axis=-1)
+    with errstate(divide="ignore", invalid="ignore"):
+        normalized_power_density = power_density / power_density.sum(
+            axis=-1, keepdims=True
+        )
+        return -(normalized_power_density * log2(normalized_power_density)).sum(axis=-1)
+
+
+def batched_hurst_exponent(windows: ndarray, min_window: int = 10) -> ndarray:
+    """Hurst exponent of every window, from a rescaled range analysis done with array operations.
+    It follows hurst.compute_Hc(kind="random_walk", simplified=True) : the mean R/S ratio of the
+    non-overlapping segments of each size is regressed on the size in log-log scale.
+    Unlike compute_Hc, windows shorter than 100 values are accepted.
+
+    Args:
+        windows (ndarray): A (n_windows, window) array, window being greater than min_window + 1.
+        min_window (int, optional): The smallest segment size. Defaults to 10.
+
+    Returns:
+        ndarray: The Hurst exponent of each window, NaN when no segment has a defined R/S ratio.
+    """
+    length = windows.shape[-1]
+    sizes = [
+        int(10**x) for x in arange(log10(min_window), log10(length - 1), 0.25)
+    ] + [length]
+    log_rescaled_ranges = empty((windows.shape[0], len(sizes)))
+    with errstate(divide="ignore", invalid="ignore"):
+        for j, size in enumerate(sizes):
+            segments = windows[:, : length // size * size].reshape(
+                windows.shape[0], -1, size
+            )
+            ranges = segments.max(axis=-1) - segments.min(axis=-1)
+            deviations = diff(segments, axis=-1).std(axis=-1, ddof=1)
+            # segments with an undefined R/S ratio are skipped
+            defined = (ranges != 0) & (deviations != 0)
+            rescaled_ranges = where(defined, ranges / deviations, 0.0)
+            log_rescaled_ranges[:, j] = log10(
+                rescaled_ranges.sum(axis=-1) / defined.sum(axis=-1)
+            )
+    log_sizes = log10(array(sizes, dtype=float))
+    centered_log_sizes = log_sizes - log_sizes.mean()
+    return (log_rescaled_ranges @ centered_log_sizes) / (centered_log_sizes**2).sum()
+
+
+def __adf_regression(
+    windows: ndarray, differences: ndarray, lag: int, nobs: int, level_last: bool
+) -> (ndarray, ndarray, ndarray):
+    """Private method building and QR-factorizing the ADF regressions of all the windows.
+
+    Args:
+        windows (ndarray): A (n_windows, window) array.
+        differences (ndarray): The first differences of the windows.
+        lag (int): The number of lagged differences in the regression.
+        nobs (int): The number of observations, taken at the end of the windows.
+        level_last (bool): Whether the lagged level is the last regressor, else the second one
+            after the constant.
+
+    Returns:
+        (ndarray, ndarray, ndarray): The targets, the R factors and the projections of the targets on Q.
+    """
+    start = windows.shape[-1] - 1 - nobs
+    target = differences[:, start:]
+    level = windows[:, start:-1]
+    lagged = [differences[:, start - j : -j] for j in range(1, lag + 1)]
+    constant = ones(target.shape)
+    regressors = (
+        [constant] + lagged + [level] if level_last else [constant, level] + lagged
+    )
+    q, r = qr(stack(regressors, axis=-1))
+    return target, r, einsum("wok,wo->wk", q, target)
+
+
+def __adf_statistics(windows: ndarray, maxlag: int, autolag: str) -> (ndarray, ndarray):
+    """Private method computing the ADF statistic of every window, with a constant regression.
+
+    Args:
+        windows (ndarray): A (n_windows, window) array.
+        maxlag (int): The maximum (autolag) or the fixed (no autolag) number of lagged differences.
+        autolag (str): "AIC", "BIC" or None.
+
+    Returns:
+        ndarray: The ADF statistics.
+    """
+    length = windows.shape[-1]
+    differences = diff(windows, axis=-1)
+    lags = full(windows.shape[0], maxlag)
+    if autolag is not None:
+        # every lag order is fitted on the same observations, and read from one nested QR
+        nobs = length - 1 - maxlag
+        target, _, projections = __adf_regression(
+            windows, differences, maxlag, nobs, level_last=False
+        )
+        ssr = (target**2).sum(axis=-1)[:, None] - cumsum(projections**2, axis=-1)
+        n_params = arange(1, maxlag + 3)
+        penalty = 2 * n_params if autolag.lower() == "aic" else log(nobs) * n_params
+        with errstate(divide="ignore", invalid="ignore"):
+            criteria = nobs * (log(2 * pi) + log(ssr / nobs) + 1) + penalty
+        lags = criteria[:, 1:].argmin(axis=-1)
+
+    statistics = empty(windows.shape[0])
+    for lag in unique(lags):
+        rows = lags == lag
+        nobs = length - 1 - lag
+        target, r, projections = __adf_regression(
+            windows[rows], differences[rows], lag, nobs, level_last=True
+        )
+        ssr = (target**2).sum(axis=-1) - (projections**2).sum(axis=-1)
+        with errstate(divide="ignore", invalid="ignore"):
+            statistics[rows] = (
+                sign(r[:, -1, -1]) * projections[:, -1] / sqrt(ssr / (nobs - lag - 2))
+            )
+    return statistics
+
+
+def batched_mackinnon_pvalue(statistics: ndarray) -> ndarray:
+    """MacKinnon's approximate p-values of ADF statistics with a constant regression,
+    as statsmodels.tsa.adfvalues.mackinnonp computes them one by one, from the MACKINNON tables.
+
+    Args:
+        statistics (ndarray): The ADF statistics.
+
+    Returns:
+        ndarray: The p-values.
+    """
+    from scipy.stats import norm
+
+    small_p = norm.cdf(polyval(MACKINNON_SMALL_P[::-1], statistics))
+    large_p = norm.cdf(polyval(MACKINNON_LARGE_P[::-1], statistics))
+    p_values = where(statistics <= MACKINNON_TAU_STAR, small_p, large_p)
+    p_values[statistics > MACKINNON_TAU_MAX] = 1.0
+    p_values[statistics < MACKINNON_TAU_MIN] = 0.0
+    return p_values
+
+
+def batched_adf_pvalue(
+    windows: ndarray, maxlag: int = None, autolag: str = "AIC"
+) -> ndarray:
+    """Return the p-value of the augmented Dickey Fuller test of every window.
+    The regressions of all the windows are solved together with stacked QR factorizations,
+    following statsmodels.tsa.stattools.adfuller with a constant regression.
+
+    Args:
+        windows (ndarray): A (n_windows, window) array.
+        maxlag (int, optional): The maximum number of lagged differences. Defaults to None,
+            i.e 12 * (window / 100) ** (1 / 4) as adfuller does.
+        autolag (str, optional): The criterion used to select the number of lags, "AIC" or "BIC".
+            None uses maxlag lags for every window. Defaults to "AIC".
+
+    Returns:
+        ndarray: The p-value of each window, NaN for constant windows.
+    """
+    length = windows.shape[-1]
+    if autolag is not None and autolag.lower() not in ("aic", "bic"):
+        raise ValueError('autolag must be "AIC", "BIC" or None.')
+    if maxlag is None:
+        maxlag = min(length // 2 - 2, int(ceil(12.0 * (length / 100.0) ** (1 / 4.0))))
+    if maxlag < 0 or maxlag > length // 2 - 2:
+        raise ValueError("maxlag must be less than (nobs/2 - 2).")
+
+    p_values = empty(windows.shape[0])
+    # the stacked design matrices hold maxlag + 2 regressors per window value
+    chunk = max(1, CHUNK_SIZE // (length * (maxlag + 2)))
+    for start in range(0, windows.shape[0], chunk):
+        p_values[start : start + chunk] = batched_mackinnon_pvalue(
+            __adf_statistics(windows[start : start + chunk], maxlag, autolag)
+        )
+    p_values[windows.max(axis=-1) == windows.min(axis=-1)] = nan
+    return p_values
+
+
+def __autocovariances(windows: ndarray, nlags: int, adjusted: bool) -> ndarray:
+    """Private method computing the autocovariances of every window with one FFT.
+
+    Args:
+        windows (ndarray): A (n_windows, window) array.
+        nlags (int): The number of lags.
+        adjusted (bool): Whether the denominators are window - k, else window.
+
+    Returns:
+        ndarray: A (n_windows, nlags + 1) array, the first column being the variances.
+    """
+    length = windows.shape[-1]
+    centered = windows - windows.mean(axis=-1, keepdims=True)
+    # zero padding avoids the circular wrap of the correlation
+    size = 1 << (2 * length - 1).bit_length()
+    spectrum = rfft(centered, n=size, axis=-1)
+    autocovariances = irfft(spectrum * spectrum.conj(), n=size, axis=-1)[:, : nlags + 1]
+    denominators = length - arange(nlags + 1) if adjusted else length
+    return autocovariances / denominators
+
+
+def batched_autocorrelation(windows: ndarray, nlags: int) -> ndarray:
+    """Autocorrelation of every window, as statsmodels acf computes it, from FFT autocovariances.
+
+    Args:
+        windows (ndarray): A (n_windows, window) array.
+        nlags (int): The number of lags.
+
+    Returns:
+        ndarray: A (n_windows, nlags) array, column k - 1 being corr(y_t, y_(t-k)).
+    """
+    autocovariances = __autocovariances(windows, nlags, adjusted=False)
+    with errstate(divide="ignore", invalid="ignore"):
+        return autocovariances[:, 1:] / autocovariances[:, :1]
+
+
+def batched_partial_autocorrelation(windows: ndarray, nlags: int) -> ndarray:
+    """Partial autocorrelation of every window, as statsmodels pacf computes it with the default
+    adjusted Yule-Walker method, from a Durbin-Levinson recursion run on all the windows together.
+
+    Args:
+        windows (ndarray): A (n_windows, window) array.
+        nlags (int): The number of lags.
+
+    Returns:
+        ndarray: A (n_windows, nlags) array, column k - 1 being the partial autocorrelation at lag k.
+    """
+    autocovariances = __autocovariances(windows, nlags, adjusted=True)
+    partial_autocorrelations = empty((windows.shape[0], nlags))
+    coefficients = zeros((windows.shape[0], 0))
+    with errstate(divide="ignore", invalid="ignore"):
+        for k in range(1, nlags + 1):
+            previous = autocovariances[:, k - 1 : 0 : -1]
+            reflection = (
+                autocovariances[:, k] - (coefficients * previous).sum(axis=-1)
+            ) / (
+                autocovariances[:, 0]
+                - (coefficients * autocovariances[:, 1:k]).sum(axis=-1)
+            )
+            coefficients = concatenate(
+                (
+                    coefficients - reflection[:, None] * coefficients[:, ::-1],
+                    reflection[:, None],
+                ),
+                axis=-1,
+            )
+            partial_autocorrelations[:, k - 1] = reflection
+    return partial_autocorrelations
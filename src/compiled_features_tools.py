@@ -0,0 +1,150 @@
+from functools import lru_cache
+from warnings import warn
+from numpy import (
+    ndarray,
+    ascontiguousarray,
+    empty,
+    full,
+    nan,
+    isnan,
+    sqrt,
+    floor,
+    searchsorted,
+)
+from src.batched_features_tools import rolling_statistics
+
+# columns of fused_window_statistics, in the order of rolling_statistics
+STATISTICS = [
+    "mean",
+    "median",
+    "std",
+    "q1",
+    "q3",
+    "lumpiness",
+    "spikiness",
+    "curvature",
+]
+BACKENDS = ["numpy", "numba"]
+
+
+def fused_window_statistics(serie: ndarray, window: int) -> ndarray:
+    """Compute the cheap statistics of every full window in a single loop, one window at a time.
+    The window values are kept sorted : moving to the next window removes the oldest value and
+    inserts the new one by a binary search, instead of sorting each window.
+    Written with plain loops to be compiled by Numba, the interpreted function being the
+    reference of the compiled kernel only. Windows containing NaNs give NaNs.
+
+    Args:
+        serie (ndarray): The time series, as a contiguous float array.
+        window (int): The length of the rolling window.
+
+    Returns:
+        ndarray: A (n - window + 1, 8) array, the columns being the STATISTICS.
+    """
+    n_windows = max(0, serie.shape[0] - window + 1)
+    result = empty((n_windows, 8))
+    values = empty(window)
+    # whether values holds the sorted previous window
+    sorted_previous = False
+    for i in range(n_windows):
+        incoming = serie[i + window - 1]
+        if isnan(incoming):
+            result[i, :] = nan
+            sorted_previous = False
+            continue
+        if sorted_previous:
+            outgoing = searchsorted(values, serie[i - 1])
+            position = searchsorted(values, incoming)
+            if position > outgoing:
+                for j in range(outgoing, position - 1):
+                    values[j] = values[j + 1]
+                values[position - 1] = incoming
+            else:
+                for j in range(outgoing, position, -1):
+                    values[j] = values[j - 1]
+                values[position] = incoming
+        else:
+            for j in range(window):
+                values[j] = serie[i + j]
+            values.sort()
+            # NaNs are sorted last
+            if isnan(values[-1]):
+                result[i, :] = nan
+                continue
+            sorted_previous = True
+
+        total = 0.0
+        for j in range(window):
+            total += values[j]
+        mean = total / window
+        squares = 0.0
+        for j in range(window):
+            squares += (values[j] - mean) ** 2
+        variance = squares / window
+        median = (values[(window - 1) // 2] + values[window // 2]) / 2
+        # the values above the median follow it in the sorted window
+        above = window - searchsorted(values, median, side="right")
+
+        result[i, 0] = mean
+        result[i, 1] = median
+        result[i, 2] = sqrt(variance * window / (window - 1))
+        # linear quantiles, interpolated the way numpy.quantile does
+        for column, q in ((3, 0.25), (4, 0.75)):
+            position = q * (window - 1)
+            lower = int(floor(position))
+            upper = min(lower + 1, window - 1)
+            weight = position - lower
+            delta = values[upper] - values[lower]
+            if weight >= 0.5:
+                result[i, column] = values[upper] - delta * (1 - weight)
+            else:
+                result[i, column] = values[lower] + delta * weight
+        result[i, 5] = variance / mean**2
+        result[i, 6] = above / window
+        result[i, 7] = (
+            (serie[i + window - 1] - serie[i + window - 2] - serie[i + 1] + serie[i])
+            / (window - 2)
+            if window > 2
+            else nan
+        )
+    return result
+
+
+@lru_cache(maxsize=None)
+def compiled_kernel():
+    """Compile fused_window_statistics with Numba, once per process.
+    Numba caches the machine code on disk, so that later processes only load it.
+
+    Returns:
+        callable: The compiled kernel, None when Numba is not installed.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        warn("Numba is not installed, the numpy backend computes the features instead.")
+        return None
+    # numpy error model : divisions by zero give infs and NaNs, as numpy does
+    return njit(cache=True, nogil=True, error_model="numpy")(fused_window_statistics)
+
+
+def compiled_rolling_statistics(serie: ndarray, window: int) -> dict:
+    """The statistics of rolling_statistics, computed by the compiled kernel.
+    Falls back on rolling_statistics when Numba is not installed.
+
+    Args:
+        serie (ndarray): The time series.
+        window (int): The length of the rolling window.
+
+    Returns:
+        dict: The STATISTICS arrays, aligned on the serie and NaN-filled for the first window - 1 points.
+    """
+    kernel = compiled_kernel()
+    if kernel is None:
+        return rolling_statistics(serie, window)
+    statistics = {name: full(serie.shape[0], nan) for name in STATISTICS}
+    if serie.shape[0] < window:
+        return statistics
+    values = kernel(ascontiguousarray(serie, dtype=float), window)
+    for k, name in enumerate(STATISTICS):
+        statistics[name][window - 1 :] = values[:, k]
+    return statistics
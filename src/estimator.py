@@ -1,10 +1,45 @@
 from sklearn.multioutput import MultiOutputRegressor
-from sklearn.base import RegressorMixin
+from sklearn.base import RegressorMixin, clone
 from sklearn import metrics
-from pandas import Series, DataFrame, date_range
-from numpy import ndarray
-from src.preprocessing_tools import build_rolling_XY
-from src.plotting_tools import plot_rolling_features, plot_sequential_validation
+from pandas import Series, DataFrame, DatetimeIndex, Index, date_range, concat
+from numpy import ndarray, empty, arange, asarray, array
+from joblib import Parallel, delayed
+from os import makedirs
+from os.path import join
+from copy import copy
+from src.preprocessing_tools import RollingFeaturesBuilder
+from src.feature_store import FeatureStore
+from src.incremental_tools import incremental_model
+from src.profiling_tools import Profiler, measure
+from src.multi_horizon_tools import multi_horizon_model
+from src.persistence_tools import save_object, load_object
+
+
+def fit_and_score_fold(
+    estimator: RegressorMixin,
+    X: DataFrame,
+    y: DataFrame,
+    X_eval: DataFrame,
+    y_true: ndarray,
+    metric: metrics,
+    seasonal_period: int,
+) -> float:
+    """Fit an unfitted estimator on a sequential validation fold and score its last forecast.
+
+    Args:
+        estimator (RegressorMixin): The unfitted multi-horizon model.
+        X (DataFrame): The fold features.
+        y (DataFrame): The fold targets.
+        X_eval (DataFrame): The features the forecast is made on.
+        y_true (ndarray): The observed values of the forecasted horizon.
+        metric (metrics): The error metric.
+        seasonal_period (int): The seasonal period.
+
+    Returns:
+        float: The error of the forecast.
+    """
+    preds = estimator.fit(X, y).predict(X_eval)[-1].ravel()
+    return metric(y_true, preds[-seasonal_period:])
 
 
 class FeatureBasedEstimator(MultiOutputRegressor):
@@ -16,42 +51,226 @@ class FeatureBasedEstimator(MultiOutputRegressor):
         seasonal_period: int = 12,
         freq: str = "D",
         n_jobs: int = None,
+        features: list = None,
+        time_budget: float = None,
+        cache: FeatureStore = None,
+        profile: bool = False,
+        profile_callback=None,
+        dtype=None,
+        memory_budget: int = None,
+        strategy: str = "direct",
+        backend: str = "numpy",
     ) -> None:
         super().__init__(estimator=estimator, n_jobs=n_jobs)
         self.horizon = horizon
         self.seasonal_period = seasonal_period
         self.freq = freq
+        self.features = features
+        self.time_budget = time_budget
+        self.cache = cache
+        self.profile = profile
+        self.profile_callback = profile_callback
+        # float32 halves the memory of the features and targets
+        self.dtype = dtype
+        self.memory_budget = memory_budget
+        # direct : one model per horizon step, native : one multi-output model,
+        # stacked : one model with the horizon step as a feature
+        self.strategy = strategy
+        # numba : the cheap statistics are computed by a compiled kernel, if Numba is installed
+        self.backend = backend
+        # records the time of the features, lags, targets, per horizon fits and predictions
+        self.profiler = Profiler(profile_callback) if profile else None
         self.is_fitted = False
+        # False for loaded estimators, whose training features and targets were not saved
+        self.has_history = True
+        # dates of the forecast of the last origin, only computed when the origin changes
+        self.forecast_dates = None
+        # the rolling features, X and y, and the blocks appended by update since their last access
+        self.__history = dict()
+        self.__pending = {"rolling_features": [], "X": [], "y": []}
 
     ## Preprocessing, fit & forecast
     def fit(self, X: ndarray, y: ndarray):
         self.X = X
         self.y = y
         self.is_fitted = True
-        return super().fit(self.X, self.y)
+        # models are fitted on arrays, sparing the feature names checks of every prediction
+        if isinstance(X, DataFrame):
+            self.feature_names_in_ = asarray(X.columns, dtype=object)
+        X, y = asarray(X), asarray(y)
+        if self.strategy != "direct":
+            with measure(self.profiler, "fit", self.strategy):
+                self.model_ = multi_horizon_model(self.estimator, self.strategy).fit(
+                    X, y
+                )
+            return self
+        if self.profiler is None:
+            return super().fit(X, y)
+
+        # horizons are fitted one by one, to be timed separately
+        self.estimators_ = []
+        for i in range(y.shape[1]):
+            with self.profiler.measure("fit", f"t+{i + 1}"):
+                self.estimators_.append(clone(self.estimator).fit(X, y[:, i]))
+        if hasattr(self.estimators_[0], "n_features_in_"):
+            self.n_features_in_ = self.estimators_[0].n_features_in_
+        return self
 
     def preprocess_and_fit(self, serie: Series, lags_to_consider: int = 5) -> None:
-        self.rolling_features, self.X, _, self.y = build_rolling_XY(
-            serie,
+        self.features_builder = RollingFeaturesBuilder(
             seasonal_period=self.seasonal_period,
             horizon=self.horizon,
             lags_to_consider=lags_to_consider,
+            n_jobs=self.n_jobs,
+            features=self.features,
+            time_budget=self.time_budget,
+            cache=self.cache,
+            profiler=self.profiler,
+            dtype=self.dtype,
+            memory_budget=self.memory_budget,
+            backend=self.backend,
+        )
+        self.rolling_features, self.X, _, self.y = self.features_builder.fit_transform(
+            serie
         )
+        self.has_history = True
         return self.fit(self.X, self.y)
 
-    def forecast(self):
+    def predict(self, X: ndarray) -> ndarray:
+        X = self.__features_values(X)
+        if self.strategy == "direct":
+            return super().predict(X)
+        return asarray(self.model_.predict(X)).reshape(X.shape[0], -1)
+
+    def __features_values(self, X: ndarray) -> ndarray:
+        if not isinstance(X, DataFrame):
+            return X
+        if hasattr(self, "feature_names_in_") and not X.columns.equals(
+            Index(self.feature_names_in_)
+        ):
+            raise ValueError("The features should be the ones the model was fitted on.")
+        return X.to_numpy()
+
+    def update(self, new_points: Series, refit: bool = False):
+        """Append new observations without recomputing the history.
+        Only the feature rows of the new points and the targets they complete are computed.
+
+        Args:
+            new_points (Series): The new observations, following the fitted serie.
+                Arrays are indexed from the last known date with the estimator freq.
+            refit (bool, optional): Whether to refit the models on the extended datas. Defaults to False.
+
+        Raises:
+            RuntimeError: If refit is True and the estimator was loaded without its training history.
+
+        Returns:
+            FeatureBasedEstimator: The updated estimator.
+        """
+        if not hasattr(self, "features_builder"):
+            raise RuntimeError(
+                "Model need to be fitted with preprocess_and_fit to call this method."
+            )
+        if refit and not self.has_history:
+            # the models would be refitted on the points added since the load only
+            raise RuntimeError(
+                "A loaded estimator has no training history to refit on. "
+                "Refit it with preprocess_and_fit."
+            )
+        rolling_features, X, y = self.features_builder.update(
+            self.__as_new_points(new_points)
+        )
+        # the blocks are only concatenated to the history when it is read
+        self.__pending["rolling_features"].append(rolling_features)
+        self.__pending["X"].append(X)
+        self.__pending["y"].append(y)
+        return self.fit(self.X, self.y) if refit else self
+
+    def forecast(self, recent_points: Series = None) -> DataFrame:
+        """Forecast the horizon following the latest origin.
+        Only the features row of this origin is computed and predicted, whatever the history length.
+
+        Args:
+            recent_points (Series, optional): Recent observations, following or overlapping the fitted
+                serie, the last one being the forecast origin. They are not added to the estimator
+                (see update). Arrays are indexed from the last known date with the estimator freq.
+                Defaults to None, i.e the origin is the last point of the fitted serie.
+
+        Returns:
+            DataFrame: The forecast.
+        """
+        return self.forecast_batch([recent_points])[0]
+
+    def forecast_batch(self, recent_points: list) -> list:
+        """Forecast from several origins, their features rows being built and predicted at once.
+        Safe to call from concurrent threads, the estimator being only read.
+
+        Args:
+            recent_points (list): The recent observations of each forecast, see forecast.
+
+        Returns:
+            list: The forecasts, in the order of the recent points.
+        """
         if not (self.is_fitted):
             raise RuntimeError("Model need to be fitted to call this method.")
+        if any(points is not None for points in recent_points) and not hasattr(
+            self, "features_builder"
+        ):
+            raise RuntimeError(
+                "Model need to be fitted with preprocess_and_fit to forecast from recent points."
+            )
+        # the features rows of the recent points are built at once
+        recent = [points for points in recent_points if points is not None]
+        latest = (
+            self.features_builder.latest_features_batch(
+                [self.__as_new_points(points) for points in recent], self.freq
+            )
+            if recent
+            else None
+        )
+        if len(recent) < len(recent_points):
+            rows = iter(range(len(recent)))
+            latest = concat(
+                [
+                    self.__latest_features()
+                    if points is None
+                    else latest.iloc[[next(rows)]]
+                    for points in recent_points
+                ]
+            )
+
+        with measure(self.profiler, "predict"):
+            if self.strategy == "direct":
+                # one call per horizon model, without the joblib overhead of MultiOutputRegressor
+                values = self.__features_values(latest)
+                preds = array(
+                    [estimator.predict(values) for estimator in self.estimators_]
+                ).T
+            else:
+                preds = self.predict(latest)
+        return [
+            DataFrame(pred, index=self.__forecast_index(origin), columns=["Forecast"])
+            for pred, origin in zip(preds, latest.index)
+        ]
 
-        preds = super().predict(self.rolling_features)[-1].ravel()
-        return DataFrame(
-            preds,
+    def __forecast_index(self, origin) -> DatetimeIndex:
+        # the dates of the last origin are kept, as a single attribute for concurrent readers
+        if self.forecast_dates is not None and self.forecast_dates[0] == origin:
+            return self.forecast_dates[1]
+        index = date_range(start=origin, periods=self.horizon + 1, freq=self.freq)[1:]
+        self.forecast_dates = (origin, index)
+        return index
+
+    def __as_new_points(self, points: Series) -> Series:
+        # arrays follow the last known date
+        if isinstance(points, Series):
+            return points
+        return Series(
+            points,
             index=date_range(
-                start=max(self.rolling_features.index),
-                periods=preds.shape[0] + 1,
+                start=self.features_builder.tail.index[-1],
+                periods=len(points) + 1,
                 freq=self.freq,
             )[1:],
-            columns=["Forecast"],
         )
 
     ## Sequential validation methods
@@ -77,27 +296,216 @@ class FeatureBasedEstimator(MultiOutputRegressor):
             raise RuntimeError("Model need to be fitted to call this method.")
 
         Xs, ys = self.__sequential_validation_splits(cv=cv)
-        for x, y in zip(Xs, ys):
-            preds = (
-                super().fit(x, y).predict(self.X[-self.seasonal_period :])[-1].ravel()
-            )
-            perfs[f"{x.shape[0]}"] = metric(
-                self.y.iloc[-1].values, preds[-self.seasonal_period :]
+        # folds are fitted on clones, in parallel, leaving the fitted models untouched
+        scores = Parallel(n_jobs=self.n_jobs)(
+            delayed(fit_and_score_fold)(
+                multi_horizon_model(self.estimator, self.strategy),
+                x,
+                y,
+                self.X[-self.seasonal_period :],
+                self.y.iloc[-1].values,
+                metric,
+                self.seasonal_period,
             )
+            for x, y in zip(Xs, ys)
+        )
+        for x, score in zip(Xs, scores):
+            perfs[f"{x.shape[0]}"] = score
         self.perfs = perfs
         self.metric = metric
         return perfs
 
+    ## Backtesting methods
+    def backtest(
+        self, step: int = 1, initial: int = None, refit_every: int = None
+    ) -> DataFrame:
+        """Rolling-origin evaluation: a forecast is made every step samples, by models trained on
+        the samples whose targets are observed at the forecast origin.
+        Between origins, linear models are updated by recursive least squares and models with a
+        partial_fit method by partial_fit, the other ones being refitted.
+
+        Args:
+            step (int, optional): The number of samples between two origins. Defaults to 1.
+            initial (int, optional): The number of training samples of the first origin.
+                Defaults to None, i.e half of the samples.
+            refit_every (int, optional): The number of origins between two refits of the models that can't
+                be updated incrementally. Defaults to None, i.e at every origin.
+
+        Returns:
+            DataFrame: The forecast errors (forecast - observation), indexed by origin, one column per horizon step.
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Model need to be fitted to call this method.")
+        X = self.X.to_numpy(dtype=float)
+        y = self.y.to_numpy(dtype=float)
+        initial = X.shape[0] // 2 if initial is None else initial
+        # the target of sample i is observed horizon samples later
+        origins = arange(initial + self.horizon - 1, X.shape[0], step)
+        if initial < 1 or origins.shape[0] == 0:
+            raise ValueError("Not enough samples to backtest.")
+
+        model, incremental = incremental_model(self.estimator, self.strategy)
+        model.fit(X[:initial], y[:initial])
+        trained = initial
+        preds = empty((origins.shape[0], y.shape[1]))
+        for i, origin in enumerate(origins):
+            observed = origin - self.horizon + 1
+            if observed > trained:
+                if incremental:
+                    model.partial_fit(X[trained:observed], y[trained:observed])
+                    trained = observed
+                elif refit_every is None or i % refit_every == 0:
+                    model.fit(X[:observed], y[:observed])
+                    trained = observed
+            preds[i] = model.predict(X[origin : origin + 1])[0]
+
+        self.backtest_errors = DataFrame(
+            preds - y[origins], index=self.X.index[origins], columns=self.y.columns
+        )
+        return self.backtest_errors
+
     ## Plotting methods
     def plot_rolling_features(
         self, features_to_plot: list = None, save_path: str = None
     ) -> None:
+        # matplotlib is only imported when plotting
+        from src.plotting_tools import plot_rolling_features
+
         plot_rolling_features(self.rolling_features, features_to_plot, save_path)
 
     def plot_sequential_validation(self, cv: int = 5, save_path: str = None) -> None:
+        from src.plotting_tools import plot_sequential_validation
+
         perfs = self.sequential_validation(cv=cv)
         plot_sequential_validation(perfs, save_path, self.metric.__name__)
 
+    ## Persistence
+    def save(self, path: str) -> None:
+        """Save the fitted models and the features state the next forecasts and updates need.
+        The history (the features and targets of the fit) is not saved : the models are written
+        to models.pkl, their large arrays to models.pkl.bin, and the last serie window and
+        features rows to state.pkl.
+
+        Args:
+            path (str): The directory to save the estimator in.
+        """
+        if not hasattr(self, "features_builder"):
+            raise RuntimeError(
+                "Model need to be fitted with preprocess_and_fit to call this method."
+            )
+        makedirs(path, exist_ok=True)
+        save_object(
+            self.estimators_ if self.strategy == "direct" else self.model_,
+            join(path, "models.pkl"),
+        )
+        params = self.get_params(deep=False)
+        # callbacks are not always picklable, the profiler is not restored
+        params.update(profile=False, profile_callback=None)
+        features_builder = copy(self.features_builder)
+        features_builder.profiler = None
+        save_object(
+            {
+                "params": params,
+                "features_builder": features_builder,
+                "feature_names_in_": getattr(self, "feature_names_in_", None),
+                "target_names": list(self.y.columns),
+            },
+            join(path, "state.pkl"),
+        )
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: str = "r"):
+        """Load an estimator saved by save, ready to forecast and update.
+        The training history is not restored : update(refit=True) raises, the models can only
+        be refitted by preprocess_and_fit.
+
+        Args:
+            path (str): The directory the estimator was saved in.
+            mmap_mode (str, optional): The memory-mapping mode of the large models arrays, see
+                load_object. Defaults to "r", i.e read-only, the arrays being only read when predicting.
+
+        Returns:
+            FeatureBasedEstimator: The fitted estimator.
+        """
+        state = load_object(join(path, "state.pkl"), mmap_mode=None)
+        estimator = cls(**state["params"])
+        models = load_object(join(path, "models.pkl"), mmap_mode=mmap_mode)
+        if estimator.strategy == "direct":
+            estimator.estimators_ = models
+            if hasattr(models[0], "n_features_in_"):
+                estimator.n_features_in_ = models[0].n_features_in_
+        else:
+            estimator.model_ = models
+        if state["feature_names_in_"] is not None:
+            estimator.feature_names_in_ = state["feature_names_in_"]
+
+        estimator.features_builder = state["features_builder"]
+        estimator.rolling_features = estimator.features_builder.features_tail
+        estimator.X = estimator.rolling_features.iloc[:0]
+        estimator.y = DataFrame(
+            empty((0, len(state["target_names"]))),
+            index=estimator.X.index,
+            columns=state["target_names"],
+        )
+        estimator.is_fitted = True
+        estimator.has_history = False
+        return estimator
+
+    ## Profiling
+    @property
+    def profile_(self) -> DataFrame:
+        """The calls count and times per pipeline stage (features, lags, targets, fit, predict)
+        and per name in the stage (the features of a kernel, a horizon).
+        """
+        if self.profiler is None:
+            raise RuntimeError(
+                "Model need to be built with profile=True to be profiled."
+            )
+        return self.profiler.report()
+
+    ## History
+    def __read_history(self, name: str) -> DataFrame:
+        if name not in self.__history:
+            raise AttributeError(f"The estimator has no {name} yet.")
+        if self.__pending[name]:
+            self.__history[name] = concat([self.__history[name], *self.__pending[name]])
+            self.__pending[name].clear()
+        return self.__history[name]
+
+    def __write_history(self, name: str, value: DataFrame) -> None:
+        self.__history[name] = value
+        self.__pending[name].clear()
+
+    @property
+    def rolling_features(self) -> DataFrame:
+        return self.__read_history("rolling_features")
+
+    @rolling_features.setter
+    def rolling_features(self, rolling_features: DataFrame) -> None:
+        self.__write_history("rolling_features", rolling_features)
+
+    @property
+    def X(self) -> DataFrame:
+        return self.__read_history("X")
+
+    @X.setter
+    def X(self, X: DataFrame) -> None:
+        self.__write_history("X", X)
+
+    @property
+    def y(self) -> DataFrame:
+        return self.__read_history("y")
+
+    @y.setter
+    def y(self, y: DataFrame) -> None:
+        self.__write_history("y", y)
+
+    def __latest_features(self) -> DataFrame:
+        # the tail of the builder holds the last rows, without reading the whole history
+        if hasattr(self, "features_builder"):
+            return self.features_builder.features_tail.iloc[-1:]
+        return self.rolling_features.iloc[-1:]
+
     ## Getters
     def get_horizon(self) -> int:
         return self.horizon
@@ -0,0 +1,142 @@
+from hashlib import blake2b
+from json import dumps, load, dump
+from os import makedirs, listdir, replace
+from os.path import join, isdir, exists
+from shutil import rmtree
+from tempfile import mkdtemp
+from pandas import Series, DataFrame, DatetimeIndex, Index
+from numpy import ascontiguousarray, save
+from numpy import load as load_array
+
+# part of every parameters key, to bump when the kernels or the storage format change,
+# so that features computed by older code are not served
+FEATURES_VERSION = 1
+
+
+class FeatureStore:
+    """On-disk cache of rolling features, keyed by the serie content and the features parameters.
+    Features are stored as .npy files, loaded memory-mapped. A serie extending a stored one
+    (same first values and index) only computes the features of its new points.
+
+    Args:
+        path (str): The directory holding the cached features.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        makedirs(path, exist_ok=True)
+
+    ## Keys
+    @staticmethod
+    def parameters_key(parameters: dict) -> str:
+        parameters = {**parameters, "version": FEATURES_VERSION}
+        return blake2b(
+            dumps(parameters, sort_keys=True, default=str).encode(), digest_size=16
+        ).hexdigest()
+
+    @staticmethod
+    def serie_key(serie: Series) -> str:
+        digest = blake2b(digest_size=16)
+        digest.update(ascontiguousarray(serie.to_numpy(dtype=float)).tobytes())
+        if isinstance(serie.index, DatetimeIndex):
+            digest.update(ascontiguousarray(serie.index.asi8).tobytes())
+            digest.update(str(serie.index.tz).encode())
+        elif serie.index.dtype.kind in "biuf":
+            # numeric indexes are hashed from their values, not their representation
+            digest.update(serie.index.dtype.str.encode())
+            digest.update(ascontiguousarray(serie.index.to_numpy()).tobytes())
+        else:
+            digest.update(str(list(serie.index)).encode())
+        return digest.hexdigest()
+
+    ## Loading & saving
+    def load(self, serie: Series, parameters: dict) -> [DataFrame, int]:
+        """Load the features of the serie, or of its longest stored prefix.
+
+        Args:
+            serie (Series): The time series.
+            parameters (dict): The parameters the features depend on.
+
+        Returns:
+            [DataFrame, int]: The cached features (None if nothing is stored) and the number of
+                points of the serie they were computed on.
+        """
+        directory = join(self.path, self.parameters_key(parameters))
+        if not isdir(directory):
+            return None, 0
+        lengths = dict()
+        for entry in listdir(directory):
+            meta_path = join(directory, entry, "meta.json")
+            if exists(meta_path):
+                with open(meta_path) as file:
+                    lengths[entry] = load(file)["n_points"]
+
+        for entry, n_points in sorted(lengths.items(), key=lambda x: -x[1]):
+            if n_points <= serie.shape[0] and entry == self.serie_key(
+                serie.iloc[:n_points]
+            ):
+                return self.__read(join(directory, entry)), n_points
+        return None, 0
+
+    def save(self, serie: Series, parameters: dict, features: DataFrame) -> None:
+        """Store the features of the serie, replacing the stored prefixes of the serie.
+
+        Args:
+            serie (Series): The time series the features were computed on.
+            parameters (dict): The parameters the features depend on.
+            features (DataFrame): The features.
+        """
+        directory = join(self.path, self.parameters_key(parameters))
+        makedirs(directory, exist_ok=True)
+        _, n_points = self.load(serie, parameters)
+        previous = self.serie_key(serie.iloc[:n_points]) if n_points else None
+
+        # written aside then moved, so that readers never see a partial entry
+        temporary = mkdtemp(dir=directory, prefix=".tmp")
+        save(join(temporary, "values.npy"), ascontiguousarray(features.to_numpy(float)))
+        if isinstance(features.index, DatetimeIndex):
+            save(join(temporary, "index.npy"), features.index.asi8)
+            tz = str(features.index.tz) if features.index.tz is not None else None
+            freq = features.index.freqstr
+        else:
+            save(join(temporary, "index.npy"), features.index.to_numpy())
+            tz, freq = False, None
+        with open(join(temporary, "meta.json"), "w") as file:
+            dump(
+                {
+                    "n_points": int(serie.shape[0]),
+                    "columns": list(features.columns),
+                    "datetime_index": tz is not False,
+                    "tz": tz if tz is not False else None,
+                    "freq": freq,
+                    "parameters": parameters,
+                },
+                file,
+                default=str,
+            )
+        entry = join(directory, self.serie_key(serie))
+        if exists(entry):
+            rmtree(entry)
+        replace(temporary, entry)
+        if previous is not None and previous != self.serie_key(serie):
+            rmtree(join(directory, previous), ignore_errors=True)
+
+    def clear(self) -> None:
+        rmtree(self.path, ignore_errors=True)
+        makedirs(self.path, exist_ok=True)
+
+    def __read(self, entry: str) -> DataFrame:
+        with open(join(entry, "meta.json")) as file:
+            meta = load(file)
+        values = load_array(join(entry, "values.npy"), mmap_mode="r")
+        index = load_array(join(entry, "index.npy"), allow_pickle=True)
+        if meta["datetime_index"]:
+            index = DatetimeIndex(index.astype("datetime64[ns]"))
+            if meta["tz"] is not None:
+                index = index.tz_localize("UTC").tz_convert(meta["tz"])
+            if meta["freq"] is not None:
+                index.freq = meta["freq"]
+        else:
+            index = Index(index)
+        # the memory-mapped values back the DataFrame without copy
+        return DataFrame(values, index=index, columns=meta["columns"], copy=False)
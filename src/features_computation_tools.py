@@ -7,14 +7,13 @@ from numpy import (
     var,
     diff,
     log2,
+    count_nonzero,
 )
-from statsmodels.tsa.seasonal import STL, DecomposeResult
-from statsmodels.tsa.stattools import acf, pacf, adfuller
-from scipy.signal import welch
-from hurst import compute_Hc
 
+# statsmodels, scipy and hurst are imported on the first call of the kernels needing them
 
-def __compute_STL(serie: ndarray, period: int) -> DecomposeResult:
+
+def __compute_STL(serie: ndarray, period: int) -> "DecomposeResult":
     """Private method used to compute the STL using LOESS decomposition.
 
     Args:
@@ -24,9 +23,42 @@ def __compute_STL(serie: ndarray, period: int) -> DecomposeResult:
     Returns:
         DecomposeResult: The fitted STL object.
     """
+    from statsmodels.tsa.seasonal import STL
+
     return STL(serie, period=period).fit()
 
 
+def __component_strength(component: ndarray, resid: ndarray) -> float:
+    """Private method measuring the strength of a STL component against the remainder.
+
+    Args:
+        component (ndarray): The trend or seasonal component.
+        resid (ndarray): The remainder of the decomposition.
+
+    Returns:
+        float: The computed coefficient.
+    """
+    return max(0, (1 - resid.var() / (resid + component).var()))
+
+
+def stl_strengths(serie: ndarray, period: int) -> (float, float):
+    """Measure both the trend and seasonal strengths from a single STL fit.
+    The LOESS decomposition being the costliest step, prefer this kernel when both strengths are needed.
+
+    Args:
+        serie (ndarray): The time series.
+        period (int): The seasonal period.
+
+    Returns:
+        (float, float): The trend strength and the seasonal strength.
+    """
+    decomposition = __compute_STL(serie, period)
+    return (
+        __component_strength(decomposition.trend, decomposition.resid),
+        __component_strength(decomposition.seasonal, decomposition.resid),
+    )
+
+
 def seasonal_strength(serie: ndarray, period: int) -> float:
     """Measure the strength of the seasonal component.
 
@@ -38,14 +70,7 @@ def seasonal_strength(serie: ndarray, period: int) -> float:
         float: The computed coefficient.
     """
     decomposition = __compute_STL(serie, period)
-    return max(
-        0,
-        (
-            1
-            - decomposition.resid.var()
-            / (decomposition.resid + decomposition.seasonal).var()
-        ),
-    )
+    return __component_strength(decomposition.seasonal, decomposition.resid)
 
 
 def trend_strength(serie: ndarray, period: int) -> float:
@@ -59,14 +84,7 @@ def trend_strength(serie: ndarray, period: int) -> float:
         float: The computed coefficient.
     """
     decomposition = __compute_STL(serie, period)
-    return max(
-        0,
-        (
-            1
-            - decomposition.resid.var()
-            / (decomposition.resid + decomposition.trend).var()
-        ),
-    )
+    return __component_strength(decomposition.trend, decomposition.resid)
 
 
 def spikiness(ndarray: array) -> float:
@@ -80,7 +98,7 @@ def spikiness(ndarray: array) -> float:
     Returns:
         float: The computed coefficient.
     """
-    return sum(ndarray > median(ndarray)) / ndarray.shape[0]
+    return count_nonzero(ndarray > median(ndarray)) / ndarray.shape[0]
 
 
 def lumpiness(serie: ndarray) -> float:
@@ -126,7 +144,9 @@ def spectral_entropy(serie: ndarray) -> float:
     Returns:
         float: The computed coefficient.
     """
-    _, power_density = welch(serie)
+    from scipy.signal import welch
+
+    _, power_density = welch(serie, nperseg=min(256, len(serie)))
     normalized_power_density = power_density / sum(power_density)
     return -sum(normalized_power_density * log2(normalized_power_density))
 
@@ -142,6 +162,8 @@ def hurst_exponent(serie: ndarray) -> float:
     Returns:
         float: The computed coefficient.
     """
+    from hurst import compute_Hc
+
     return compute_Hc(serie, simplified=True)[0]
 
 
@@ -156,6 +178,8 @@ def adf_pvalue(serie: ndarray) -> float:
     Returns:
         float: The p value of the adf test.
     """
+    from statsmodels.tsa.stattools import adfuller
+
     stat, p_value, _, _, _, _ = adfuller(serie)
     return p_value
 
@@ -171,6 +195,8 @@ def autocorrelation(serie: ndarray, seasonal_period=int) -> [float]:
         [float]: The computed autocorolletation, each element corresponding to its associated lag.
                 For instance, value at index 1 = corr(y_t, y_(t-1)).
     """
+    from statsmodels.tsa.stattools import acf
+
     return acf(x=serie, nlags=seasonal_period + 5)
 
 
@@ -187,4 +213,6 @@ def partial_autocorrelation(serie: ndarray, seasonal_period=int) -> [float]:
         [float]: The computed autocorolletation, each element corresponding to its associated lag.
                 For instance, value at index 1 = corr(y_t, y_(t-1)).
     """
+    from statsmodels.tsa.stattools import pacf
+
     return pacf(x=serie, nlags=seasonal_period + 5)
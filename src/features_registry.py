@@ -0,0 +1,397 @@
+from pandas import Series, DataFrame
+from numpy import ndarray, full, nan, isnan, flatnonzero
+from numpy.lib.stride_tricks import sliding_window_view
+from src.features_computation_tools import stl_strengths
+from src.profiling_tools import Profiler, measure
+from src.compiled_features_tools import BACKENDS, compiled_rolling_statistics
+from src.batched_features_tools import (
+    CHUNK_SIZE,
+    rolling_statistics,
+    batched_spectral_entropy,
+    batched_hurst_exponent,
+    batched_adf_pvalue,
+    batched_autocorrelation,
+    batched_partial_autocorrelation,
+)
+
+# number of acf_k and pacf_k columns when they are requested without autocorrelation_lags
+DEFAULT_AUTOCORRELATION_LAGS = 5
+
+
+def apply_on_windows(serie: Series, window: int, func, n_outputs: int = 1) -> ndarray:
+    """Apply a scalar kernel on every full window of the serie.
+    Windows containing NaNs are skipped, as pandas rolling objects do.
+
+    Args:
+        serie (Series): The time series.
+        window (int): The length of the rolling window.
+        func (callable): The kernel, returning n_outputs values per window.
+        n_outputs (int, optional): The number of values returned by the kernel. Defaults to 1.
+
+    Returns:
+        ndarray: A (len(serie), n_outputs) array aligned on the serie, NaN-filled for the first window - 1 points.
+    """
+    values = serie.to_numpy(dtype=float)
+    result = full((values.shape[0], n_outputs), nan)
+    if values.shape[0] < window:
+        return result
+    windows = sliding_window_view(values, window)
+    complete = ~isnan(windows).any(axis=1)
+    for i in flatnonzero(complete):
+        result[i + window - 1] = func(windows[i])
+    return result
+
+
+def apply_batched_on_windows(
+    serie: Series, window: int, kernel, n_outputs: int = 1
+) -> ndarray:
+    """Apply a batched kernel on all the full windows of the serie, by chunks of rows.
+    Windows containing NaNs are skipped, as pandas rolling objects do.
+
+    Args:
+        serie (Series): The time series.
+        window (int): The length of the rolling window.
+        kernel (callable): The kernel, mapping a (n_windows, window) array to n_windows values,
+            or to a (n_windows, n_outputs) array.
+        n_outputs (int, optional): The number of values returned by the kernel per window. Defaults to 1.
+
+    Returns:
+        ndarray: A (len(serie), n_outputs) array aligned on the serie, NaN-filled for the first window - 1 points.
+    """
+    values = serie.to_numpy(dtype=float)
+    result = full((values.shape[0], n_outputs), nan)
+    if values.shape[0] < window:
+        return result
+    windows = sliding_window_view(values, window)
+    complete = flatnonzero(~isnan(windows).any(axis=1))
+    chunk = max(1, CHUNK_SIZE // window)
+    for start in range(0, complete.shape[0], chunk):
+        rows = complete[start : start + chunk]
+        result[rows + window - 1] = kernel(windows[rows]).reshape(rows.shape[0], -1)
+    return result
+
+
+class RollingFeature:
+    """A feature of build_rolling_features, computed on every window of the serie.
+
+    Args:
+        name (str): The name of the feature, i.e of its column (name_k for multi-columns features).
+        kernel (callable): Maps (serie, seasonal_period, **options) to a dict of arrays aligned on the
+            serie, keyed by feature names. Features sharing a kernel are computed by a single call.
+        min_window (int, optional): The smallest seasonal period the kernel supports. Defaults to 1.
+        cost (float, optional): The estimated computation time of one window of 100 values, in seconds.
+            Defaults to 1e-6.
+        complexity (float, optional): The exponent of the cost in the window length. Defaults to 1.
+        default (bool, optional): Whether the feature is computed when none are selected.
+            Defaults to False.
+        memory (float, optional): The float64 values the kernel holds per value of a window,
+            besides its outputs. Defaults to 4.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kernel,
+        min_window: int = 1,
+        cost: float = 1e-6,
+        complexity: float = 1.0,
+        default: bool = False,
+        memory: float = 4.0,
+    ) -> None:
+        self.name = name
+        self.kernel = kernel
+        self.min_window = min_window
+        self.cost = cost
+        self.complexity = complexity
+        self.default = default
+        self.memory = memory
+
+    def estimate_cost(self, seasonal_period: int, n_windows: int) -> float:
+        return self.cost * (seasonal_period / 100) ** self.complexity * n_windows
+
+    def estimate_nbytes(self, seasonal_period: int, n_windows: int) -> int:
+        return int(self.memory * seasonal_period * n_windows * 8)
+
+
+FEATURES_REGISTRY = dict()
+
+
+def register_feature(
+    name: str,
+    kernel,
+    min_window: int = 1,
+    cost: float = 1e-6,
+    complexity: float = 1.0,
+    default: bool = False,
+    memory: float = 4.0,
+) -> RollingFeature:
+    """Register a feature so that it can be selected by name in build_rolling_features.
+    Registering an existing name replaces the feature.
+
+    Args:
+        name (str): The name of the feature.
+        kernel (callable): Maps (serie, seasonal_period, **options) to a dict of arrays keyed by feature names.
+        min_window (int, optional): The smallest seasonal period the kernel supports. Defaults to 1.
+        cost (float, optional): The estimated computation time of one window of 100 values, in seconds.
+            Defaults to 1e-6.
+        complexity (float, optional): The exponent of the cost in the window length. Defaults to 1.
+        default (bool, optional): Whether the feature is computed when none are selected. Defaults
+            to False : registering a feature does not change the default builds.
+        memory (float, optional): The float64 values the kernel holds per value of a window,
+            besides its outputs. Defaults to 4.
+
+    Returns:
+        RollingFeature: The registered feature.
+    """
+    FEATURES_REGISTRY[name] = RollingFeature(
+        name,
+        kernel,
+        min_window=min_window,
+        cost=cost,
+        complexity=complexity,
+        default=default,
+        memory=memory,
+    )
+    return FEATURES_REGISTRY[name]
+
+
+def default_features(
+    seasonal_period: int, with_hurst: bool = None, autocorrelation_lags: int = 0
+) -> list:
+    """The features computed when none are selected.
+
+    Args:
+        seasonal_period (int): The seasonal period, i.e the length of the rolling window.
+        with_hurst (bool, optional): Whether to compute the Hurst exponent. Defaults to None,
+            i.e only for seasonal periods of at least 100.
+        autocorrelation_lags (int, optional): The number of acf_k and pacf_k columns. Defaults to 0.
+
+    Returns:
+        list: The names of the default features.
+    """
+    # compute_Hc needed 100 values, the batched kernel only min_window + 2 of them
+    with_hurst = seasonal_period >= 100 if with_hurst is None else with_hurst
+    optional = {"hurst_exponent": with_hurst, "acf": autocorrelation_lags > 0}
+    optional["pacf"] = optional["acf"]
+    return [
+        name
+        for name, feature in FEATURES_REGISTRY.items()
+        if feature.default and optional.get(name, True)
+    ]
+
+
+def estimate_features_cost(names: list, seasonal_period: int, n_windows: int) -> float:
+    """Estimate the time needed to compute the features, shared kernels being counted once.
+
+    Args:
+        names (list): The names of the features.
+        seasonal_period (int): The seasonal period, i.e the length of the rolling window.
+        n_windows (int): The number of windows.
+
+    Returns:
+        float: The estimated time, in seconds.
+    """
+    costs = dict()
+    for name in names:
+        feature = FEATURES_REGISTRY[name]
+        costs[feature.kernel] = max(
+            costs.get(feature.kernel, 0),
+            feature.estimate_cost(seasonal_period, n_windows),
+        )
+    return sum(costs.values())
+
+
+def select_features(
+    seasonal_period: int,
+    n_windows: int,
+    features: list = None,
+    time_budget: float = None,
+    with_hurst: bool = None,
+    autocorrelation_lags: int = 0,
+) -> list:
+    """Resolve the features to compute.
+
+    Args:
+        seasonal_period (int): The seasonal period, i.e the length of the rolling window.
+        n_windows (int): The number of windows.
+        features (list, optional): The names of the features. Defaults to None, i.e the default features.
+        time_budget (float, optional): The estimated time, in seconds, the features may take. The
+            cheapest features are kept within the budget. Defaults to None, i.e no budget.
+        with_hurst (bool, optional): See default_features. Ignored when features are given.
+        autocorrelation_lags (int, optional): See default_features. Ignored when features are given.
+
+    Returns:
+        list: The names of the selected features, in the given order.
+    """
+    if features is None:
+        names = default_features(seasonal_period, with_hurst, autocorrelation_lags)
+    else:
+        names = list(features)
+    unknown = [name for name in names if name not in FEATURES_REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown features : {unknown}.")
+    too_short = [
+        name for name in names if seasonal_period < FEATURES_REGISTRY[name].min_window
+    ]
+    if too_short:
+        raise ValueError(
+            f"Seasonal period too short for the features : {too_short}. "
+            f"Minimal lengths : {[FEATURES_REGISTRY[name].min_window for name in too_short]}."
+        )
+    if time_budget is None:
+        return names
+
+    selected = []
+    for name in sorted(
+        names,
+        key=lambda x: FEATURES_REGISTRY[x].estimate_cost(seasonal_period, n_windows),
+    ):
+        if (
+            estimate_features_cost(selected + [name], seasonal_period, n_windows)
+            <= time_budget
+        ):
+            selected.append(name)
+    return [name for name in names if name in selected]
+
+
+def compute_features(
+    serie: Series,
+    seasonal_period: int,
+    names: list,
+    profiler: Profiler = None,
+    **options,
+) -> DataFrame:
+    """Compute the selected features on every window of the serie, each kernel being called once.
+
+    Args:
+        serie (Series): The time series.
+        seasonal_period (int): The seasonal period, i.e the length of the rolling window.
+        names (list): The names of the features.
+        profiler (Profiler, optional): Times every kernel call, named after the features it computes.
+            Defaults to None.
+        **options: The kernels options (adf_lag, autocorrelation_lags, backend, ...).
+
+    Returns:
+        DataFrame: The features, aligned on the serie.
+    """
+    kernels_names = dict()
+    for name in names:
+        kernels_names.setdefault(FEATURES_REGISTRY[name].kernel, []).append(name)
+    results = dict()
+    columns = dict()
+    for name in names:
+        kernel = FEATURES_REGISTRY[name].kernel
+        if kernel not in results:
+            with measure(profiler, "features", ", ".join(kernels_names[kernel])):
+                results[kernel] = kernel(serie, seasonal_period, **options)
+        values = results[kernel][name]
+        if values.ndim == 2:
+            for i in range(values.shape[1]):
+                columns[f"{name}_{i + 1}"] = values[:, i]
+        else:
+            columns[name] = values
+    return DataFrame(columns, index=serie.index)
+
+
+## Built-in kernels
+def statistics_kernel(
+    serie: Series, seasonal_period: int, backend: str = "numpy", **options
+) -> dict:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend : {backend}. Available : {BACKENDS}.")
+    # numpy : cheap statistics are computed for all the windows at once,
+    # numba : in a single compiled loop over the windows
+    if backend == "numba":
+        return compiled_rolling_statistics(serie.to_numpy(dtype=float), seasonal_period)
+    return rolling_statistics(serie.to_numpy(dtype=float), seasonal_period)
+
+
+def stl_kernel(serie: Series, seasonal_period: int, **options) -> dict:
+    # both strengths share a single STL fit per window
+    strengths = apply_on_windows(
+        serie,
+        seasonal_period,
+        lambda x: stl_strengths(x, seasonal_period),
+        n_outputs=2,
+    )
+    return {"trend_strength": strengths[:, 0], "seasonal_strength": strengths[:, 1]}
+
+
+def hurst_kernel(serie: Series, seasonal_period: int, **options) -> dict:
+    return {
+        "hurst_exponent": apply_batched_on_windows(
+            serie, seasonal_period, batched_hurst_exponent
+        )[:, 0]
+    }
+
+
+def spectral_entropy_kernel(serie: Series, seasonal_period: int, **options) -> dict:
+    return {
+        "spectral_entropy": apply_batched_on_windows(
+            serie, seasonal_period, batched_spectral_entropy
+        )[:, 0]
+    }
+
+
+def adf_kernel(
+    serie: Series, seasonal_period: int, adf_lag: int = None, **options
+) -> dict:
+    # without a fixed lag order, the ADF lags are selected by AIC as adfuller does
+    return {
+        "adf_pvalue": apply_batched_on_windows(
+            serie,
+            seasonal_period,
+            lambda x: batched_adf_pvalue(
+                x, maxlag=adf_lag, autolag="AIC" if adf_lag is None else None
+            ),
+        )[:, 0]
+    }
+
+
+def autocorrelation_kernel(
+    serie: Series, seasonal_period: int, autocorrelation_lags: int = 0, **options
+) -> dict:
+    nlags = autocorrelation_lags or min(
+        DEFAULT_AUTOCORRELATION_LAGS, seasonal_period // 2
+    )
+    if nlags > seasonal_period // 2:
+        raise ValueError(
+            "Autocorrelation lags must be at most half of the seasonal period."
+        )
+    return {
+        name: apply_batched_on_windows(
+            serie,
+            seasonal_period,
+            lambda x: kernel(x, nlags),
+            n_outputs=nlags,
+        )
+        for name, kernel in [
+            ("acf", batched_autocorrelation),
+            ("pacf", batched_partial_autocorrelation),
+        ]
+    }
+
+
+# costs measured on a single core, in seconds per window of 100 values, and memories in float64
+# values per window value, the batched kernels holding their buffers for a chunk of windows
+for name in ["mean", "median", "std", "q1", "q3"]:
+    register_feature(name, statistics_kernel, cost=2e-6, default=True, memory=2)
+for name in ["trend_strength", "seasonal_strength"]:
+    register_feature(
+        name, stl_kernel, min_window=2, cost=7.5e-3, complexity=2, default=True
+    )
+for name in ["lumpiness", "spikiness", "curvature"]:
+    register_feature(name, statistics_kernel, cost=2e-6, default=True, memory=2)
+# the Hurst exponent and the autocorrelations are only computed by default when requested
+register_feature("hurst_exponent", hurst_kernel, min_window=12, cost=1e-5, default=True)
+register_feature("spectral_entropy", spectral_entropy_kernel, cost=5e-6, default=True)
+# the ADF regressions hold a design matrix growing with the lag, itself with the window
+register_feature(
+    "adf_pvalue", adf_kernel, min_window=8, cost=7.5e-5, default=True, memory=40
+)
+register_feature(
+    "acf", autocorrelation_kernel, min_window=2, cost=1e-5, default=True, memory=16
+)
+register_feature(
+    "pacf", autocorrelation_kernel, min_window=2, cost=1e-5, default=True, memory=16
+)
@@ -0,0 +1,81 @@
+from sklearn.base import RegressorMixin
+from src.multi_horizon_tools import multi_horizon_model
+from numpy import ndarray, ones, eye, hstack, atleast_2d
+from numpy.linalg import pinv, solve
+
+
+class RecursiveLeastSquares:
+    """Multi-output (ridge) least squares, updated with new samples without refitting.
+    All the outputs share the same features, hence a single inverse covariance matrix,
+    updated by the Woodbury identity (a rank-one update per new sample).
+
+    Args:
+        alpha (float, optional): The ridge penalty, the intercept not being penalized. Defaults to 0.
+        fit_intercept (bool, optional): Whether to fit an intercept. Defaults to True.
+    """
+
+    def __init__(self, alpha: float = 0.0, fit_intercept: bool = True) -> None:
+        self.alpha = alpha
+        self.fit_intercept = fit_intercept
+
+    def __design(self, X: ndarray) -> ndarray:
+        X = atleast_2d(X)
+        return hstack((X, ones((X.shape[0], 1)))) if self.fit_intercept else X
+
+    def fit(self, X: ndarray, y: ndarray):
+        design = self.__design(X)
+        penalty = self.alpha * eye(design.shape[1])
+        if self.fit_intercept:
+            penalty[-1, -1] = 0
+        self.P_ = pinv(design.T @ design + penalty)
+        self.coef_ = self.P_ @ design.T @ y
+        return self
+
+    def partial_fit(self, X: ndarray, y: ndarray):
+        """Update the coefficients with new samples.
+
+        Args:
+            X (ndarray): The (n_samples, n_features) new features.
+            y (ndarray): The (n_samples, n_outputs) new targets.
+
+        Returns:
+            RecursiveLeastSquares: The updated model.
+        """
+        design = self.__design(X)
+        PA = self.P_ @ design.T
+        gain = solve(eye(design.shape[0]) + design @ PA, PA.T).T
+        self.coef_ = self.coef_ + gain @ (y - design @ self.coef_)
+        self.P_ = self.P_ - gain @ PA.T
+        return self
+
+    def predict(self, X: ndarray) -> ndarray:
+        return self.__design(X) @ self.coef_
+
+
+def incremental_model(
+    estimator: RegressorMixin, strategy: str = "direct"
+) -> [object, bool]:
+    """An unfitted multi-output counterpart of the estimator, updated incrementally when possible.
+
+    Args:
+        estimator (RegressorMixin): The single output estimator.
+        strategy (str, optional): The multi-horizon strategy, see multi_horizon_model. Defaults to "direct".
+
+    Returns:
+        [object, bool]: The model, with fit, predict and, if incremental, partial_fit methods,
+            and whether it can be updated with partial_fit.
+    """
+    # sklearn.linear_model is only imported when backtesting, to keep imports fast
+    from sklearn.linear_model import LinearRegression, Ridge
+
+    # direct and native linear models are the same least squares
+    if strategy != "stacked" and isinstance(estimator, (LinearRegression, Ridge)):
+        return (
+            RecursiveLeastSquares(
+                alpha=float(getattr(estimator, "alpha", 0.0)),
+                fit_intercept=estimator.fit_intercept,
+            ),
+            True,
+        )
+    model = multi_horizon_model(estimator, strategy)
+    return model, strategy == "direct" and hasattr(model, "partial_fit")
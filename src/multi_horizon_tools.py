@@ -0,0 +1,70 @@
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+from sklearn.multioutput import MultiOutputRegressor
+from numpy import ndarray, asarray, repeat, tile, arange, column_stack
+
+STRATEGIES = ["direct", "native", "stacked"]
+
+
+class StackedHorizonRegressor(BaseEstimator, RegressorMixin):
+    """A single model for all the horizon steps, the step being an additional feature.
+    Each sample is repeated once per step, with the value of the target at this step.
+
+    Args:
+        estimator (RegressorMixin): The single output estimator.
+    """
+
+    def __init__(self, estimator: RegressorMixin) -> None:
+        self.estimator = estimator
+
+    @staticmethod
+    def stack_horizon(X: ndarray, horizon: int) -> ndarray:
+        """Repeat the samples once per horizon step, adding the step as the last feature.
+
+        Args:
+            X (ndarray): The (n_samples, n_features) features.
+            horizon (int): The number of steps.
+
+        Returns:
+            ndarray: The (n_samples * horizon, n_features + 1) features, sample-major.
+        """
+        X = asarray(X)
+        return column_stack(
+            (repeat(X, horizon, axis=0), tile(arange(1, horizon + 1), X.shape[0]))
+        )
+
+    def fit(self, X: ndarray, y: ndarray):
+        y = asarray(y)
+        self.horizon_ = y.shape[1]
+        self.estimator_ = clone(self.estimator).fit(
+            self.stack_horizon(X, self.horizon_), y.ravel()
+        )
+        return self
+
+    def predict(self, X: ndarray) -> ndarray:
+        return self.estimator_.predict(self.stack_horizon(X, self.horizon_)).reshape(
+            -1, self.horizon_
+        )
+
+
+def multi_horizon_model(
+    estimator: RegressorMixin, strategy: str = "direct", n_jobs: int = None
+) -> RegressorMixin:
+    """An unfitted model forecasting all the horizon steps.
+
+    Args:
+        estimator (RegressorMixin): The single output estimator.
+        strategy (str, optional): "direct" for one model per horizon step, "native" for a single
+            multi-output model (estimators natively supporting 2D targets), "stacked" for a single
+            model with the horizon step as a feature. Defaults to "direct".
+        n_jobs (int, optional): The number of jobs fitting the direct models. Defaults to None.
+
+    Returns:
+        RegressorMixin: The model.
+    """
+    if strategy == "direct":
+        return MultiOutputRegressor(clone(estimator), n_jobs=n_jobs)
+    if strategy == "native":
+        return clone(estimator)
+    if strategy == "stacked":
+        return StackedHorizonRegressor(clone(estimator))
+    raise ValueError(f"Unknown strategy : {strategy}. Available : {STRATEGIES}.")
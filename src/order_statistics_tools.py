@@ -0,0 +1,163 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+from math import floor
+from numpy import ndarray, full, nan, zeros
+
+# length of the blocks of SortedWindow, blocks being split at twice this length
+BLOCK_LENGTH = 256
+
+
+class SortedWindow:
+    """The sorted values of a sliding window, for order statistics updated in O(log w).
+    Values are held in sorted blocks of about BLOCK_LENGTH values : inserting or removing a value
+    is a binary search among the blocks maxima, then in a block, and the k-th smallest value a
+    binary search among the cumulative blocks lengths. Only a block is shifted per update.
+
+    Args:
+        block_length (int, optional): The length of the blocks. Defaults to BLOCK_LENGTH.
+    """
+
+    def __init__(self, block_length: int = BLOCK_LENGTH) -> None:
+        self.block_length = block_length
+        self.blocks = []
+        # the last value of each block
+        self.maxes = []
+        # the cumulative lengths of the blocks, rebuilt on the first query following an update
+        self.positions = None
+        self.size = 0
+
+    def add(self, value: float) -> None:
+        self.size += 1
+        self.positions = None
+        if not self.blocks:
+            self.blocks.append([value])
+            self.maxes.append(value)
+            return
+        k = bisect_left(self.maxes, value)
+        if k == len(self.blocks):
+            k -= 1
+            self.blocks[k].append(value)
+            self.maxes[k] = value
+        else:
+            insort(self.blocks[k], value)
+        block = self.blocks[k]
+        if len(block) > 2 * self.block_length:
+            self.blocks[k : k + 1] = [
+                block[: self.block_length],
+                block[self.block_length :],
+            ]
+            self.maxes.insert(k, block[self.block_length - 1])
+
+    def remove(self, value: float) -> None:
+        """Remove a value of the window.
+
+        Args:
+            value (float): The value, that must be in the window.
+        """
+        self.size -= 1
+        self.positions = None
+        k = bisect_left(self.maxes, value)
+        block = self.blocks[k]
+        del block[bisect_left(block, value)]
+        if not block:
+            del self.blocks[k], self.maxes[k]
+        else:
+            self.maxes[k] = block[-1]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, k: int) -> float:
+        # k-th smallest value
+        if self.positions is None:
+            self.positions = list(accumulate(map(len, self.blocks)))
+        k = k + self.size if k < 0 else k
+        block = bisect_right(self.positions, k)
+        return self.blocks[block][k - (self.positions[block - 1] if block else 0)]
+
+    def count_greater(self, value: float) -> int:
+        """Count the values of the window strictly greater than a value.
+
+        Args:
+            value (float): The value.
+
+        Returns:
+            int: The number of greater values.
+        """
+        if self.positions is None:
+            self.positions = list(accumulate(map(len, self.blocks)))
+        # the blocks before k only hold values lower or equal to the value
+        k = bisect_right(self.maxes, value)
+        if k == len(self.blocks):
+            return 0
+        lower = self.positions[k - 1] if k else 0
+        return self.size - lower - bisect_right(self.blocks[k], value)
+
+    def median(self) -> float:
+        # as numpy.median, the mean of the two middle values
+        return (self[(self.size - 1) // 2] + self[self.size // 2]) / 2
+
+    def quantile(self, q: float) -> float:
+        """The linear quantile of the window, matching numpy.quantile.
+
+        Args:
+            q (float): The quantile to compute, between 0 and 1.
+
+        Returns:
+            float: The quantile.
+        """
+        position = q * (self.size - 1)
+        lower = int(floor(position))
+        weight = position - lower
+        lower_value = self[lower]
+        upper_value = self[min(lower + 1, self.size - 1)]
+        delta = upper_value - lower_value
+        if weight >= 0.5:
+            return upper_value - delta * (1 - weight)
+        return lower_value + delta * weight
+
+
+def sliding_order_statistics(serie: ndarray, window: int) -> dict:
+    """Compute the order statistics of every full window, a SortedWindow being updated by one
+    insertion and one removal per step. All the statistics are read from the same structure.
+    Windows containing NaNs give NaNs.
+
+    Args:
+        serie (ndarray): The time series.
+        window (int): The length of the rolling window.
+
+    Returns:
+        dict: The median, q1, q3 and spikiness arrays of the n - window + 1 windows, and a constant
+            boolean array, True for the windows whose values are all equal.
+    """
+    values = serie.tolist()
+    n_windows = max(0, len(values) - window + 1)
+    statistics = {
+        name: full(n_windows, nan) for name in ["median", "q1", "q3", "spikiness"]
+    }
+    statistics["constant"] = zeros(n_windows, dtype=bool)
+    sorted_window = SortedWindow()
+    n_nans = 0
+    for i, value in enumerate(values):
+        # NaNs are counted, not stored
+        if value != value:
+            n_nans += 1
+        else:
+            sorted_window.add(value)
+        if i >= window:
+            outgoing = values[i - window]
+            if outgoing != outgoing:
+                n_nans -= 1
+            else:
+                sorted_window.remove(outgoing)
+        if i < window - 1 or n_nans:
+            continue
+
+        j = i - window + 1
+        median = sorted_window.median()
+        statistics["median"][j] = median
+        statistics["q1"][j] = sorted_window.quantile(0.25)
+        statistics["q3"][j] = sorted_window.quantile(0.75)
+        statistics["spikiness"][j] = sorted_window.count_greater(median) / window
+        statistics["constant"][j] = sorted_window[0] == sorted_window[-1]
+    return statistics
@@ -0,0 +1,65 @@
+from contextlib import nullcontext
+from pickle import PickleBuffer, dump, load, loads, dumps
+from numpy import memmap, fromfile, uint8
+
+# buffers at least this large are written apart, to be memory-mapped on load
+MMAP_MIN_NBYTES = 1 << 16
+# offsets of the buffers in the data file
+ALIGNMENT = 64
+
+
+def save_object(obj: object, path: str, mmap_min_nbytes: int = MMAP_MIN_NBYTES) -> None:
+    """Pickle an object, its large arrays being written raw to path + ".bin".
+    Uses the out-of-band buffers of pickle protocol 5, so that loading needs neither a copy
+    of the large arrays nor the slow unpickler of joblib.
+
+    Args:
+        obj (object): The object to save.
+        path (str): The file to pickle the object to.
+        mmap_min_nbytes (int, optional): The size, in bytes, from which a buffer is written apart.
+            Defaults to MMAP_MIN_NBYTES.
+    """
+    buffers = []
+
+    def out_of_band(buffer: PickleBuffer) -> bool:
+        # a false value keeps the buffer out of the pickle
+        if buffer.raw().nbytes < mmap_min_nbytes:
+            return True
+        buffers.append(buffer)
+        return False
+
+    payload = dumps(obj, protocol=5, buffer_callback=out_of_band)
+    layout, offset = [], 0
+    with open(path + ".bin", "wb") if buffers else nullcontext() as file:
+        for buffer in buffers:
+            raw = buffer.raw()
+            file.write(b"\0" * (-offset % ALIGNMENT))
+            offset += -offset % ALIGNMENT
+            file.write(raw)
+            layout.append((offset, raw.nbytes))
+            offset += raw.nbytes
+    with open(path, "wb") as file:
+        dump((layout, payload), file, protocol=5)
+
+
+def load_object(path: str, mmap_mode: str = "r") -> object:
+    """Load an object saved by save_object.
+
+    Args:
+        path (str): The file the object was pickled to.
+        mmap_mode (str, optional): The numpy.memmap mode of the large arrays, "r" for read-only or
+            "c" for copy-on-write. Defaults to "r". None reads them in memory.
+
+    Returns:
+        object: The object.
+    """
+    with open(path, "rb") as file:
+        layout, payload = load(file)
+    if not layout:
+        return loads(payload)
+    data = (
+        fromfile(path + ".bin", dtype=uint8)
+        if mmap_mode is None
+        else memmap(path + ".bin", dtype=uint8, mode=mmap_mode)
+    )
+    return loads(payload, buffers=[data[offset : offset + n] for offset, n in layout])
@@ -1,73 +1,295 @@
-from pandas import Series, DataFrame
-from numpy import ndarray, nanmean, nanmedian, nanquantile, nanstd
-from src.features_computation_tools import (
-    seasonal_strength,
-    trend_strength,
-    spikiness,
-    lumpiness,
-    curvature,
-    spectral_entropy,
-    hurst_exponent,
-    adf_pvalue,
+from concurrent.futures import Executor, ProcessPoolExecutor
+from os import cpu_count
+from warnings import warn
+from pandas import Series, DataFrame, DatetimeIndex, Index, concat, date_range
+from numpy import (
+    ndarray,
+    linspace,
+    concatenate,
+    full,
+    nan,
+    isnan,
+    arange,
+    stack,
+    hstack,
+    empty,
+    dtype as numpy_dtype,
 )
+from numpy.lib.stride_tricks import sliding_window_view
+from src.features_registry import (
+    DEFAULT_AUTOCORRELATION_LAGS,
+    FEATURES_REGISTRY,
+    select_features,
+    compute_features,
+)
+from src.feature_store import FeatureStore
+from src.profiling_tools import Profiler, measure
+
+# the number of rows whose window features are computed at once when a dtype is requested
+FEATURES_BLOCK_SIZE = 2**14
+
+
+def build_window_features(
+    serie: Series,
+    seasonal_period: int,
+    with_hurst: bool = None,
+    adf_lag: int = None,
+    autocorrelation_lags: int = 0,
+    features: list = None,
+    time_budget: float = None,
+    profiler: Profiler = None,
+    backend: str = "numpy",
+    dtype=None,
+) -> DataFrame:
+    names = select_features(
+        seasonal_period,
+        max(0, serie.shape[0] - seasonal_period + 1),
+        features=features,
+        time_budget=time_budget,
+        with_hurst=with_hurst,
+        autocorrelation_lags=autocorrelation_lags,
+    )
+    options = dict(
+        profiler=profiler,
+        adf_lag=adf_lag,
+        autocorrelation_lags=autocorrelation_lags,
+        backend=backend,
+    )
+    if dtype is None:
+        return compute_features(serie, seasonal_period, names, **options)
+    # the float64 kernel outputs are cast block by block, each block carrying the
+    # seasonal_period - 1 previous points, so that a single block of them is held at once
+    values = None
+    for start in range(0, max(1, serie.shape[0]), FEATURES_BLOCK_SIZE):
+        stop = min(serie.shape[0], start + FEATURES_BLOCK_SIZE)
+        first = max(0, start - seasonal_period + 1)
+        block = compute_features(
+            serie.iloc[first:stop], seasonal_period, names, **options
+        )
+        if values is None:
+            values = empty((serie.shape[0], block.shape[1]), dtype=dtype)
+            columns = block.columns
+        values[start:stop] = block.to_numpy()[start - first :]
+    return DataFrame(values, index=serie.index, columns=columns)
+
+
+def lags_view(serie: Series, depth: int, dtype=None) -> ndarray:
+    """The Hankel view of the NaN-padded serie, column depth - k of row t being the value at t - k.
+
+    Args:
+        serie (Series): The time series.
+        depth (int): The largest lag.
+        dtype (optional): The dtype of the view. Defaults to None, i.e float64.
+
+    Returns:
+        ndarray: The (len(serie), depth) view, without copy of the serie.
+    """
+    dtype = float if dtype is None else dtype
+    padded = concatenate((full(depth, nan, dtype=dtype), serie.to_numpy(dtype=dtype)))
+    return sliding_window_view(padded[:-1], depth)
+
+
+def build_lags(
+    serie: Series,
+    seasonal_period: int,
+    lags_to_consider: int = 5,
+    hankel=None,
+    dtype=None,
+) -> DataFrame:
+    # lags are gathered at once from a Hankel view, which can be shared with deeper lags
+    if hankel is None:
+        hankel = lags_view(serie, seasonal_period + lags_to_consider, dtype)
+    depth = hankel.shape[1]
+    shifts = arange(1, lags_to_consider + 1)
+    return DataFrame(
+        hankel[
+            :, stack((depth - shifts, depth - shifts - seasonal_period), axis=1).ravel()
+        ],
+        index=serie.index,
+        columns=[f"{name} {i}" for i in shifts for name in ["lag", "seasonal lag"]],
+    )
+
+
+def build_window_features_by_chunks(
+    serie: Series,
+    seasonal_period: int,
+    n_chunks: int,
+    executor: Executor,
+    **features_options,
+) -> DataFrame:
+    """Compute build_window_features on contiguous chunks of windows through an executor.
+    Each chunk carries the seasonal_period - 1 previous points, so that every window is computed once.
+
+    Args:
+        serie (Series): The time series.
+        seasonal_period (int): The seasonal period, i.e the length of the rolling window.
+        n_chunks (int): The number of chunks to split the windows into.
+        executor (Executor): The executor the chunks are submitted to.
+        **features_options: The options of build_window_features (features, adf_lag, ...).
+
+    Returns:
+        DataFrame: The same features as build_window_features(serie, seasonal_period, **features_options).
+    """
+    bounds = linspace(0, serie.shape[0], n_chunks + 1).astype(int)
+    starts = [max(0, bound - seasonal_period + 1) for bound in bounds[:-1]]
+    futures = [
+        executor.submit(
+            build_window_features,
+            serie.iloc[start:stop],
+            seasonal_period,
+            **features_options,
+        )
+        for start, stop in zip(starts, bounds[1:])
+    ]
+    return concat(
+        [
+            future.result().iloc[bound - start :]
+            for future, bound, start in zip(futures, bounds[:-1], starts)
+        ]
+    )
 
 
 def build_rolling_features(
-    serie: Series, seasonal_period: int, lags_to_consider: int = 5
+    serie: Series,
+    seasonal_period: int,
+    lags_to_consider: int = 5,
+    n_jobs: int = None,
+    executor: Executor = None,
+    with_hurst: bool = None,
+    adf_lag: int = None,
+    autocorrelation_lags: int = 0,
+    features: list = None,
+    time_budget: float = None,
+    cache: FeatureStore = None,
+    profiler: Profiler = None,
+    backend: str = "numpy",
+    dtype=None,
 ) -> DataFrame:
-    if seasonal_period >= 100:  # Hurst exponent needs 100 values to works
-        rolling_features = serie.rolling(window=seasonal_period).aggregate(
-            {
-                "mean": nanmean,
-                "median": nanmedian,
-                "std": nanstd,
-                "q1": lambda x: nanquantile(a=x, q=0.25),
-                "q3": lambda x: nanquantile(a=x, q=0.75),
-                "trend_strength": lambda x: trend_strength(x, seasonal_period),
-                "seasonal_strength": lambda x: seasonal_strength(x, seasonal_period),
-                "lumpiness": lumpiness,
-                "spikiness": spikiness,
-                "curvature": curvature,
-                "hurst_exponent": hurst_exponent,
-                "spectral_entropy": spectral_entropy,
-                "adf_pvalue": adf_pvalue,
-            }
+    # the selection is resolved once, on the whole serie
+    features_options = dict(
+        adf_lag=adf_lag,
+        autocorrelation_lags=autocorrelation_lags,
+        backend=backend,
+        dtype=dtype,
+        features=select_features(
+            seasonal_period,
+            max(0, serie.shape[0] - seasonal_period + 1),
+            features=features,
+            time_budget=time_budget,
+            with_hurst=with_hurst,
+            autocorrelation_lags=autocorrelation_lags,
+        ),
+    )
+    if cache is not None:
+        parameters = dict(
+            seasonal_period=seasonal_period,
+            lags_to_consider=lags_to_consider,
+            **features_options,
         )
+        # both backends compute the same features, float64 ones being stored without dtype
+        del parameters["backend"]
+        if dtype is None:
+            del parameters["dtype"]
+        else:
+            parameters["dtype"] = str(numpy_dtype(dtype))
+        with measure(profiler, "cache", "load"):
+            cached, n_points = cache.load(serie, parameters)
+        if cached is not None and n_points == serie.shape[0]:
+            return cached
+        # only the points following the stored prefix are computed
+        start = max(0, n_points - seasonal_period - lags_to_consider)
+        rolling_features = build_rolling_features(
+            serie.iloc[start:],
+            seasonal_period,
+            lags_to_consider,
+            n_jobs=n_jobs,
+            executor=executor,
+            profiler=profiler,
+            **features_options,
+        )
+        if cached is not None and cached.shape[0]:
+            rolling_features = concat(
+                (cached, rolling_features[rolling_features.index > cached.index[-1]])
+            )
+        with measure(profiler, "cache", "save"):
+            cache.save(serie, parameters, rolling_features)
+        return rolling_features
+
+    n_jobs = cpu_count() if n_jobs is not None and n_jobs < 0 else n_jobs
+    # the kernels running in other processes, parallel builds are only timed as a whole
+    if executor is not None:
+        with measure(profiler, "features", "chunks"):
+            rolling_features = build_window_features_by_chunks(
+                serie,
+                seasonal_period,
+                n_jobs or cpu_count(),
+                executor,
+                **features_options,
+            )
+    elif n_jobs is not None and n_jobs > 1:
+        with measure(profiler, "features", "chunks"), ProcessPoolExecutor(
+            max_workers=n_jobs
+        ) as pool:
+            rolling_features = build_window_features_by_chunks(
+                serie, seasonal_period, n_jobs, pool, **features_options
+            )
     else:
-        rolling_features = serie.rolling(window=seasonal_period).aggregate(
-            {
-                "mean": nanmean,
-                "median": nanmedian,
-                "std": nanstd,
-                "q1": lambda x: nanquantile(a=x, q=0.25),
-                "q3": lambda x: nanquantile(a=x, q=0.75),
-                "trend_strength": lambda x: trend_strength(x, seasonal_period),
-                "seasonal_strength": lambda x: seasonal_strength(x, seasonal_period),
-                "lumpiness": lumpiness,
-                "spikiness": spikiness,
-                "curvature": curvature,
-                "spectral_entropy": spectral_entropy,
-                "adf_pvalue": adf_pvalue,
-            }
+        rolling_features = build_window_features(
+            serie, seasonal_period, profiler=profiler, **features_options
         )
     # adding lags to the rolling features
-    direct_lags = {f"lag {i}": serie.shift(i) for i in range(1, lags_to_consider + 1)}
-    seasonal_lags = {
-        f"seasonal lag {i}": serie.shift(i + seasonal_period)
-        for i in range(1, lags_to_consider + 1)
-    }
+    with measure(profiler, "lags"):
+        return join_lags(
+            rolling_features,
+            build_lags(serie, seasonal_period, lags_to_consider, dtype=dtype),
+            dtype,
+        )
+
+
+def join_lags(window_features: DataFrame, lags: DataFrame, dtype=None) -> DataFrame:
+    """Join the window features and the lags of a serie, keeping the complete rows only.
 
-    for lag, seasonal_lag in zip(direct_lags.keys(), seasonal_lags.keys()):
-        rolling_features[lag] = direct_lags[lag]
-        rolling_features[seasonal_lag] = seasonal_lags[seasonal_lag]
+    Args:
+        window_features (DataFrame): The window features, indexed as the serie.
+        lags (DataFrame): The lags, indexed as the serie.
+        dtype (optional): The dtype of the rolling features. Defaults to None, i.e float64.
 
-    return rolling_features.dropna(axis=0)
+    Returns:
+        DataFrame: The rolling features.
+    """
+    n_features = window_features.shape[1]
+    values = empty(
+        (lags.shape[0], n_features + lags.shape[1]),
+        dtype=float if dtype is None else dtype,
+    )
+    values[:, :n_features] = window_features.to_numpy()
+    values[:, n_features:] = lags.to_numpy()
+    # rows with NaNs are dropped, by a slice when they all precede the complete ones
+    complete = ~isnan(values).any(axis=1)
+    first = complete.argmax()
+    rows = slice(first, None) if complete[first:].all() else complete
+    return DataFrame(
+        values[rows],
+        index=lags.index[rows],
+        columns=window_features.columns.append(lags.columns),
+    )
 
 
-def build_rolling_target(serie: ndarray, horizon: int) -> DataFrame:
-    result = DataFrame({f"t+{i}": serie.shift(-i) for i in range(1, horizon + 1)})
-    result.index = serie.index
-    return result.dropna(axis=0)
+def build_rolling_target(serie: ndarray, horizon: int, dtype=None) -> DataFrame:
+    # each row is a strided view of the next horizon values, copied only to drop NaNs
+    values = serie.to_numpy(dtype=float if dtype is None else dtype)
+    targets = (
+        sliding_window_view(values[1:], horizon)
+        if values.shape[0] > horizon
+        else empty((0, horizon), dtype=values.dtype)
+    )
+    index = serie.index[: targets.shape[0]]
+    if isnan(values[1:]).any():
+        complete = ~isnan(targets).any(axis=1)
+        targets, index = targets[complete], index[complete]
+    return DataFrame(
+        targets, index=index, columns=[f"t+{i}" for i in range(1, horizon + 1)]
+    )
 
 
 def build_rolling_XY(
@@ -75,12 +297,430 @@ def build_rolling_XY(
     seasonal_period: int,
     horizon: int = -1,
     lags_to_consider: int = 5,
+    n_jobs: int = None,
+    executor: Executor = None,
+    with_hurst: bool = None,
+    adf_lag: int = None,
+    autocorrelation_lags: int = 0,
+    features: list = None,
+    time_budget: float = None,
+    cache: FeatureStore = None,
+    profiler: Profiler = None,
+    dtype=None,
+    memory_budget: int = None,
+    backend: str = "numpy",
 ) -> [DataFrame, DataFrame, DataFrame, DataFrame]:
     horizon = seasonal_period if horizon == -1 else horizon
-    X = build_rolling_features(serie, horizon, lags_to_consider=5)
-    y = build_rolling_target(serie, horizon)[lags_to_consider:]
+    # the budget is checked before building anything
+    if memory_budget is not None:
+        names = select_features(
+            seasonal_period,
+            max(0, serie.shape[0] - seasonal_period + 1),
+            features=features,
+            time_budget=time_budget,
+            with_hurst=with_hurst,
+            autocorrelation_lags=autocorrelation_lags,
+        )
+        nbytes = estimate_rolling_XY_nbytes(
+            serie.shape[0],
+            seasonal_period,
+            horizon,
+            lags_to_consider,
+            names,
+            autocorrelation_lags,
+            dtype,
+        )
+        if nbytes > memory_budget:
+            warn(
+                f"The features and targets need about {nbytes / 2**20:.1f} MiB, over the memory "
+                f"budget of {memory_budget / 2**20:.1f} MiB. Use dtype='float32' or stream "
+                "them by blocks with iter_rolling_XY."
+            )
+
+    X = build_rolling_features(
+        serie,
+        seasonal_period,
+        lags_to_consider,
+        n_jobs=n_jobs,
+        executor=executor,
+        with_hurst=with_hurst,
+        adf_lag=adf_lag,
+        autocorrelation_lags=autocorrelation_lags,
+        features=features,
+        time_budget=time_budget,
+        cache=cache,
+        profiler=profiler,
+        backend=backend,
+        dtype=dtype,
+    )
+    with measure(profiler, "targets"):
+        y = build_rolling_target(serie, horizon, dtype)[lags_to_consider:]
+    aligned_X, aligned_y = align_XY(X, y)
+    return X, aligned_X, y, aligned_y
+
+
+def align_XY(X: DataFrame, y: DataFrame) -> [DataFrame, DataFrame]:
+    """Select the rows of the features and targets sharing the same origin.
+
+    Args:
+        X (DataFrame): The rolling features.
+        y (DataFrame): The rolling targets.
+
+    Returns:
+        [DataFrame, DataFrame]: The aligned features and targets.
+    """
+    # the aligned frames are slices, i.e views, of the features and targets
     common_index = X.index.intersection(y.index)
-    return X, X.loc[common_index], y, y.loc[common_index]
+    return __aligned(X, common_index), __aligned(y, common_index)
+
+
+def __aligned(frame: DataFrame, index: Index) -> DataFrame:
+    """Private method selecting the rows of a frame, by a slice when they are contiguous.
+
+    Args:
+        frame (DataFrame): The frame.
+        index (Index): The rows to select, in the order of the frame.
+
+    Returns:
+        DataFrame: The selected rows, a view of the frame when they are contiguous.
+    """
+    if index.shape[0] == 0:
+        return frame.iloc[:0]
+    start = frame.index.get_loc(index[0])
+    if isinstance(start, int) and frame.index[start : start + index.shape[0]].equals(
+        index
+    ):
+        return frame.iloc[start : start + index.shape[0]]
+    return frame.loc[index]
+
+
+def estimate_rolling_XY_nbytes(
+    n_points: int,
+    seasonal_period: int,
+    horizon: int,
+    lags_to_consider: int,
+    features: list,
+    autocorrelation_lags: int = 0,
+    dtype=None,
+) -> int:
+    """Estimate the peak memory taken by building the rolling features and the aligned targets.
+    The rolling features are held twice while the lags are joined, after the float64 kernels ran
+    on the whole serie, or on blocks of FEATURES_BLOCK_SIZE rows when a dtype is requested,
+    holding the memory their features are registered with.
+
+    Args:
+        n_points (int): The length of the serie.
+        seasonal_period (int): The seasonal period.
+        horizon (int): The forecast horizon.
+        lags_to_consider (int): The number of lags and seasonal lags.
+        features (list): The names of the features.
+        autocorrelation_lags (int, optional): The number of acf_k and pacf_k columns. Defaults to 0.
+        dtype (optional): The dtype of the frames. Defaults to None, i.e float64.
+
+    Returns:
+        int: The estimated number of bytes.
+    """
+    nlags = autocorrelation_lags or min(
+        DEFAULT_AUTOCORRELATION_LAGS, seasonal_period // 2
+    )
+    n_features = sum(nlags if name in ["acf", "pacf"] else 1 for name in features)
+    n_columns = 2 * lags_to_consider + n_features
+    itemsize = numpy_dtype(float if dtype is None else dtype).itemsize
+    # a kernel computes all its features in float64, the selected ones or not, and the
+    # DataFrame of the selected ones is a copy of them
+    kernels = {
+        FEATURES_REGISTRY[name].kernel: FEATURES_REGISTRY[name] for name in features
+    }
+    n_outputs = sum(
+        nlags if name in ["acf", "pacf"] else 1
+        for name, feature in FEATURES_REGISTRY.items()
+        if feature.kernel in kernels
+    )
+    # the kernels run on the whole serie, or on blocks cast into the window features
+    rows = (
+        n_points
+        if dtype is None
+        else min(n_points, FEATURES_BLOCK_SIZE + seasonal_period - 1)
+    )
+    kernels_nbytes = (n_outputs + n_features) * rows * 8 + max(
+        [
+            feature.estimate_nbytes(seasonal_period, rows)
+            for feature in kernels.values()
+        ],
+        default=0,
+    )
+    if dtype is not None:
+        kernels_nbytes += n_features * n_points * itemsize
+    join_nbytes = n_points * 2 * n_columns * itemsize
+    return n_points * horizon * itemsize + max(kernels_nbytes, join_nbytes)
+
+
+def iter_rolling_XY(
+    serie: Series,
+    seasonal_period: int,
+    horizon: int = -1,
+    lags_to_consider: int = 5,
+    block_size: int = None,
+    memory_budget: int = None,
+    dtype=None,
+    **features_options,
+):
+    """Stream the aligned features and targets of build_rolling_XY by blocks of rows.
+    Each block is computed on its own points, the seasonal_period + lags_to_consider previous
+    ones and the horizon next ones, so that at most one block is held in memory.
+
+    Args:
+        serie (Series): The time series.
+        seasonal_period (int): The seasonal period, i.e the length of the rolling window.
+        horizon (int, optional): The forecast horizon. Defaults to -1, i.e the seasonal period.
+        lags_to_consider (int, optional): The number of lags and seasonal lags. Defaults to 5.
+        block_size (int, optional): The number of points per block. Defaults to None, i.e as many
+            as the memory budget allows.
+        memory_budget (int, optional): The memory, in bytes, a block may take. Defaults to None,
+            i.e a single block.
+        dtype (optional): The dtype of the blocks. Defaults to None, i.e float64.
+        **features_options: The options of build_rolling_features (features, adf_lag, ...).
+
+    Yields:
+        [DataFrame, DataFrame]: The aligned features and targets of a block.
+    """
+    horizon = seasonal_period if horizon == -1 else horizon
+    # the selection is resolved once, for all the blocks to have the same columns
+    features_options["features"] = select_features(
+        seasonal_period,
+        max(0, serie.shape[0] - seasonal_period + 1),
+        features=features_options.get("features"),
+        time_budget=features_options.pop("time_budget", None),
+        with_hurst=features_options.pop("with_hurst", None),
+        autocorrelation_lags=features_options.get("autocorrelation_lags", 0),
+    )
+    if block_size is None:
+        row_nbytes = estimate_rolling_XY_nbytes(
+            1,
+            seasonal_period,
+            horizon,
+            lags_to_consider,
+            features_options["features"],
+            features_options.get("autocorrelation_lags", 0),
+            dtype,
+        )
+        block_size = (
+            serie.shape[0]
+            if memory_budget is None
+            else max(1, memory_budget // row_nbytes)
+        )
+
+    overlap = seasonal_period + lags_to_consider
+    for start in range(0, serie.shape[0], block_size):
+        stop = min(serie.shape[0], start + block_size)
+        _, X, _, y = build_rolling_XY(
+            serie.iloc[max(0, start - overlap) : stop + horizon],
+            seasonal_period,
+            horizon=horizon,
+            lags_to_consider=lags_to_consider,
+            dtype=dtype,
+            **features_options,
+        )
+        rows = X.index.isin(serie.index[start:stop])
+        yield X[rows], y[rows]
+
+
+class RollingFeaturesBuilder:
+    """Stateful counterpart of build_rolling_XY.
+    Once fitted on a history, new observations only trigger the computation of their own
+    feature rows, lags and newly complete targets, using a bounded tail of the serie.
+    """
+
+    def __init__(
+        self,
+        seasonal_period: int,
+        horizon: int = -1,
+        lags_to_consider: int = 5,
+        n_jobs: int = None,
+        with_hurst: bool = None,
+        adf_lag: int = None,
+        autocorrelation_lags: int = 0,
+        features: list = None,
+        time_budget: float = None,
+        cache: FeatureStore = None,
+        profiler: Profiler = None,
+        dtype=None,
+        memory_budget: int = None,
+        backend: str = "numpy",
+    ) -> None:
+        self.seasonal_period = seasonal_period
+        self.horizon = seasonal_period if horizon == -1 else horizon
+        self.lags_to_consider = lags_to_consider
+        self.n_jobs = n_jobs
+        self.with_hurst = with_hurst
+        self.adf_lag = adf_lag
+        self.autocorrelation_lags = autocorrelation_lags
+        self.features = features
+        self.time_budget = time_budget
+        self.cache = cache
+        self.profiler = profiler
+        self.dtype = dtype
+        self.memory_budget = memory_budget
+        self.backend = backend
+        # points needed by the next window, seasonal lags and pending targets
+        self.tail_length = max(seasonal_period + lags_to_consider, self.horizon)
+
+    def fit_transform(
+        self, serie: Series
+    ) -> [DataFrame, DataFrame, DataFrame, DataFrame]:
+        # updates must compute the same features, whatever the time budget
+        self.selected_features = select_features(
+            self.seasonal_period,
+            max(0, serie.shape[0] - self.seasonal_period + 1),
+            features=self.features,
+            time_budget=self.time_budget,
+            with_hurst=self.with_hurst,
+            autocorrelation_lags=self.autocorrelation_lags,
+        )
+        rolling_features, X, y, aligned_y = build_rolling_XY(
+            serie,
+            seasonal_period=self.seasonal_period,
+            horizon=self.horizon,
+            lags_to_consider=self.lags_to_consider,
+            n_jobs=self.n_jobs,
+            adf_lag=self.adf_lag,
+            autocorrelation_lags=self.autocorrelation_lags,
+            features=self.selected_features,
+            cache=self.cache,
+            profiler=self.profiler,
+            dtype=self.dtype,
+            memory_budget=self.memory_budget,
+            backend=self.backend,
+        )
+        self.tail = serie.iloc[-self.tail_length :]
+        self.features_tail = rolling_features.iloc[-self.horizon :]
+        self.last_target_origin = aligned_y.index[-1] if aligned_y.shape[0] else None
+        return rolling_features, X, y, aligned_y
+
+    def update(self, new_points: Series) -> [DataFrame, DataFrame, DataFrame]:
+        serie = concat((self.tail, new_points))
+        # only the windows ending on a new point are computed
+        window_features = build_window_features(
+            serie.iloc[-(new_points.shape[0] + self.seasonal_period - 1) :],
+            self.seasonal_period,
+            adf_lag=self.adf_lag,
+            autocorrelation_lags=self.autocorrelation_lags,
+            features=self.selected_features,
+            profiler=self.profiler,
+            backend=self.backend,
+        ).iloc[-new_points.shape[0] :]
+        with measure(self.profiler, "lags"):
+            lags = build_lags(serie, self.seasonal_period, self.lags_to_consider)
+            rolling_features = window_features.join(lags).dropna(axis=0)
+
+        # origins whose whole horizon has just been observed
+        with measure(self.profiler, "targets"):
+            y = build_rolling_target(serie, self.horizon)
+        if self.last_target_origin is not None:
+            y = y[y.index > self.last_target_origin]
+        features = concat((self.features_tail, rolling_features))
+        common_index = features.index.intersection(y.index)
+
+        if self.dtype is not None:
+            rolling_features = rolling_features.astype(self.dtype, copy=False)
+            features = features.astype(self.dtype, copy=False)
+            y = y.astype(self.dtype, copy=False)
+        self.tail = serie.iloc[-self.tail_length :]
+        self.features_tail = features.iloc[-self.horizon :]
+        if common_index.shape[0]:
+            self.last_target_origin = common_index[-1]
+        return rolling_features, features.loc[common_index], y.loc[common_index]
+
+    def latest_features(
+        self, recent_points: Series = None, freq: str = None
+    ) -> DataFrame:
+        """Compute the features row of the latest origin only, without updating the builder.
+
+        Args:
+            recent_points (Series, optional): Recent observations, following or overlapping the
+                fitted serie, the last one being the origin. Defaults to None, i.e the last fitted point.
+            freq (str, optional): The freq of the serie, checked on the points the features are
+                computed on. Defaults to None, i.e the freq of the fitted tail, if any.
+
+        Returns:
+            DataFrame: The features of the origin, as a single row.
+        """
+        if recent_points is None:
+            return self.features_tail.iloc[-1:]
+        return self.latest_features_batch([recent_points], freq)
+
+    def latest_features_batch(self, recent_points: list, freq: str = None) -> DataFrame:
+        """Compute the features rows of the origins of several recent points at once.
+        The windows of the origins are stacked, separated by a NaN, so that every kernel is called
+        once on the batch and only computes a complete window per origin. The lags are read
+        from the stacked points as well.
+
+        Args:
+            recent_points (list): The recent points of each origin, see latest_features.
+            freq (str, optional): The freq of the serie, see latest_features. Defaults to None.
+
+        Returns:
+            DataFrame: The features of the origins, one row per recent points.
+        """
+        series = [self.recent_serie(points, freq) for points in recent_points]
+        length = self.seasonal_period + self.lags_to_consider + 1
+        values = stack([serie.to_numpy(dtype=float) for serie in series])
+        windows = concatenate(
+            (values[:, -self.seasonal_period :], full((len(series), 1), nan)), axis=1
+        )
+        window_features = compute_features(
+            Series(windows.ravel()),
+            self.seasonal_period,
+            self.selected_features,
+            profiler=self.profiler,
+            adf_lag=self.adf_lag,
+            autocorrelation_lags=self.autocorrelation_lags,
+            backend=self.backend,
+        ).iloc[arange(1, len(series) + 1) * (self.seasonal_period + 1) - 2]
+        with measure(self.profiler, "lags"):
+            # each block holds the seasonal lags of its origin
+            lags = build_lags(
+                Series(values.ravel()), self.seasonal_period, self.lags_to_consider
+            ).iloc[arange(1, len(series) + 1) * length - 1]
+        latest = DataFrame(
+            hstack((window_features.to_numpy(dtype=float), lags.to_numpy())),
+            index=series[0].index[:0].append([serie.index[-1:] for serie in series]),
+            columns=window_features.columns.append(lags.columns),
+        )
+        return latest if self.dtype is None else latest.astype(self.dtype)
+
+    def recent_serie(self, recent_points: Series, freq: str = None) -> Series:
+        """The window and the seasonal lags of the origin of recent points.
+
+        Args:
+            recent_points (Series): Recent observations, following or overlapping the fitted serie.
+            freq (str, optional): The freq of the serie. Defaults to None, i.e the freq of the
+                fitted tail, if any.
+
+        Raises:
+            ValueError: If the fitted tail and the recent points do not end with a contiguous run
+                of seasonal_period + lags_to_consider + 1 points.
+
+        Returns:
+            Series: The last seasonal_period + lags_to_consider + 1 points.
+        """
+        length = self.seasonal_period + self.lags_to_consider + 1
+        serie = concat(
+            (self.tail[self.tail.index < recent_points.index[0]], recent_points)
+        ).iloc[-length:]
+        freq = self.tail.index.freq if freq is None else freq
+        if serie.shape[0] < length or (
+            isinstance(serie.index, DatetimeIndex)
+            and freq is not None
+            and not serie.index.equals(
+                date_range(start=serie.index[0], periods=length, freq=freq)
+            )
+        ):
+            raise ValueError(
+                f"The recent points should follow or overlap the fitted serie, the origin needing "
+                f"{length} contiguous points."
+            )
+        return serie
 
 
 def temporal_train_test_split(
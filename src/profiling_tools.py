@@ -0,0 +1,76 @@
+from contextlib import contextmanager, nullcontext
+from time import perf_counter, time
+from pandas import DataFrame, MultiIndex
+
+
+class Profiler:
+    """Times every call of the instrumented pipeline stages.
+    Each record is a dict with the stage (features, lags, targets, fit, predict, ...), the name of
+    what was timed in the stage (the features of a kernel, a horizon, ...), the start timestamp and
+    the duration in seconds. Records are passed to the callback, then only aggregated per stage
+    and name, so that a long-lived profiler holds a bounded memory.
+
+    Args:
+        callback (callable, optional): Called with every record as soon as it is measured,
+            e.g to ship the metrics to a monitoring system. Defaults to None.
+    """
+
+    def __init__(self, callback=None) -> None:
+        self.callback = callback
+        # calls count, total and max time per (stage, name), in the order of their first call
+        self.totals = dict()
+
+    @contextmanager
+    def measure(self, stage: str, name: str = None):
+        start, begin = time(), perf_counter()
+        try:
+            yield
+        finally:
+            record = {
+                "stage": stage,
+                "name": stage if name is None else name,
+                "start": start,
+                "time": perf_counter() - begin,
+            }
+            key = (record["stage"], record["name"])
+            calls, total, longest = self.totals.get(key, (0, 0.0, 0.0))
+            self.totals[key] = (
+                calls + 1,
+                total + record["time"],
+                max(longest, record["time"]),
+            )
+            if self.callback is not None:
+                self.callback(record)
+
+    def report(self) -> DataFrame:
+        """The calls count, total, mean and max time per stage and name.
+
+        Returns:
+            DataFrame: The aggregated times, indexed by (stage, name) in the order of their first call.
+        """
+        if not self.totals:
+            return DataFrame(columns=["calls", "total_time", "mean_time", "max_time"])
+        report = DataFrame(
+            list(self.totals.values()),
+            index=MultiIndex.from_tuples(list(self.totals), names=["stage", "name"]),
+            columns=["calls", "total_time", "max_time"],
+        )
+        report.insert(2, "mean_time", report["total_time"] / report["calls"])
+        return report
+
+    def clear(self) -> None:
+        self.totals = dict()
+
+
+def measure(profiler: Profiler, stage: str, name: str = None):
+    """Profiler.measure, doing nothing without a profiler.
+
+    Args:
+        profiler (Profiler): The profiler, or None.
+        stage (str): The pipeline stage.
+        name (str, optional): What is timed in the stage. Defaults to None, i.e the stage.
+
+    Returns:
+        A context manager timing its block.
+    """
+    return nullcontext() if profiler is None else profiler.measure(stage, name)
@@ -0,0 +1,287 @@
+from math import ceil
+from warnings import warn
+from sklearn.base import RegressorMixin
+from sklearn.model_selection import ParameterGrid
+from sklearn import metrics
+from pandas import Series, DataFrame, Index
+from numpy import ndarray, asarray, isfinite, argsort, mean, nan
+from joblib import Parallel, delayed
+from src.estimator import FeatureBasedEstimator
+from src.multi_horizon_tools import multi_horizon_model
+from src.preprocessing_tools import (
+    build_window_features,
+    build_lags,
+    build_rolling_target,
+    lags_view,
+    join_lags,
+    align_XY,
+)
+
+# the parameters changing the features and targets, searched without rebuilding them
+SEARCHED_PARAMETERS = ["seasonal_period", "lags_to_consider", "horizon"]
+
+
+def score_fold(
+    model: RegressorMixin,
+    X_train: ndarray,
+    y_train: ndarray,
+    X_test: ndarray,
+    y_test: ndarray,
+    metric: metrics,
+) -> float:
+    """Fit an unfitted model on the training rows of a fold and score its forecasts of the test rows.
+
+    Args:
+        model (RegressorMixin): The unfitted multi-horizon model.
+        X_train (ndarray): The training features.
+        y_train (ndarray): The training targets.
+        X_test (ndarray): The features of the test origins.
+        y_test (ndarray): The observed targets of the test origins.
+        metric (metrics): The error metric.
+
+    Returns:
+        float: The error of the forecasts, nan if the model failed to fit or predict.
+    """
+    # as sklearn searches do with error_score=nan, a failing candidate does not stop the search
+    try:
+        return metric(y_test, model.fit(X_train, y_train).predict(X_test))
+    except Exception as error:
+        warn(f"A candidate failed to score : {error!r}.")
+        return nan
+
+
+class FeatureBasedSearch:
+    """Search the seasonal period, lags and horizon of a FeatureBasedEstimator.
+    The window features are computed once per seasonal period, the lags gathered from a single
+    view of the serie up to the largest lag and the targets built once per horizon : a candidate
+    is only an assembly of shared columns.
+    Candidates are scored on chronological test blocks by successive halving : after each block,
+    only the best 1 / eta of them are scored on the next one.
+    The errors of different horizons are not comparable, the longer ones forecasting further
+    values : candidates are halved and ranked within their horizon. best_params_ is the best
+    candidate of the longest horizon, whose forecasts cover the shorter ones, and
+    best_params_by_horizon_ the best candidate of each horizon.
+
+    Args:
+        estimator (RegressorMixin): The single output estimator.
+        param_grid (dict or list): The candidate values of seasonal_period, lags_to_consider and
+            horizon, as for sklearn.model_selection.ParameterGrid. Missing parameters take the
+            values of estimator_params, or their defaults.
+        n_splits (int, optional): The number of test blocks. Defaults to 3.
+        test_size (int, optional): The number of origins of a test block. Defaults to None, i.e
+            the common origins of the candidates divided by n_splits + 1.
+        metric (metrics, optional): The error metric. Defaults to metrics.mean_absolute_error.
+        eta (int, optional): The inverse of the proportion of candidates kept after a block.
+            Defaults to 2, 1 scoring every candidate on every block.
+        n_jobs (int, optional): The number of candidates scored in parallel. Defaults to None.
+        refit (bool, optional): Whether to fit the best candidate on the whole serie.
+            Defaults to True.
+        **estimator_params: The other parameters of FeatureBasedEstimator (features, strategy, ...).
+    """
+
+    def __init__(
+        self,
+        estimator: RegressorMixin,
+        param_grid,
+        n_splits: int = 3,
+        test_size: int = None,
+        metric: metrics = metrics.mean_absolute_error,
+        eta: int = 2,
+        n_jobs: int = None,
+        refit: bool = True,
+        **estimator_params,
+    ) -> None:
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.n_splits = n_splits
+        self.test_size = test_size
+        self.metric = metric
+        self.eta = eta
+        self.n_jobs = n_jobs
+        self.refit = refit
+        self.estimator_params = estimator_params
+
+    ## Candidates
+    def candidates(self) -> list:
+        """The candidates of the grid, completed by the default values of their parameters.
+
+        Returns:
+            list: The seasonal_period, lags_to_consider and horizon of each candidate.
+        """
+        defaults = dict(
+            seasonal_period=self.estimator_params.get("seasonal_period", 12),
+            lags_to_consider=5,
+            horizon=self.estimator_params.get("horizon", 1),
+        )
+        candidates = []
+        for params in ParameterGrid(self.param_grid):
+            unknown = set(params) - set(SEARCHED_PARAMETERS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown parameters : {sorted(unknown)}. Available : {SEARCHED_PARAMETERS}."
+                )
+            candidate = {**defaults, **params}
+            # as in RollingFeaturesBuilder, -1 is the seasonal period
+            if candidate["horizon"] == -1:
+                candidate["horizon"] = candidate["seasonal_period"]
+            candidates.append(candidate)
+        return candidates
+
+    def assemble_XY(
+        self, serie: Series, candidate: dict, shared: dict = None
+    ) -> [DataFrame, DataFrame]:
+        """The aligned features and targets of a candidate, those of preprocess_and_fit.
+
+        Args:
+            serie (Series): The time series.
+            candidate (dict): The seasonal_period, lags_to_consider and horizon of the candidate.
+            shared (dict, optional): The window features, lags view and targets already built,
+                completed by the ones the candidate needs. Defaults to None.
+
+        Returns:
+            [DataFrame, DataFrame]: The features and the targets.
+        """
+        shared = {} if shared is None else shared
+        seasonal_period = candidate["seasonal_period"]
+        lags_to_consider = candidate["lags_to_consider"]
+        horizon = candidate["horizon"]
+        dtype = self.estimator_params.get("dtype")
+        if ("features", seasonal_period) not in shared:
+            shared["features", seasonal_period] = build_window_features(
+                serie,
+                seasonal_period,
+                features=self.estimator_params.get("features"),
+                time_budget=self.estimator_params.get("time_budget"),
+                backend=self.estimator_params.get("backend", "numpy"),
+                dtype=dtype,
+            )
+        depth = seasonal_period + lags_to_consider
+        if shared.get("lags") is None or shared["lags"].shape[1] < depth:
+            shared["lags"] = lags_view(serie, depth, dtype)
+        if ("targets", horizon) not in shared:
+            shared["targets", horizon] = build_rolling_target(serie, horizon, dtype)
+
+        X = join_lags(
+            shared["features", seasonal_period],
+            build_lags(serie, seasonal_period, lags_to_consider, shared["lags"]),
+            dtype,
+        )
+        y = shared["targets", horizon][lags_to_consider:]
+        return align_XY(X, y)
+
+    ## Search
+    def __test_blocks(self, XYs: list) -> list:
+        # the test origins are common to all the candidates, to compare their scores
+        common = XYs[0][0].index
+        for X, _ in XYs[1:]:
+            common = common.intersection(X.index)
+        test_size = (
+            common.shape[0] // (self.n_splits + 1)
+            if self.test_size is None
+            else self.test_size
+        )
+        if test_size < 1 or test_size * self.n_splits >= common.shape[0]:
+            raise ValueError("Not enough common samples for the test blocks.")
+        return [
+            common[-(i + 1) * test_size : common.shape[0] - i * test_size]
+            for i in reversed(range(self.n_splits))
+        ]
+
+    def __fold(
+        self, serie: Series, X: DataFrame, y: DataFrame, horizon: int, block: Index
+    ) -> list:
+        # the training targets are observed at the first test origin
+        position = serie.index.get_loc(block[0]) - horizon
+        if position < 0:
+            raise ValueError("Not enough samples before the first test block.")
+        train = X.index.searchsorted(serie.index[position], side="right")
+        start, stop = X.index.get_loc(block[0]), X.index.get_loc(block[-1]) + 1
+        X_values, y_values = asarray(X), asarray(y)
+        return [
+            X_values[:train],
+            y_values[:train],
+            X_values[start:stop],
+            y_values[start:stop],
+        ]
+
+    def __by_horizon(self, candidates: list, indices: list) -> dict:
+        groups = dict()
+        for i in indices:
+            groups.setdefault(candidates[i]["horizon"], []).append(i)
+        return groups
+
+    def __best(self, indices: list, scores: list) -> list:
+        order = argsort([mean(scores[i]) for i in indices], kind="stable")
+        return [indices[j] for j in order[: ceil(len(indices) / self.eta)]]
+
+    def fit(self, serie: Series):
+        candidates = self.candidates()
+        # the lags view is built once, up to the largest lag
+        depth = max(c["seasonal_period"] + c["lags_to_consider"] for c in candidates)
+        shared = {"lags": lags_view(serie, depth, self.estimator_params.get("dtype"))}
+        XYs = [self.assemble_XY(serie, candidate, shared) for candidate in candidates]
+        blocks = self.__test_blocks(XYs)
+
+        strategy = self.estimator_params.get("strategy", "direct")
+        scores = [[] for _ in candidates]
+        alive = list(range(len(candidates)))
+        for k, block in enumerate(blocks):
+            fold_scores = Parallel(n_jobs=self.n_jobs)(
+                delayed(score_fold)(
+                    multi_horizon_model(self.estimator, strategy),
+                    *self.__fold(serie, *XYs[i], candidates[i]["horizon"], block),
+                    self.metric,
+                )
+                for i in alive
+            )
+            for i, score in zip(alive, fold_scores):
+                scores[i].append(score)
+            # candidates failing to score are dropped, the worst ones of each horizon stopped early
+            alive = [i for i in alive if isfinite(mean(scores[i]))]
+            if k < len(blocks) - 1:
+                alive = sorted(
+                    i
+                    for horizon_alive in self.__by_horizon(candidates, alive).values()
+                    for i in self.__best(horizon_alive, scores)
+                )
+
+        self.results_ = DataFrame(
+            [
+                {
+                    **candidate,
+                    "score": mean(scores[i]) if scores[i] else nan,
+                    "n_splits": len(scores[i]),
+                }
+                for i, candidate in enumerate(candidates)
+            ]
+        )
+        # within each horizon, from the longest one, the candidates scored on every block rank first
+        self.results_ = self.results_.sort_values(
+            ["horizon", "n_splits", "score"],
+            ascending=[False, False, True],
+            kind="stable",
+        ).reset_index(drop=True)
+        self.results_["rank"] = self.results_.groupby("horizon").cumcount() + 1
+        if not alive:
+            raise RuntimeError("No candidate could be scored.")
+        self.best_params_by_horizon_ = dict()
+        self.best_score_by_horizon_ = dict()
+        for horizon, horizon_alive in self.__by_horizon(candidates, alive).items():
+            best = min(horizon_alive, key=lambda i: mean(scores[i]))
+            self.best_params_by_horizon_[horizon] = candidates[best]
+            self.best_score_by_horizon_[horizon] = mean(scores[best])
+        longest = max(self.best_params_by_horizon_)
+        self.best_params_ = self.best_params_by_horizon_[longest]
+        self.best_score_ = self.best_score_by_horizon_[longest]
+
+        if self.refit:
+            params = {
+                **self.estimator_params,
+                "seasonal_period": self.best_params_["seasonal_period"],
+                "horizon": self.best_params_["horizon"],
+            }
+            self.best_estimator_ = FeatureBasedEstimator(self.estimator, **params)
+            self.best_estimator_.preprocess_and_fit(
+                serie, self.best_params_["lags_to_consider"]
+            )
+        return self
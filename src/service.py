@@ -0,0 +1,277 @@
+from asyncio import (
+    AbstractEventLoop,
+    IncompleteReadError,
+    StreamReader,
+    StreamWriter,
+    gather,
+    get_running_loop,
+    shield,
+    start_server,
+    Server,
+)
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from json import dumps, loads
+from numpy import array
+from src.estimator import FeatureBasedEstimator
+
+
+class EstimatorPool:
+    """LRU pool of fitted estimators, keyed by series id.
+    Missing estimators are loaded in the executor, concurrent requests of the same missing
+    estimator sharing a single load.
+
+    Args:
+        capacity (int): The maximal number of estimators kept in memory.
+        loader (callable, optional): Maps a series id to its fitted estimator, e.g by loading it
+            from disk. Defaults to None, i.e only the estimators put in the pool are available.
+        executor (Executor, optional): The executor running the loader. Defaults to None, i.e the
+            default executor of the event loop.
+    """
+
+    def __init__(self, capacity: int, loader=None, executor: Executor = None) -> None:
+        self.capacity = capacity
+        self.loader = loader
+        self.executor = executor
+        self.estimators = OrderedDict()
+        self.loading = dict()
+
+    def put(self, series_id: str, estimator: FeatureBasedEstimator) -> None:
+        self.estimators[series_id] = estimator
+        self.estimators.move_to_end(series_id)
+        while len(self.estimators) > self.capacity:
+            self.estimators.popitem(last=False)
+
+    async def get(self, series_id: str) -> FeatureBasedEstimator:
+        if series_id in self.estimators:
+            self.estimators.move_to_end(series_id)
+            return self.estimators[series_id]
+        if self.loader is None:
+            raise KeyError(f"Unknown series : {series_id}.")
+        if series_id not in self.loading:
+            self.loading[series_id] = get_running_loop().run_in_executor(
+                self.executor, self.loader, series_id
+            )
+        try:
+            estimator = await shield(self.loading[series_id])
+        finally:
+            self.loading.pop(series_id, None)
+        self.put(series_id, estimator)
+        return estimator
+
+    def __contains__(self, series_id: str) -> bool:
+        return series_id in self.estimators
+
+    def __len__(self) -> int:
+        return len(self.estimators)
+
+
+class ForecastService:
+    """Asynchronous forecasts of many series.
+    Concurrent requests are coalesced : identical in-flight requests share a single result, and
+    the requests received within max_delay are run as one batch in the executor, the features rows
+    of each series being predicted at once by FeatureBasedEstimator.forecast_batch.
+
+    Args:
+        pool (EstimatorPool): The fitted estimators.
+        executor (Executor, optional): The executor running the batches, so that the event loop never
+            blocks. Defaults to None, i.e a thread pool.
+        max_batch_size (int, optional): The number of requests triggering a batch. Defaults to 256.
+        max_delay (float, optional): The time, in seconds, a request may wait for its batch. Defaults to 0.002.
+    """
+
+    def __init__(
+        self,
+        pool: EstimatorPool,
+        executor: Executor = None,
+        max_batch_size: int = 256,
+        max_delay: float = 0.002,
+    ) -> None:
+        self.pool = pool
+        self.executor = ThreadPoolExecutor() if executor is None else executor
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.in_flight = dict()
+        self.queue = []
+        self.flush_handle = None
+        # running batches, referenced until done
+        self.batches = set()
+        self.stats = {"requests": 0, "coalesced": 0, "batches": 0, "forecasts": 0}
+
+    ## Forecasts
+    async def forecast(self, series_id: str, recent_points: list = None) -> dict:
+        """Forecast a series.
+
+        Args:
+            series_id (str): The id of the series in the pool.
+            recent_points (list, optional): Recent observations following the fitted serie,
+                see FeatureBasedEstimator.forecast. Defaults to None.
+
+        Returns:
+            dict: The forecast, as {"index": [iso dates], "forecast": [values]}.
+        """
+        self.stats["requests"] += 1
+        key = (series_id, None if recent_points is None else tuple(recent_points))
+        if key in self.in_flight:
+            self.stats["coalesced"] += 1
+            return await shield(self.in_flight[key])
+
+        loop = get_running_loop()
+        future = loop.create_future()
+        self.in_flight[key] = future
+        self.queue.append((key, future))
+        if len(self.queue) >= self.max_batch_size:
+            self.__flush(loop)
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.max_delay, self.__flush, loop)
+        return await shield(future)
+
+    def __flush(self, loop: AbstractEventLoop) -> None:
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        batch, self.queue = self.queue, []
+        if batch:
+            task = loop.create_task(self.__run_batch(batch))
+            self.batches.add(task)
+            task.add_done_callback(self.batches.discard)
+
+    async def __run_batch(self, batch: list) -> None:
+        self.stats["batches"] += 1
+        groups = dict()
+        for key, future in batch:
+            groups.setdefault(key[0], []).append((key, future))
+        # the missing estimators are loaded concurrently, a failed load only failing its group
+        loaded = await gather(
+            *[self.pool.get(series_id) for series_id in groups], return_exceptions=True
+        )
+        estimators = dict()
+        for (series_id, requests), estimator in zip(groups.items(), loaded):
+            if isinstance(estimator, BaseException):
+                self.__resolve(requests, error=estimator)
+            else:
+                estimators[series_id] = estimator
+
+        jobs = [
+            (estimators[series_id], requests)
+            for series_id, requests in groups.items()
+            if series_id in estimators
+        ]
+        results = await get_running_loop().run_in_executor(
+            self.executor, forecast_groups, jobs
+        )
+        for (_, requests), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                self.__resolve(requests, error=result)
+            else:
+                self.stats["forecasts"] += len(requests)
+                self.__resolve(requests, results=result)
+
+    def __resolve(self, requests: list, results: list = None, error=None) -> None:
+        for i, (key, future) in enumerate(requests):
+            self.in_flight.pop(key, None)
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results[i])
+
+    ## HTTP
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> Server:
+        """Start a HTTP server, answering :
+        - POST /forecast, with a {"series_id": ..., "recent_points": [...]} json body,
+          by the forecast of ForecastService.forecast.
+        - GET /stats by the counts of requests, coalesced requests, batches and forecasts.
+
+        Args:
+            host (str, optional): The host to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on, 0 for any free port. Defaults to 8080.
+
+        Returns:
+            Server: The started server.
+        """
+        return await start_server(self.__handle_connection, host, port)
+
+    async def __handle_connection(
+        self, reader: StreamReader, writer: StreamWriter
+    ) -> None:
+        # HTTP/1.1 with keep-alive, one request at a time per connection
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = dict()
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload = await self.__route(method, path, body)
+                content = dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n".encode() + content
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def __route(self, method: str, path: str, body: bytes) -> [str, dict]:
+        if method == "GET" and path == "/stats":
+            return "200 OK", self.stats
+        if method != "POST" or path != "/forecast":
+            return "404 Not Found", {"error": f"Unknown route : {method} {path}."}
+        try:
+            request = loads(body)
+            series_id, recent_points = request["series_id"], request.get(
+                "recent_points"
+            )
+        except Exception as error:
+            return "400 Bad Request", {"error": f"Invalid request : {error}."}
+        try:
+            return "200 OK", await self.forecast(series_id, recent_points)
+        except KeyError as error:
+            return "404 Not Found", {"error": str(error)}
+        except Exception as error:
+            return "400 Bad Request", {"error": str(error)}
+
+
+def forecast_groups(jobs: list) -> list:
+    """Run the forecasts of a batch, one forecast_batch call per estimator.
+
+    Args:
+        jobs (list): The (estimator, requests) pairs, requests being ((series_id, recent_points), future) pairs.
+
+    Returns:
+        list: Per estimator, the json-ready forecasts of its requests, or the raised exception.
+    """
+    results = []
+    for estimator, requests in jobs:
+        try:
+            forecasts = estimator.forecast_batch(
+                [
+                    None if points is None else array(points, dtype=float)
+                    for (_, points), _ in requests
+                ]
+            )
+            results.append(
+                [
+                    {
+                        "index": [date.isoformat() for date in forecast.index],
+                        "forecast": forecast["Forecast"].tolist(),
+                    }
+                    for forecast in forecasts
+                ]
+            )
+        except Exception as error:
+            results.append(error)
+    return results
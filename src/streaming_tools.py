@@ -0,0 +1,240 @@
+from json import dump, load
+from os import makedirs, remove
+from os.path import join, exists
+from pandas import (
+    Series,
+    DataFrame,
+    DatetimeIndex,
+    Index,
+    read_csv,
+    to_datetime,
+    concat,
+)
+from numpy import ascontiguousarray, fromfile, memmap, dtype as numpy_dtype
+from src.preprocessing_tools import RollingFeaturesBuilder
+
+
+def read_serie_chunks(
+    path: str,
+    value_column: str = None,
+    index_column: str = None,
+    chunksize: int = 1_000_000,
+    parse_dates: bool = True,
+):
+    """Read a time series from a CSV or Parquet file by chunks of rows.
+
+    Args:
+        path (str): The .csv or .parquet file.
+        value_column (str, optional): The column of the values. Defaults to None, i.e the first
+            column other than the index one.
+        index_column (str, optional): The column of the dates. Defaults to None, i.e the first column.
+        chunksize (int, optional): The number of rows per chunk. Defaults to 1_000_000.
+        parse_dates (bool, optional): Whether to parse the index as dates. Defaults to True.
+
+    Yields:
+        Series: The consecutive chunks of the serie.
+    """
+    # only the index and value columns are read when both are known
+    columns = (
+        None
+        if index_column is None or value_column is None
+        else [index_column, value_column]
+    )
+    if path.endswith(".parquet"):
+        # pyarrow is only needed to read Parquet files
+        from pyarrow.parquet import ParquetFile
+
+        batches = (
+            batch.to_pandas()
+            for batch in ParquetFile(path).iter_batches(
+                batch_size=chunksize, columns=columns
+            )
+        )
+    else:
+        batches = read_csv(path, chunksize=chunksize, usecols=columns)
+
+    for batch in batches:
+        index = batch[index_column or batch.columns[0]]
+        values = batch[
+            value_column
+            or [column for column in batch.columns if column != index.name][0]
+        ]
+        yield Series(
+            values.to_numpy(dtype=float),
+            index=to_datetime(index) if parse_dates else Index(index),
+            name=values.name,
+        )
+
+
+def stream_rolling_XY(
+    chunks,
+    seasonal_period: int,
+    horizon: int = -1,
+    lags_to_consider: int = 5,
+    dtype=None,
+    **features_options,
+):
+    """Stream the aligned features and targets of build_rolling_XY from consecutive chunks of a serie.
+    Only a tail of max(seasonal_period + lags_to_consider, horizon) points is carried from a chunk
+    to the next one, the features of a point and the targets of an origin being computed once,
+    as soon as their points are read.
+
+    Args:
+        chunks (iterable): The consecutive chunks of the serie, e.g from read_serie_chunks.
+        seasonal_period (int): The seasonal period, i.e the length of the rolling window.
+        horizon (int, optional): The forecast horizon. Defaults to -1, i.e the seasonal period.
+        lags_to_consider (int, optional): The number of lags and seasonal lags. Defaults to 5.
+        dtype (optional): The dtype of the blocks. Defaults to None, i.e float64.
+        **features_options: The options of RollingFeaturesBuilder (features, adf_lag, backend, ...).
+            The features are selected on the first chunk.
+
+    Yields:
+        [DataFrame, DataFrame]: The aligned features and targets completed by a chunk.
+    """
+    builder = RollingFeaturesBuilder(
+        seasonal_period,
+        horizon=horizon,
+        lags_to_consider=lags_to_consider,
+        dtype=dtype,
+        **features_options,
+    )
+    # the first block needs at least one complete window, its lags and its horizon
+    first_length = seasonal_period + lags_to_consider + builder.horizon + 1
+    pending = []
+    for chunk in chunks:
+        if chunk.shape[0] == 0:
+            continue
+        if pending is not None:
+            pending.append(chunk)
+            if sum(part.shape[0] for part in pending) < first_length:
+                continue
+            _, X, _, y = builder.fit_transform(concat(pending))
+            pending = None
+        else:
+            _, X, y = builder.update(chunk)
+        if X.shape[0]:
+            yield X, y
+    if pending:
+        _, X, _, y = builder.fit_transform(concat(pending))
+        if X.shape[0]:
+            yield X, y
+
+
+class RollingXYWriter:
+    """Write feature and target blocks to a directory as they come, in bounded memory.
+    The rows are appended to raw X.bin, y.bin and index.bin files, described by a meta.json file
+    written on close, and read back memory-mapped by read_rolling_XY. Used as a context manager,
+    the writer only writes meta.json when no exception interrupted the blocks.
+
+    Args:
+        path (str): The directory to write to. Existing blocks are overwritten.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        makedirs(path, exist_ok=True)
+        # blocks are only readable once closed
+        if exists(join(path, "meta.json")):
+            remove(join(path, "meta.json"))
+        self.files = {
+            name: open(join(path, f"{name}.bin"), "wb") for name in ["X", "y", "index"]
+        }
+        self.meta = None
+
+    def write(self, X: DataFrame, y: DataFrame) -> None:
+        if self.meta is None:
+            datetime_index = isinstance(X.index, DatetimeIndex)
+            self.meta = {
+                "n_rows": 0,
+                "X_columns": list(X.columns),
+                "y_columns": list(y.columns),
+                "dtype": str(X.to_numpy().dtype),
+                "datetime_index": datetime_index,
+                "tz": str(X.index.tz) if datetime_index and X.index.tz else None,
+                "index_name": X.index.name,
+            }
+        if list(X.columns) != self.meta["X_columns"]:
+            raise ValueError("All the blocks should have the same features.")
+        self.files["X"].write(ascontiguousarray(X.to_numpy(self.meta["dtype"])).data)
+        self.files["y"].write(ascontiguousarray(y.to_numpy(self.meta["dtype"])).data)
+        index = X.index.asi8 if self.meta["datetime_index"] else X.index.to_numpy()
+        self.files["index"].write(ascontiguousarray(index, dtype="int64").data)
+        self.meta["n_rows"] += X.shape[0]
+
+    def close(self) -> None:
+        self.__close_files()
+        with open(join(self.path, "meta.json"), "w") as file:
+            dump(self.meta, file)
+
+    def __close_files(self) -> None:
+        for file in self.files.values():
+            file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # blocks interrupted by an exception are left unreadable, without meta.json
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.__close_files()
+
+
+def write_rolling_XY(blocks, path: str) -> int:
+    """Write the blocks of stream_rolling_XY or iter_rolling_XY to a directory.
+
+    Args:
+        blocks (iterable): The (X, y) blocks.
+        path (str): The directory to write to.
+
+    Returns:
+        int: The number of written rows.
+    """
+    with RollingXYWriter(path) as writer:
+        for X, y in blocks:
+            writer.write(X, y)
+    return writer.meta["n_rows"] if writer.meta is not None else 0
+
+
+def read_rolling_XY(path: str, mmap_mode: str = "r") -> [DataFrame, DataFrame]:
+    """Read the features and targets written by RollingXYWriter.
+
+    Args:
+        path (str): The directory they were written to.
+        mmap_mode (str, optional): The numpy.memmap mode of the values. Defaults to "r".
+            None reads them in memory.
+
+    Returns:
+        [DataFrame, DataFrame]: The features and the targets.
+    """
+    meta_path = join(path, "meta.json")
+    if not exists(meta_path):
+        raise FileNotFoundError(f"No features and targets written in {path}.")
+    with open(meta_path) as file:
+        meta = load(file)
+    if meta is None:
+        return DataFrame(), DataFrame()
+
+    index = fromfile(join(path, "index.bin"), dtype="int64")
+    if meta["datetime_index"]:
+        index = DatetimeIndex(index.astype("datetime64[ns]"))
+        if meta["tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+    else:
+        index = Index(index)
+    index.name = meta["index_name"]
+    frames = []
+    for name in ["X", "y"]:
+        shape = (meta["n_rows"], len(meta[f"{name}_columns"]))
+        file_path = join(path, f"{name}.bin")
+        values = (
+            fromfile(file_path, dtype=numpy_dtype(meta["dtype"])).reshape(shape)
+            if mmap_mode is None or meta["n_rows"] == 0
+            else memmap(file_path, dtype=meta["dtype"], mode=mmap_mode, shape=shape)
+        )
+        # the memory-mapped values back the DataFrame without copy
+        frames.append(
+            DataFrame(values, index=index, columns=meta[f"{name}_columns"], copy=False)
+        )
+    return frames[0], frames[1]
@@ -0,0 +1,21 @@
+from numpy import sin, pi, arange
+from numpy.random import default_rng
+from pandas import Series, date_range
+
+
+def make_serie(length: int = 200, seasonal_period: int = 12, seed: int = 0) -> Series:
+    """A seasonal random walk, daily indexed, the same for every run of the tests.
+
+    Args:
+        length (int, optional): The number of points. Defaults to 200.
+        seasonal_period (int, optional): The period of the seasonal component. Defaults to 12.
+        seed (int, optional): The seed of the noise. Defaults to 0.
+
+    Returns:
+        Series: The time series.
+    """
+    noise = default_rng(seed).standard_normal(length)
+    return Series(
+        10 + sin(2 * pi * arange(length) / seasonal_period) + noise.cumsum() / 10,
+        index=date_range("2020-01-01", periods=length, freq="D"),
+    )
@@ -0,0 +1,197 @@
+import unittest
+from numpy import (
+    nanmean,
+    nanmedian,
+    nanquantile,
+    nanstd,
+    nan,
+    isnan,
+    arange,
+    sin,
+    pi,
+    array,
+    zeros,
+    linspace,
+)
+from numpy.random import randn
+from numpy.testing import assert_allclose
+from pandas import Series
+from hurst import compute_Hc
+from statsmodels.tsa.stattools import adfuller, acf, pacf
+from statsmodels.tsa.adfvalues import mackinnonp
+
+from src.features_computation_tools import (
+    spikiness,
+    lumpiness,
+    curvature,
+    spectral_entropy,
+)
+from src.batched_features_tools import (
+    rolling_statistics,
+    batched_spectral_entropy,
+    batched_hurst_exponent,
+    batched_adf_pvalue,
+    batched_mackinnon_pvalue,
+    batched_autocorrelation,
+    batched_partial_autocorrelation,
+)
+
+
+class TestRollingStatistics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        serie = 100 + randn(500).cumsum() + 3 * sin(2 * pi * arange(500) / 12)
+        serie[250] = nan
+        cls.window = 24
+        cls.serie = serie
+        cls.statistics = rolling_statistics(serie, cls.window)
+        cls.expected = (
+            Series(serie)
+            .rolling(window=cls.window)
+            .aggregate(
+                {
+                    "mean": nanmean,
+                    "median": nanmedian,
+                    "std": nanstd,
+                    "q1": lambda x: nanquantile(a=x, q=0.25),
+                    "q3": lambda x: nanquantile(a=x, q=0.75),
+                    "lumpiness": lumpiness,
+                    "spikiness": spikiness,
+                    "curvature": curvature,
+                }
+            )
+        )
+
+    def test_same_values_as_rolling_callbacks(self):
+        for name in self.expected.columns:
+            assert_allclose(
+                self.statistics[name],
+                self.expected[name].values,
+                rtol=1e-9,
+                err_msg=f"Batched {name} differs from the per-window computation.",
+            )
+
+    def test_alignment(self):
+        for name, values in self.statistics.items():
+            self.assertEqual(
+                values.shape[0],
+                self.serie.shape[0],
+                msg=f"Batched {name} should be aligned on the serie.",
+            )
+            self.assertTrue(
+                isnan(values[: self.window - 1]).all(),
+                msg=f"Batched {name} should be NaN before the first full window.",
+            )
+
+    def test_constant_windows(self):
+        statistics = rolling_statistics(arange(100) * 0 + 5.0, 10)
+        self.assertEqual(
+            statistics["std"][-1], 0, msg="Constant windows should have a null std."
+        )
+        self.assertEqual(
+            statistics["lumpiness"][-1],
+            0,
+            msg="Constant windows should have a null lumpiness.",
+        )
+
+
+class TestBatchedSpectralEntropy(unittest.TestCase):
+    def test_same_values_as_spectral_entropy(self):
+        windows = randn(50, 40).cumsum(axis=1)
+        assert_allclose(
+            batched_spectral_entropy(windows),
+            array([spectral_entropy(window) for window in windows]),
+            rtol=1e-12,
+            err_msg="Batched spectral entropy differs from the per-window computation.",
+        )
+
+    def test_uniform_case(self):
+        self.assertTrue(
+            isnan(batched_spectral_entropy(zeros((3, 100)))).all(),
+            msg="Spectral entropy of a constant value must be NaN.",
+        )
+
+
+class TestBatchedHurstExponent(unittest.TestCase):
+    def test_same_values_as_compute_Hc(self):
+        for length in [100, 150, 365]:
+            windows = randn(20, length).cumsum(axis=1)
+            assert_allclose(
+                batched_hurst_exponent(windows),
+                array([compute_Hc(window, simplified=True)[0] for window in windows]),
+                rtol=1e-10,
+                err_msg=f"Batched Hurst exponent differs from compute_Hc on {length} values.",
+            )
+
+    def test_short_windows(self):
+        self.assertFalse(
+            isnan(batched_hurst_exponent(randn(5, 24).cumsum(axis=1))).any(),
+            msg="Batched Hurst exponent should be defined on windows shorter than 100 values.",
+        )
+
+    def test_constant_case(self):
+        self.assertTrue(
+            isnan(batched_hurst_exponent(zeros((2, 100)))).all(),
+            msg="Hurst exponent of a constant window must be NaN.",
+        )
+
+
+class TestBatchedADF(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.windows = randn(30, 60).cumsum(axis=1) + 3 * randn(30, 60)
+
+    def test_same_values_as_adfuller(self):
+        assert_allclose(
+            batched_adf_pvalue(self.windows),
+            array([adfuller(window)[1] for window in self.windows]),
+            rtol=1e-8,
+            err_msg="Batched ADF p-values differ from adfuller with AIC lag selection.",
+        )
+
+    def test_fixed_lag_order(self):
+        assert_allclose(
+            batched_adf_pvalue(self.windows, maxlag=2, autolag=None),
+            array(
+                [adfuller(window, maxlag=2, autolag=None)[1] for window in self.windows]
+            ),
+            rtol=1e-8,
+            err_msg="Batched ADF p-values differ from adfuller with a fixed lag order.",
+        )
+
+    def test_mackinnon_tables(self):
+        statistics = linspace(-20, 3, 231)
+        assert_allclose(
+            batched_mackinnon_pvalue(statistics),
+            array([mackinnonp(statistic) for statistic in statistics]),
+            rtol=1e-12,
+            err_msg="The MacKinnon tables differ from the ones of statsmodels.",
+        )
+
+    def test_constant_case(self):
+        self.assertTrue(
+            isnan(batched_adf_pvalue(zeros((2, 60)))).all(),
+            msg="ADF p-value of a constant window must be NaN.",
+        )
+
+
+class TestBatchedACFs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.windows = randn(30, 60).cumsum(axis=1) + randn(30, 60)
+
+    def test_same_values_as_acf(self):
+        assert_allclose(
+            batched_autocorrelation(self.windows, 10),
+            array([acf(window, nlags=10)[1:] for window in self.windows]),
+            atol=1e-12,
+            err_msg="Batched ACF differs from statsmodels acf.",
+        )
+
+    def test_same_values_as_pacf(self):
+        assert_allclose(
+            batched_partial_autocorrelation(self.windows, 10),
+            array([pacf(window, nlags=10)[1:] for window in self.windows]),
+            atol=1e-10,
+            err_msg="Batched PACF differs from statsmodels pacf.",
+        )
@@ -1,7 +1,15 @@
 import unittest
+from unittest.mock import patch
+from subprocess import run
+from sys import executable
+from shutil import rmtree
+from tempfile import mkdtemp
 from sklearn.linear_model import LinearRegression
 from src.estimator import FeatureBasedEstimator
-from numpy import zeros
+from tests.common import make_serie
+from numpy.testing import assert_allclose
+from pandas import Timedelta, concat
+from pandas.testing import assert_frame_equal
 
 
 class TestEstimator(unittest.TestCase):
@@ -16,3 +24,278 @@ class TestEstimator(unittest.TestCase):
         self.assertEqual(self.estimator_.get_seasonal_period(), 12)
         self.assertEqual(self.estimator_.get_freq(), "H")
         self.assertEqual(self.estimator_.is_fitted, False)
+
+
+class TestEstimatorUpdate(unittest.TestCase):
+    def test_update_matches_full_fit(self):
+        serie = make_serie()
+        updated = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12
+        )
+        updated.preprocess_and_fit(serie[:190])
+        updated.update(serie[190:], refit=True)
+        refitted = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12
+        )
+        refitted.preprocess_and_fit(serie)
+        assert_allclose(
+            updated.forecast().values,
+            refitted.forecast().values,
+            err_msg="Updating the estimator should give the same forecast as a full refit.",
+        )
+
+    def test_history_concatenated_on_read(self):
+        serie = make_serie()
+        updated = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12
+        ).preprocess_and_fit(serie[:150])
+        with patch("src.estimator.concat", side_effect=concat) as mocked:
+            for i in range(150, 200, 5):
+                updated.update(serie[i : i + 5])
+        self.assertEqual(
+            mocked.call_count, 0, msg="Updates should not copy the history."
+        )
+        refitted = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12
+        ).preprocess_and_fit(serie)
+        assert_allclose(
+            updated.fit(updated.X, updated.y).forecast().values,
+            refitted.forecast().values,
+        )
+        assert_frame_equal(updated.X, refitted.X, check_freq=False)
+        assert_frame_equal(updated.y, refitted.y, check_freq=False)
+        assert_frame_equal(
+            updated.rolling_features, refitted.rolling_features, check_freq=False
+        )
+
+
+class TestSequentialValidation(unittest.TestCase):
+    def test_fitted_estimator_untouched(self):
+        serie = make_serie()
+        estimator = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12, n_jobs=2
+        )
+        estimator.preprocess_and_fit(serie)
+        forecast = estimator.forecast().values
+        perfs = estimator.sequential_validation(cv=3)
+        self.assertEqual(len(perfs), 3, msg="There should be one score per fold.")
+        assert_allclose(
+            estimator.forecast().values,
+            forecast,
+            err_msg="Sequential validation should not refit the estimator.",
+        )
+
+
+class TestBacktest(unittest.TestCase):
+    def test_errors_per_origin_and_horizon(self):
+        serie = make_serie()
+        estimator = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12
+        )
+        estimator.preprocess_and_fit(serie)
+        errors = estimator.backtest(step=3, initial=60)
+        self.assertEqual(
+            errors.shape,
+            (len(range(64, estimator.X.shape[0], 3)), 5),
+            msg="There should be one row per origin and one column per horizon step.",
+        )
+        origin = errors.index[-1]
+        position = estimator.X.index.get_loc(origin)
+        refitted = LinearRegression().fit(
+            estimator.X[: position - 4], estimator.y[: position - 4]
+        )
+        assert_allclose(
+            errors.iloc[-1].values,
+            refitted.predict(estimator.X.loc[[origin]])[0]
+            - estimator.y.loc[origin].values,
+            atol=1e-6,
+            err_msg="Incremental updates should give the errors of refitted models.",
+        )
+
+
+class TestProfiling(unittest.TestCase):
+    def test_profile_report(self):
+        serie = make_serie(100)
+        records = []
+        estimator = FeatureBasedEstimator(
+            estimator=LinearRegression(),
+            horizon=3,
+            seasonal_period=12,
+            profile=True,
+            profile_callback=records.append,
+        )
+        estimator.preprocess_and_fit(serie)
+        estimator.forecast()
+        profile = estimator.profile_
+        for stage, name in [
+            ("features", "adf_pvalue"),
+            ("lags", "lags"),
+            ("targets", "targets"),
+            ("fit", "t+3"),
+            ("predict", "predict"),
+        ]:
+            self.assertIn((stage, name), profile.index)
+        self.assertEqual(
+            profile["calls"].sum(),
+            len(records),
+            msg="The callback should receive every record.",
+        )
+
+    def test_bounded_profiler(self):
+        estimator = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=3, seasonal_period=12, profile=True
+        ).preprocess_and_fit(make_serie(100))
+        for _ in range(50):
+            estimator.forecast()
+        profile = estimator.profile_
+        self.assertEqual(profile.loc[("predict", "predict"), "calls"], 50)
+        self.assertEqual(
+            len(estimator.profiler.totals),
+            profile.shape[0],
+            msg="The profiler should only hold the aggregated times.",
+        )
+        assert_allclose(profile["mean_time"], profile["total_time"] / profile["calls"])
+
+    def test_profiling_disabled(self):
+        with self.assertRaises(RuntimeError):
+            FeatureBasedEstimator(estimator=LinearRegression()).profile_
+
+
+class TestCompactMode(unittest.TestCase):
+    def test_float32_forecast(self):
+        serie = make_serie()
+        forecasts = [
+            FeatureBasedEstimator(
+                estimator=LinearRegression(), horizon=5, seasonal_period=12, dtype=dtype
+            )
+            .preprocess_and_fit(serie)
+            .forecast()
+            .values
+            for dtype in [None, "float32"]
+        ]
+        assert_allclose(forecasts[1], forecasts[0], rtol=1e-3)
+
+
+class TestStrategies(unittest.TestCase):
+    def test_forecast_per_strategy(self):
+        serie = make_serie()
+        forecasts = {
+            strategy: FeatureBasedEstimator(
+                estimator=LinearRegression(),
+                horizon=5,
+                seasonal_period=12,
+                strategy=strategy,
+            )
+            .preprocess_and_fit(serie)
+            .forecast()
+            for strategy in ["direct", "native", "stacked"]
+        }
+        assert_allclose(forecasts["native"].values, forecasts["direct"].values)
+        self.assertEqual(forecasts["stacked"].shape, (5, 1))
+
+
+class TestLatestForecast(unittest.TestCase):
+    def setUp(self):
+        self.serie = make_serie()
+        self.estimator = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12
+        ).preprocess_and_fit(self.serie[:190])
+
+    def test_same_as_full_prediction(self):
+        assert_allclose(
+            self.estimator.forecast().values.ravel(),
+            self.estimator.predict(self.estimator.rolling_features)[-1],
+        )
+
+    def test_recent_points(self):
+        forecast = self.estimator.forecast(self.serie[170:])
+        self.estimator.update(self.serie[190:])
+        assert_allclose(
+            forecast.values,
+            self.estimator.forecast().values,
+            err_msg="Recent points should give the forecast of the updated estimator.",
+        )
+        self.assertTrue(forecast.index.equals(self.estimator.forecast().index))
+
+    def test_recent_points_with_gap(self):
+        late = self.serie[197:].copy()
+        late.index = late.index + Timedelta(days=200)
+        with self.assertRaises(ValueError):
+            self.estimator.forecast(late)
+        with self.assertRaises(ValueError):
+            # 10 points are missing between the fitted serie and the window of the origin
+            self.estimator.forecast(self.serie[-5:])
+
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self):
+        self.serie = make_serie()
+        self.path = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.path, ignore_errors=True)
+
+    def test_round_trip(self):
+        for strategy in ["direct", "native"]:
+            estimator = FeatureBasedEstimator(
+                estimator=LinearRegression(),
+                horizon=5,
+                seasonal_period=12,
+                strategy=strategy,
+            ).preprocess_and_fit(self.serie[:190])
+            estimator.save(self.path)
+            loaded = FeatureBasedEstimator.load(self.path)
+            assert_allclose(loaded.forecast().values, estimator.forecast().values)
+            assert_allclose(
+                loaded.forecast(self.serie[185:]).values,
+                estimator.forecast(self.serie[185:]).values,
+            )
+            self.assertTrue(loaded.forecast().index.equals(estimator.forecast().index))
+
+    def test_update_after_load(self):
+        estimator = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12
+        ).preprocess_and_fit(self.serie[:190])
+        estimator.save(self.path)
+        loaded = FeatureBasedEstimator.load(self.path).update(self.serie[190:])
+        estimator.update(self.serie[190:])
+        assert_allclose(loaded.forecast().values, estimator.forecast().values)
+        assert_allclose(loaded.X.values, estimator.X.iloc[-loaded.X.shape[0] :].values)
+
+    def test_no_refit_after_load(self):
+        estimator = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12
+        ).preprocess_and_fit(self.serie[:190])
+        estimator.save(self.path)
+        loaded = FeatureBasedEstimator.load(self.path)
+        forecast = loaded.forecast().values
+        with self.assertRaises(RuntimeError):
+            loaded.update(self.serie[190:], refit=True)
+        assert_allclose(loaded.forecast().values, forecast)
+        loaded.preprocess_and_fit(self.serie[:190])
+        loaded.update(self.serie[190:], refit=True)
+        self.assertEqual(
+            loaded.X.shape[0], estimator.update(self.serie[190:]).X.shape[0]
+        )
+
+    def test_history_not_saved(self):
+        estimator = FeatureBasedEstimator(
+            estimator=LinearRegression(), horizon=5, seasonal_period=12
+        ).preprocess_and_fit(self.serie)
+        estimator.save(self.path)
+        loaded = FeatureBasedEstimator.load(self.path)
+        self.assertEqual(loaded.rolling_features.shape[0], 5)
+        self.assertEqual(loaded.features_builder.tail.shape[0], 17)
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_no_plotting_at_import(self):
+        code = (
+            "import sys, warnings, sklearn.multioutput; filters = list(warnings.filters); "
+            "import src.estimator; "
+            "assert warnings.filters == filters, 'warnings filters changed'; "
+            "loaded = [m for m in ['matplotlib', 'mplcyberpunk', 'statsmodels', 'hurst'] "
+            "if m in sys.modules]; assert not loaded, loaded"
+        )
+        result = run([executable, "-c", code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import patch
+from os import listdir
+from os.path import join
+from tempfile import mkdtemp
+from shutil import rmtree
+from numpy import sin, pi, arange
+from numpy.random import randn
+from pandas import Series, date_range
+from pandas.testing import assert_frame_equal
+
+import src.feature_store
+from src.feature_store import FeatureStore
+from src.preprocessing_tools import build_rolling_features
+
+
+class TestFeatureStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serie = Series(
+            10 + sin(2 * pi * arange(150) / 12) + randn(150).cumsum() / 10,
+            index=date_range("2020-01-01", periods=150, freq="D"),
+        )
+        cls.expected = build_rolling_features(cls.serie, 12)
+
+    def setUp(self):
+        self.path = mkdtemp()
+        self.store = FeatureStore(self.path)
+
+    def tearDown(self):
+        rmtree(self.path, ignore_errors=True)
+
+    def test_cached_features(self):
+        build_rolling_features(self.serie, 12, cache=self.store)
+        cached, n_points = self.store.load(
+            self.serie,
+            dict(
+                seasonal_period=12,
+                lags_to_consider=5,
+                adf_lag=None,
+                autocorrelation_lags=0,
+                features=list(self.expected.columns[:12]),
+            ),
+        )
+        self.assertEqual(
+            n_points, self.serie.shape[0], msg="The whole serie should be cached."
+        )
+        assert_frame_equal(cached, self.expected)
+        assert_frame_equal(
+            build_rolling_features(self.serie, 12, cache=self.store), self.expected
+        )
+
+    def test_parameters_in_key(self):
+        build_rolling_features(self.serie, 12, cache=self.store)
+        self.assertListEqual(
+            list(
+                build_rolling_features(
+                    self.serie, 12, cache=self.store, features=["mean"]
+                ).columns[:1]
+            ),
+            ["mean"],
+            msg="Features built with other parameters should not be read from the cache.",
+        )
+
+    def test_prefix_extension(self):
+        build_rolling_features(self.serie[:100], 12, cache=self.store)
+        assert_frame_equal(
+            build_rolling_features(self.serie, 12, cache=self.store), self.expected
+        )
+        directory = join(self.path, listdir(self.path)[0])
+        self.assertEqual(
+            len(listdir(directory)),
+            1,
+            msg="The extended serie should replace its stored prefix.",
+        )
+
+    def test_numeric_index_key(self):
+        serie = Series(self.serie.to_numpy(), index=arange(150))
+        self.assertEqual(FeatureStore.serie_key(serie), FeatureStore.serie_key(serie))
+        self.assertNotEqual(
+            FeatureStore.serie_key(serie),
+            FeatureStore.serie_key(Series(serie.to_numpy(), index=arange(1, 151))),
+        )
+        self.assertNotEqual(
+            FeatureStore.serie_key(serie),
+            FeatureStore.serie_key(Series(serie.to_numpy(), index=arange(150.0))),
+        )
+
+    def test_version_in_key(self):
+        parameters = dict(seasonal_period=12)
+        key = FeatureStore.parameters_key(parameters)
+        with patch.object(
+            src.feature_store,
+            "FEATURES_VERSION",
+            src.feature_store.FEATURES_VERSION + 1,
+        ):
+            self.assertNotEqual(FeatureStore.parameters_key(parameters), key)
@@ -9,14 +9,18 @@ from numpy import (
     pi,
     nanquantile,
     abs,
+    isnan,
 )  # Maths fuctions
 from numpy import array, zeros, arange  # Structure / data generation
-from numpy.testing import assert_equal
+from numpy.testing import assert_equal, assert_allclose
 from numpy.random import randn
+from pandas import Series, date_range
+from pandas.testing import assert_frame_equal
 
 from hurst import random_walk
 
 from src.features_computation_tools import (
+    stl_strengths,
     seasonal_strength,
     trend_strength,
     spikiness,
@@ -28,6 +32,8 @@ from src.features_computation_tools import (
     partial_autocorrelation,
     adf_pvalue,
 )
+from src.compiled_features_tools import STATISTICS, fused_window_statistics
+from src.preprocessing_tools import build_rolling_features
 
 
 # Numpy functions that can be used for the feature based forecasting
@@ -121,6 +127,22 @@ class TestTrendStrenght(unittest.TestCase):
         )
 
 
+class TestSTLStrengths(unittest.TestCase):
+    def test_consistency_with_single_strengths(self) -> None:
+        mock_data = 3 * sin(2 * pi * arange(1, 101) / 10) + arange(100) / 10
+        trend, seasonal = stl_strengths(mock_data, 10)
+        self.assertAlmostEqual(
+            trend,
+            trend_strength(mock_data, 10),
+            msg="stl_strengths should return the same trend strength as trend_strength.",
+        )
+        self.assertAlmostEqual(
+            seasonal,
+            seasonal_strength(mock_data, 10),
+            msg="stl_strengths should return the same seasonal strength as seasonal_strength.",
+        )
+
+
 class TestSpikiness(unittest.TestCase):
     def test_unspiked_data(self) -> None:
         self.assertEqual(
@@ -328,5 +350,55 @@ class TestUnitRoot(unittest.TestCase):
         )
 
 
+class TestCompiledStatistics(unittest.TestCase):
+    def setUp(self):
+        self.serie = randn(120).cumsum()
+        self.serie[40:52] = 1.0  # constant windows
+        self.serie[80] = nan
+
+    def test_same_as_scalar_features(self):
+        window = 12
+        statistics = fused_window_statistics(self.serie, window)
+        for i in range(self.serie.shape[0] - window + 1):
+            values = self.serie[i : i + window]
+            if isnan(values).any():
+                self.assertTrue(isnan(statistics[i]).all())
+                continue
+            expected = {
+                "mean": nanmean(values),
+                "median": nanmedian(values),
+                "std": nanstd(values, ddof=1),
+                "q1": nanquantile(values, 0.25),
+                "q3": nanquantile(values, 0.75),
+                "lumpiness": lumpiness(values),
+                "spikiness": spikiness(values),
+                "curvature": curvature(values),
+            }
+            assert_allclose(
+                statistics[i],
+                [expected[name] for name in STATISTICS],
+                rtol=1e-9,
+                atol=1e-12,
+                err_msg=f"Window {i} differs from the scalar features.",
+            )
+
+    def test_backends_match(self):
+        serie = Series(
+            self.serie, index=date_range("2020-01-01", periods=120, freq="D")
+        )
+        features = ["mean", "median", "std", "q1", "q3", "spikiness", "curvature"]
+        assert_frame_equal(
+            build_rolling_features(serie, 12, features=features, backend="numba"),
+            build_rolling_features(serie, 12, features=features, backend="numpy"),
+            rtol=1e-9,
+        )
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            build_rolling_features(
+                Series(self.serie), 12, features=["mean"], backend="cuda"
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
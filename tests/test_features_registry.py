@@ -0,0 +1,94 @@
+import unittest
+from numpy import sin, pi, arange
+from numpy.random import randn
+from pandas import Series, date_range
+
+from src.features_registry import (
+    FEATURES_REGISTRY,
+    register_feature,
+    default_features,
+    select_features,
+    estimate_features_cost,
+)
+from src.preprocessing_tools import build_rolling_features
+
+
+class TestFeaturesSelection(unittest.TestCase):
+    def test_default_features(self):
+        self.assertNotIn(
+            "hurst_exponent",
+            default_features(12),
+            msg="Hurst exponent should only be a default feature from 100 values.",
+        )
+        self.assertIn(
+            "hurst_exponent",
+            default_features(100),
+            msg="Hurst exponent should be a default feature from 100 values.",
+        )
+
+    def test_unknown_feature(self):
+        with self.assertRaises(ValueError):
+            select_features(12, 100, features=["mean", "not a feature"])
+
+    def test_too_short_window(self):
+        with self.assertRaises(ValueError):
+            select_features(10, 100, features=["hurst_exponent"])
+
+    def test_time_budget_drops_costly_features(self):
+        budget = estimate_features_cost(
+            [name for name in default_features(24) if "strength" not in name], 24, 1000
+        )
+        selected = select_features(24, 1000, time_budget=budget)
+        self.assertNotIn(
+            "trend_strength",
+            selected,
+            msg="STL features should be dropped first under a time budget.",
+        )
+        self.assertIn(
+            "adf_pvalue", selected, msg="Features within the budget should be kept."
+        )
+
+    def test_shared_kernel_counted_once(self):
+        self.assertEqual(
+            estimate_features_cost(["trend_strength", "seasonal_strength"], 24, 1000),
+            estimate_features_cost(["trend_strength"], 24, 1000),
+            msg="Features sharing a kernel should only be counted once.",
+        )
+
+
+class TestFeaturesBuildWithRegistry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serie = Series(
+            10 + sin(2 * pi * arange(100) / 12) + randn(100).cumsum() / 10,
+            index=date_range("2020-01-01", periods=100, freq="D"),
+        )
+
+    def test_selected_features_only(self):
+        features = build_rolling_features(
+            self.serie, 12, lags_to_consider=1, features=["mean", "adf_pvalue"]
+        )
+        self.assertListEqual(
+            list(features.columns),
+            ["mean", "adf_pvalue", "lag 1", "seasonal lag 1"],
+            msg="Only the selected features should be computed.",
+        )
+
+    def test_registered_feature(self):
+        register_feature(
+            "last_value",
+            lambda serie, seasonal_period, **options: {"last_value": serie.values},
+        )
+        try:
+            features = build_rolling_features(self.serie, 12, features=["last_value"])
+            self.assertTrue(
+                (features["last_value"] == self.serie.loc[features.index]).all(),
+                msg="Registered features should be computed by name.",
+            )
+            self.assertNotIn(
+                "last_value",
+                default_features(12),
+                msg="Registered features should only be computed by default on request.",
+            )
+        finally:
+            del FEATURES_REGISTRY["last_value"]
@@ -0,0 +1,34 @@
+import unittest
+from numpy.random import randn
+from numpy.testing import assert_allclose
+from sklearn.linear_model import Ridge
+
+from src.incremental_tools import RecursiveLeastSquares
+
+
+class TestRecursiveLeastSquares(unittest.TestCase):
+    def setUp(self):
+        self.X = randn(200, 6)
+        self.y = self.X @ randn(6, 3) + randn(200, 3) / 10 + 5
+
+    def test_updates_match_full_fit(self):
+        for alpha in [0.0, 2.0]:
+            model = RecursiveLeastSquares(alpha=alpha).fit(self.X[:50], self.y[:50])
+            model.partial_fit(self.X[50:51], self.y[50:51])
+            model.partial_fit(self.X[51:], self.y[51:])
+            full = RecursiveLeastSquares(alpha=alpha).fit(self.X, self.y)
+            assert_allclose(
+                model.coef_,
+                full.coef_,
+                atol=1e-9,
+                err_msg="Incremental updates should give the coefficients of a full fit.",
+            )
+
+    def test_ridge(self):
+        model = RecursiveLeastSquares(alpha=2.0).fit(self.X, self.y)
+        assert_allclose(
+            model.predict(self.X),
+            Ridge(alpha=2.0).fit(self.X, self.y).predict(self.X),
+            atol=1e-9,
+            err_msg="The intercept should not be penalized, as in scikit-learn.",
+        )
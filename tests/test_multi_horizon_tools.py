@@ -0,0 +1,42 @@
+import unittest
+from numpy import arange
+from numpy.random import randn
+from numpy.testing import assert_allclose, assert_array_equal
+from sklearn.linear_model import LinearRegression
+
+from src.multi_horizon_tools import StackedHorizonRegressor, multi_horizon_model
+
+
+class TestMultiHorizonModels(unittest.TestCase):
+    def setUp(self):
+        self.X = randn(100, 4)
+        self.y = self.X @ randn(4, 3)
+
+    def test_stack_horizon(self):
+        stacked = StackedHorizonRegressor.stack_horizon(arange(4).reshape(2, 2), 3)
+        assert_array_equal(stacked[:, -1], [1, 2, 3, 1, 2, 3])
+        assert_array_equal(stacked[3, :-1], [2, 3])
+
+    def test_native_matches_direct(self):
+        assert_allclose(
+            multi_horizon_model(LinearRegression(), "native")
+            .fit(self.X, self.y)
+            .predict(self.X),
+            multi_horizon_model(LinearRegression(), "direct")
+            .fit(self.X, self.y)
+            .predict(self.X),
+            err_msg="Linear models should be the same for both strategies.",
+        )
+
+    def test_stacked_shape(self):
+        self.assertEqual(
+            multi_horizon_model(LinearRegression(), "stacked")
+            .fit(self.X, self.y)
+            .predict(self.X[:5])
+            .shape,
+            (5, 3),
+        )
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            multi_horizon_model(LinearRegression(), "recursive")
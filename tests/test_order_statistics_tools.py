@@ -0,0 +1,72 @@
+import unittest
+from numpy import nan, median, quantile, isnan, round as round_
+from numpy.random import randn, randint
+from numpy.testing import assert_allclose
+
+from src.batched_features_tools import rolling_statistics, SORTED_WINDOW_MIN_LENGTH
+from src.order_statistics_tools import SortedWindow, sliding_order_statistics
+
+
+class TestSortedWindow(unittest.TestCase):
+    def test_same_as_sorted_list(self):
+        # small blocks, to split and empty them, and duplicates
+        window = SortedWindow(block_length=4)
+        values = []
+        for value in round_(randn(500), 1):
+            if values and randint(3) == 0:
+                removed = values.pop(randint(len(values)))
+                window.remove(removed)
+            window.add(value)
+            values.append(value)
+            self.assertListEqual(
+                [window[k] for k in range(len(window))], sorted(values)
+            )
+            self.assertEqual(
+                window.count_greater(0.0), sum(value > 0 for value in values)
+            )
+        self.assertEqual(window.median(), median(values))
+        for q in [0.1, 0.25, 0.75]:
+            self.assertAlmostEqual(window.quantile(q), quantile(values, q))
+
+
+class TestSlidingOrderStatistics(unittest.TestCase):
+    def test_same_as_numpy(self):
+        serie = randn(300).cumsum()
+        serie[100] = nan
+        serie[150:170] = 1.0
+        statistics = sliding_order_statistics(serie, 12)
+        for j in range(serie.shape[0] - 11):
+            values = serie[j : j + 12]
+            if isnan(values).any():
+                self.assertTrue(isnan(statistics["median"][j]))
+                continue
+            assert_allclose(
+                [statistics[name][j] for name in ["median", "q1", "q3", "spikiness"]],
+                [
+                    median(values),
+                    quantile(values, 0.25),
+                    quantile(values, 0.75),
+                    (values > median(values)).mean(),
+                ],
+            )
+            self.assertEqual(statistics["constant"][j], values.min() == values.max())
+
+    def test_large_windows_statistics(self):
+        window = SORTED_WINDOW_MIN_LENGTH
+        serie = randn(window + 50).cumsum()
+        statistics = rolling_statistics(serie, window)
+        for i in [window - 1, window + 49]:
+            values = serie[i - window + 1 : i + 1]
+            assert_allclose(
+                [statistics[name][i] for name in ["median", "q1", "q3", "std"]],
+                [
+                    median(values),
+                    quantile(values, 0.25),
+                    quantile(values, 0.75),
+                    values.std(ddof=1),
+                ],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
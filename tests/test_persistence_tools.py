@@ -0,0 +1,41 @@
+import unittest
+from os.path import join, exists
+from shutil import rmtree
+from tempfile import mkdtemp
+from numpy import arange, memmap, shares_memory
+from numpy.testing import assert_array_equal
+
+from src.persistence_tools import save_object, load_object
+
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self):
+        self.path = mkdtemp()
+        self.obj = {
+            "large": arange(100_000, dtype=float),
+            "small": arange(10),
+            "name": "a",
+        }
+
+    def tearDown(self):
+        rmtree(self.path, ignore_errors=True)
+
+    def test_round_trip(self):
+        save_object(self.obj, join(self.path, "obj.pkl"))
+        for mmap_mode in ["r", None]:
+            loaded = load_object(join(self.path, "obj.pkl"), mmap_mode=mmap_mode)
+            assert_array_equal(loaded["large"], self.obj["large"])
+            assert_array_equal(loaded["small"], self.obj["small"])
+            self.assertEqual(loaded["name"], "a")
+
+    def test_large_arrays_memory_mapped(self):
+        save_object(self.obj, join(self.path, "obj.pkl"))
+        loaded = load_object(join(self.path, "obj.pkl"))
+        self.assertIsInstance(loaded["large"].base.base, memmap)
+        self.assertFalse(loaded["large"].flags.writeable)
+        self.assertFalse(shares_memory(loaded["small"], loaded["large"]))
+
+    def test_small_objects_in_a_single_file(self):
+        save_object({"small": arange(10)}, join(self.path, "obj.pkl"))
+        self.assertFalse(exists(join(self.path, "obj.pkl.bin")))
+        assert_array_equal(load_object(join(self.path, "obj.pkl"))["small"], arange(10))
@@ -1,12 +1,25 @@
 import unittest
-from pandas import read_csv, to_datetime
-from numpy.random import choice
-from numpy import zeros
+import tracemalloc
+from unittest.mock import patch
+from pandas import read_csv, to_datetime, concat, Series, date_range
+from pandas.testing import assert_frame_equal, assert_series_equal
+from numpy.random import choice, randn
+from numpy import zeros, shares_memory
+import src.preprocessing_tools
+from src.profiling_tools import Profiler
+from src.features_registry import compute_features
 from src.preprocessing_tools import (
     build_rolling_features,
     build_rolling_target,
+    build_lags,
+    build_rolling_XY,
+    build_window_features,
+    estimate_rolling_XY_nbytes,
+    iter_rolling_XY,
+    RollingFeaturesBuilder,
     temporal_train_test_split,
 )
+from tests.common import make_serie
 
 
 class TestFeaturesBuild(unittest.TestCase):
@@ -84,6 +97,231 @@ class TestTargetBuild(unittest.TestCase):
         )
 
 
+class TestRollingFeaturesBuilder(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serie = make_serie()
+
+    def test_updates_match_full_build(self):
+        builder = RollingFeaturesBuilder(seasonal_period=12, horizon=6)
+        rolling_features, _, _, y = builder.fit_transform(self.serie[:150])
+        updates = [builder.update(self.serie[i : i + 10]) for i in range(150, 200, 10)]
+        expected_features, _, _, expected_y = build_rolling_XY(
+            self.serie, seasonal_period=12, horizon=6
+        )
+        assert_frame_equal(
+            concat([rolling_features] + [update[0] for update in updates]),
+            expected_features,
+        )
+        assert_frame_equal(concat([y] + [update[2] for update in updates]), expected_y)
+
+    def test_latest_features_batch(self):
+        builder = RollingFeaturesBuilder(seasonal_period=12, horizon=6)
+        builder.fit_transform(self.serie[:150])
+        expected = build_rolling_features(self.serie, 12)
+        origins = [150, 163, 199, 163]
+        with patch(
+            "src.preprocessing_tools.compute_features", side_effect=compute_features
+        ) as mocked:
+            latest = builder.latest_features_batch(
+                [self.serie[140 : origin + 1] for origin in origins]
+            )
+        self.assertEqual(mocked.call_count, 1, msg="The kernels should run once.")
+        assert_frame_equal(
+            latest,
+            expected.loc[self.serie.index[origins]],
+            check_freq=False,
+            rtol=1e-9,
+        )
+
+    def test_bounded_tail(self):
+        builder = RollingFeaturesBuilder(seasonal_period=12, horizon=6)
+        builder.fit_transform(self.serie[:150])
+        builder.update(self.serie[150:])
+        self.assertEqual(
+            builder.tail.shape[0],
+            builder.tail_length,
+            msg="The builder should only keep the points needed by the next update.",
+        )
+
+
+class TestParallelFeaturesBuild(unittest.TestCase):
+    def test_same_features_as_serial_build(self):
+        serie = make_serie(150)
+        assert_frame_equal(
+            build_rolling_features(serie, 12, n_jobs=2),
+            build_rolling_features(serie, 12),
+        )
+
+
+class TestHurstFlag(unittest.TestCase):
+    def test_hurst_on_short_windows(self):
+        serie = Series(
+            randn(100).cumsum(), index=date_range("2020-01-01", periods=100, freq="D")
+        )
+        self.assertNotIn(
+            "hurst_exponent",
+            build_rolling_features(serie, 12).columns,
+            msg="Hurst exponent should only be computed by default from 100 values.",
+        )
+        self.assertIn(
+            "hurst_exponent",
+            build_rolling_features(serie, 12, with_hurst=True).columns,
+            msg="with_hurst should enable the Hurst exponent on short windows.",
+        )
+
+
+class TestProfiledFeaturesBuild(unittest.TestCase):
+    def test_stages_and_kernels_timed(self):
+        serie = Series(
+            randn(100).cumsum(), index=date_range("2020-01-01", periods=100, freq="D")
+        )
+        records = []
+        build_rolling_features(
+            serie,
+            12,
+            features=["mean", "std", "adf_pvalue"],
+            profiler=Profiler(callback=records.append),
+        )
+        self.assertListEqual(
+            [(record["stage"], record["name"]) for record in records],
+            [("features", "mean, std"), ("features", "adf_pvalue"), ("lags", "lags")],
+            msg="Each kernel call and the lags should be recorded once.",
+        )
+
+    def test_features_built_once(self):
+        serie = Series(
+            randn(100).cumsum(), index=date_range("2020-01-01", periods=100, freq="D")
+        )
+        records = []
+        build_rolling_XY(
+            serie,
+            12,
+            features=["mean", "std"],
+            profiler=Profiler(callback=records.append),
+            memory_budget=2**30,
+        )
+        self.assertListEqual(
+            [record["stage"] for record in records],
+            ["features", "lags", "targets"],
+            msg="build_rolling_XY should build the features once.",
+        )
+
+
+class TestCompactXY(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serie = make_serie()
+        cls.features = ["mean", "std", "adf_pvalue"]
+
+    def test_float32(self):
+        rolling_features, X, y, aligned_y = build_rolling_XY(
+            self.serie, 12, horizon=4, features=self.features, dtype="float32"
+        )
+        for frame in [rolling_features, X, y, aligned_y]:
+            self.assertTrue((frame.dtypes == "float32").all())
+        self.assertTrue(
+            shares_memory(rolling_features["mean"].values, X["mean"].values),
+            msg="The aligned features should be a view of the rolling features.",
+        )
+
+    def test_float32_window_features_by_blocks(self):
+        with patch.object(src.preprocessing_tools, "FEATURES_BLOCK_SIZE", 50):
+            blocks = build_window_features(
+                self.serie, 12, features=self.features, dtype="float32"
+            )
+        self.assertTrue((blocks.dtypes == "float32").all())
+        assert_frame_equal(
+            blocks,
+            build_window_features(self.serie, 12, features=self.features).astype(
+                "float32"
+            ),
+        )
+
+    def test_float32_peak_memory(self):
+        serie = make_serie(length=60000)
+        features = ["mean", "median", "std"]
+        peaks = dict()
+        for dtype in [None, "float32"]:
+            tracemalloc.start()
+            build_rolling_XY(serie, 12, horizon=12, features=features, dtype=dtype)
+            peaks[dtype] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertGreaterEqual(
+                estimate_rolling_XY_nbytes(60000, 12, 12, 5, features, dtype=dtype),
+                peaks[dtype],
+                msg="The estimate should bound the peak memory of the build.",
+            )
+        self.assertLess(
+            peaks["float32"],
+            0.75 * peaks[None],
+            msg="float32 frames should be built without float64 copies of them.",
+        )
+
+    def test_memory_budget_warning(self):
+        with self.assertWarns(UserWarning):
+            build_rolling_XY(
+                self.serie, 12, horizon=4, features=self.features, memory_budget=1000
+            )
+
+    def test_streamed_blocks(self):
+        _, X, _, y = build_rolling_XY(self.serie, 12, horizon=4, features=self.features)
+        blocks = list(
+            iter_rolling_XY(
+                self.serie, 12, horizon=4, features=self.features, block_size=50
+            )
+        )
+        self.assertEqual(len(blocks), 4)
+        assert_frame_equal(concat([block[0] for block in blocks]), X)
+        assert_frame_equal(concat([block[1] for block in blocks]), y)
+
+
+class TestStridedConstruction(unittest.TestCase):
+    def setUp(self):
+        self.serie = Series(
+            randn(100).cumsum(), index=date_range("2020-01-01", periods=100, freq="D")
+        )
+
+    def test_target_view(self):
+        target = build_rolling_target(self.serie, 10)
+        self.assertTrue(
+            shares_memory(target.values, self.serie.values),
+            msg="The targets should be a view of the serie.",
+        )
+        self.assertListEqual(
+            list(target.iloc[3]), list(self.serie.iloc[4:14]), msg="Wrong targets."
+        )
+
+    def test_lags_with_missing_values(self):
+        serie = self.serie.copy()
+        serie.iloc[50] = float("nan")
+        lags = build_lags(serie, 12, 2)
+        for i in [1, 2]:
+            assert_series_equal(lags[f"lag {i}"], serie.shift(i), check_names=False)
+            assert_series_equal(
+                lags[f"seasonal lag {i}"], serie.shift(i + 12), check_names=False
+            )
+        self.assertEqual(
+            build_rolling_target(serie, 3).shape[0],
+            100 - 3 - 3,
+            msg="Targets with missing values should be dropped.",
+        )
+
+
+class TestAutocorrelationFeatures(unittest.TestCase):
+    def test_autocorrelation_columns(self):
+        serie = Series(
+            randn(100).cumsum(), index=date_range("2020-01-01", periods=100, freq="D")
+        )
+        features = build_rolling_features(serie, 12, autocorrelation_lags=3)
+        self.assertTrue(
+            {"acf_1", "acf_2", "acf_3", "pacf_1", "pacf_2", "pacf_3"}.issubset(
+                features.columns
+            ),
+            msg="autocorrelation_lags should add the acf_k and pacf_k columns.",
+        )
+
+
 class TestSplit(unittest.TestCase):
     def test_temporal_train_test_split(self):
         X = zeros((100, 5))
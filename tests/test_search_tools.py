@@ -0,0 +1,125 @@
+import unittest
+from unittest.mock import patch
+from sklearn.linear_model import LinearRegression
+from numpy import sin, pi, arange
+from numpy.random import default_rng
+from pandas import Series, date_range
+from pandas.testing import assert_frame_equal
+
+import src.search_tools
+from src.estimator import FeatureBasedEstimator
+from src.search_tools import FeatureBasedSearch, SEARCHED_PARAMETERS
+
+
+class FailingOnLags(LinearRegression):
+    # fails on the candidates with more than one lag and seasonal lag
+    def fit(self, X, y):
+        if X.shape[1] > 5:
+            raise ValueError("Too many lags.")
+        return super().fit(X, y)
+
+
+class TestFeatureBasedSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serie = Series(
+            10
+            + sin(2 * pi * arange(400) / 12)
+            + default_rng(0).standard_normal(400).cumsum() / 100,
+            index=date_range("2020-01-01", periods=400, freq="H"),
+        )
+        cls.features = ["mean", "std", "spikiness"]
+        cls.grid = {
+            "seasonal_period": [6, 12],
+            "lags_to_consider": [1, 3],
+            "horizon": [4, 8],
+        }
+
+    def search(self, **params) -> FeatureBasedSearch:
+        return FeatureBasedSearch(
+            LinearRegression(), self.grid, features=self.features, freq="H", **params
+        )
+
+    def test_candidates_same_as_preprocess_and_fit(self):
+        search = self.search()
+        shared = {}
+        for candidate in search.candidates():
+            X, y = search.assemble_XY(self.serie, candidate, shared)
+            estimator = FeatureBasedEstimator(
+                LinearRegression(),
+                horizon=candidate["horizon"],
+                seasonal_period=candidate["seasonal_period"],
+                features=self.features,
+            )
+            estimator.preprocess_and_fit(self.serie, candidate["lags_to_consider"])
+            assert_frame_equal(X, estimator.X, check_freq=False, rtol=1e-9)
+            assert_frame_equal(y, estimator.y, check_freq=False)
+
+    def test_window_features_built_once_per_seasonal_period(self):
+        build = src.search_tools.build_window_features
+        with patch.object(
+            src.search_tools, "build_window_features", side_effect=build
+        ) as mocked:
+            self.search(refit=False).fit(self.serie)
+        self.assertEqual(mocked.call_count, 2)
+
+    def test_early_stopping(self):
+        exhaustive = self.search(eta=1, refit=False).fit(self.serie)
+        halving = self.search(eta=2, refit=False).fit(self.serie)
+        self.assertTrue((exhaustive.results_["n_splits"] == 3).all())
+        # 8 candidates on the first block, 4 on the second, 2 on the last
+        self.assertEqual(halving.results_["n_splits"].sum(), 14)
+        self.assertEqual(halving.best_params_, exhaustive.best_params_)
+        self.assertEqual(
+            halving.results_.iloc[0][["seasonal_period", "horizon"]].tolist(),
+            [halving.best_params_["seasonal_period"], halving.best_params_["horizon"]],
+        )
+
+    def test_ranked_within_horizon(self):
+        search = self.search(eta=1, refit=False).fit(self.serie)
+        for horizon, results in search.results_.groupby("horizon"):
+            self.assertListEqual(list(results["rank"]), [1, 2, 3, 4])
+            best = results.iloc[0][SEARCHED_PARAMETERS].to_dict()
+            self.assertEqual(best, search.best_params_by_horizon_[horizon])
+        self.assertEqual(
+            search.best_params_,
+            search.best_params_by_horizon_[8],
+            msg="The best candidate should be the one of the longest horizon.",
+        )
+
+    def test_failing_candidates_scored_nan(self):
+        search = FeatureBasedSearch(
+            FailingOnLags(),
+            self.grid,
+            features=self.features,
+            freq="H",
+            eta=1,
+            refit=False,
+        )
+        with self.assertWarns(UserWarning):
+            search.fit(self.serie)
+        failed = search.results_["lags_to_consider"] == 3
+        self.assertTrue(search.results_.loc[failed, "score"].isna().all())
+        self.assertEqual(search.best_params_["lags_to_consider"], 1)
+
+    def test_parallel_same_scores(self):
+        sequential = self.search(eta=1, refit=False).fit(self.serie)
+        parallel = self.search(eta=1, refit=False, n_jobs=2).fit(self.serie)
+        assert_frame_equal(sequential.results_, parallel.results_)
+
+    def test_refit(self):
+        search = self.search().fit(self.serie)
+        estimator = search.best_estimator_
+        self.assertTrue(estimator.is_fitted)
+        self.assertEqual(
+            estimator.get_seasonal_period(), search.best_params_["seasonal_period"]
+        )
+        self.assertEqual(estimator.forecast().shape[0], search.best_params_["horizon"])
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            FeatureBasedSearch(LinearRegression(), {"alpha": [1.0]}).candidates()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from asyncio import gather, open_connection
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from json import dumps, loads
+from numpy import sin, pi, arange
+from numpy.random import randn
+from numpy.testing import assert_allclose
+from pandas import Series, date_range
+from sklearn.linear_model import LinearRegression
+
+from src.estimator import FeatureBasedEstimator
+from src.service import EstimatorPool, ForecastService
+
+
+def fit_estimator(series_id: str) -> FeatureBasedEstimator:
+    serie = Series(
+        10 + sin(2 * pi * arange(100) / 12) + randn(100).cumsum() / 10,
+        index=date_range("2020-01-01", periods=100, freq="D"),
+    )
+    return FeatureBasedEstimator(
+        estimator=LinearRegression(),
+        horizon=3,
+        seasonal_period=12,
+        features=["mean", "std", "adf_pvalue"],
+    ).preprocess_and_fit(serie)
+
+
+class TestEstimatorPool(unittest.IsolatedAsyncioTestCase):
+    async def test_lru_eviction(self):
+        loads_count = []
+        pool = EstimatorPool(
+            2, loader=lambda series_id: loads_count.append(series_id) or series_id
+        )
+        for series_id in ["a", "b", "a", "c"]:
+            await pool.get(series_id)
+        self.assertNotIn(
+            "b", pool, msg="The least recently used series should be evicted."
+        )
+        self.assertIn("a", pool)
+        await gather(pool.get("d"), pool.get("d"))
+        self.assertEqual(
+            loads_count.count("d"), 1, msg="Concurrent gets should share a single load."
+        )
+
+    async def test_unknown_series(self):
+        with self.assertRaises(KeyError):
+            await EstimatorPool(2).get("a")
+
+
+class TestForecastService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.pool = EstimatorPool(10)
+        for series_id in ["a", "b"]:
+            self.pool.put(series_id, fit_estimator(series_id))
+        self.service = ForecastService(self.pool)
+
+    async def test_coalesced_forecasts(self):
+        forecasts = await gather(
+            *[self.service.forecast(series_id) for series_id in ["a", "a", "b"]]
+        )
+        self.assertEqual(self.service.stats["coalesced"], 1)
+        self.assertEqual(self.service.stats["batches"], 1)
+        assert_allclose(
+            forecasts[0]["forecast"],
+            self.pool.estimators["a"].forecast()["Forecast"].values,
+        )
+
+    async def test_recent_points(self):
+        forecast = await self.service.forecast("a", [10.0, 10.5])
+        assert_allclose(
+            forecast["forecast"],
+            self.pool.estimators["a"].forecast([10.0, 10.5])["Forecast"].values,
+        )
+
+    async def test_concurrent_loads(self):
+        # each load waits for the others : loading them one after the other would time out
+        barrier = Barrier(2, timeout=10)
+
+        def loader(series_id: str) -> FeatureBasedEstimator:
+            if series_id == "unknown":
+                raise KeyError(f"Unknown series : {series_id}.")
+            barrier.wait()
+            return fit_estimator(series_id)
+
+        service = ForecastService(
+            EstimatorPool(10, loader=loader, executor=ThreadPoolExecutor(3))
+        )
+        forecasts = await gather(
+            *[service.forecast(series_id) for series_id in ["c", "d", "unknown"]],
+            return_exceptions=True,
+        )
+        self.assertEqual(service.stats["batches"], 1)
+        self.assertEqual(
+            [len(forecast["forecast"]) for forecast in forecasts[:2]], [3, 3]
+        )
+        self.assertIsInstance(
+            forecasts[2], KeyError, msg="A failed load should only fail its requests."
+        )
+
+    async def test_http(self):
+        server = await self.service.serve(port=0)
+        host, port = server.sockets[0].getsockname()[:2]
+        reader, writer = await open_connection(host, port)
+        responses = []
+        for series_id in ["a", "unknown"]:
+            content = dumps({"series_id": series_id}).encode()
+            writer.write(
+                f"POST /forecast HTTP/1.1\r\nContent-Length: {len(content)}\r\n\r\n".encode()
+                + content
+            )
+            status = await reader.readline()
+            length = 0
+            while (line := await reader.readline()) != b"\r\n":
+                if line.lower().startswith(b"content-length"):
+                    length = int(line.split(b":")[1])
+            responses.append((status, loads(await reader.readexactly(length))))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+        self.assertIn(b"200", responses[0][0])
+        self.assertEqual(len(responses[0][1]["forecast"]), 3)
+        self.assertIn(b"404", responses[1][0])
@@ -0,0 +1,111 @@
+import unittest
+from importlib.util import find_spec
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from numpy import sin, pi, arange
+from numpy.random import randn
+from pandas import Series, date_range, concat
+from pandas.testing import assert_frame_equal
+
+from src.preprocessing_tools import build_rolling_XY
+from src.streaming_tools import (
+    read_serie_chunks,
+    stream_rolling_XY,
+    write_rolling_XY,
+    read_rolling_XY,
+)
+
+
+class TestStreaming(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serie = Series(
+            10 + sin(2 * pi * arange(300) / 12) + randn(300).cumsum() / 10,
+            index=date_range("2020-01-01", periods=300, freq="H", name="date"),
+            name="value",
+        )
+        cls.features = ["mean", "std", "spikiness", "adf_pvalue"]
+        _, cls.X, _, cls.y = build_rolling_XY(
+            cls.serie, 12, horizon=4, features=cls.features
+        )
+
+    def setUp(self):
+        self.path = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.path, ignore_errors=True)
+
+    def assertSameXY(self, X, y):
+        assert_frame_equal(X, self.X, check_freq=False, rtol=1e-9)
+        assert_frame_equal(y, self.y, check_freq=False)
+
+    def test_same_as_build_rolling_XY(self):
+        self.serie.reset_index().to_csv(join(self.path, "serie.csv"), index=False)
+        for chunksize in [5, 64, 1000]:
+            blocks = list(
+                stream_rolling_XY(
+                    read_serie_chunks(
+                        join(self.path, "serie.csv"), chunksize=chunksize
+                    ),
+                    12,
+                    horizon=4,
+                    features=self.features,
+                )
+            )
+            self.assertSameXY(
+                concat([X for X, _ in blocks]), concat([y for _, y in blocks])
+            )
+
+    def test_write_and_read(self):
+        blocks = stream_rolling_XY(
+            (self.serie.iloc[i : i + 50] for i in range(0, 300, 50)),
+            12,
+            horizon=4,
+            features=self.features,
+        )
+        self.assertEqual(
+            write_rolling_XY(blocks, join(self.path, "XY")), self.X.shape[0]
+        )
+        X, y = read_rolling_XY(join(self.path, "XY"))
+        self.assertSameXY(X, y)
+        self.assertFalse(
+            X.values.flags.writeable, msg="The values should be memory-mapped."
+        )
+
+    def test_interrupted_write(self):
+        def blocks():
+            yield self.X.iloc[:50], self.y.iloc[:50]
+            raise RuntimeError("Interrupted stream.")
+
+        write_rolling_XY([(self.X, self.y)], join(self.path, "XY"))
+        with self.assertRaises(RuntimeError):
+            write_rolling_XY(blocks(), join(self.path, "XY"))
+        with self.assertRaises(
+            FileNotFoundError, msg="Interrupted blocks should not be readable."
+        ):
+            read_rolling_XY(join(self.path, "XY"))
+
+    @unittest.skipUnless(find_spec("pyarrow"), "pyarrow is not installed.")
+    def test_parquet(self):
+        self.serie.reset_index().to_parquet(join(self.path, "serie.parquet"))
+        blocks = list(
+            stream_rolling_XY(
+                read_serie_chunks(
+                    join(self.path, "serie.parquet"),
+                    value_column="value",
+                    index_column="date",
+                    chunksize=64,
+                ),
+                12,
+                horizon=4,
+                features=self.features,
+            )
+        )
+        self.assertSameXY(
+            concat([X for X, _ in blocks]), concat([y for _, y in blocks])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()